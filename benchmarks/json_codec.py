@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+"""Measure the CPU time spent encoding submissions and decoding reports with
+each available JSON codec.
+
+The payloads are scaled up from the test data to typical sizes: a submission of
+a project with many source files and their ASTs, and the report of a deep
+analysis with many issues. Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/json_codec.py
+"""
+
+import json
+import time
+from pathlib import Path
+
+from pythx.api.codec import OrjsonCodec, StdlibCodec
+
+TESTDATA = Path(__file__).parent.parent / "tests" / "testdata"
+
+
+def load(filename):
+    return json.loads((TESTDATA / filename).read_text())
+
+
+def submission(files):
+    payload = load("analysis-submission-request.json")
+    template = next(iter(payload["sources"].values()))
+    ast = {
+        "nodeType": "SourceUnit",
+        "nodes": [{"id": i, "src": "0:10:0"} for i in range(200)],
+    }
+    payload["sources"] = {
+        "contracts/Contract{}.sol".format(i): dict(
+            template, source=template.get("source", "") * 40, ast=ast
+        )
+        for i in range(files)
+    }
+    return payload
+
+
+def report(issues):
+    reports = load("detected-issues-response.json")
+    template = reports[0]["issues"][0]
+    reports[0]["issues"] = [
+        dict(template, uuid="issue-{}".format(i)) for i in range(issues)
+    ]
+    return reports
+
+
+def measure(func, number):
+    start = time.process_time()
+    for _ in range(number):
+        func()
+    return (time.process_time() - start) / number
+
+
+def main(number=50):
+    codecs = [StdlibCodec()]
+    try:
+        codecs.append(OrjsonCodec())
+    except ImportError:
+        print("orjson is not installed - only measuring the json module\n")
+
+    cases = [
+        ("submission, 10 files", "encode", submission(10)),
+        ("submission, 100 files", "encode", submission(100)),
+        ("report, 50 issues", "decode", report(50)),
+        ("report, 1000 issues", "decode", report(1000)),
+    ]
+    print(
+        "{:<24}{:>10}{:>10}{:>12}{:>8}".format(
+            "payload", "size", "codec", "ms per call", "saved"
+        )
+    )
+    for name, direction, data in cases:
+        encoded = StdlibCodec().encode(data)
+        baseline = None
+        for codec in codecs:
+            if direction == "encode":
+                elapsed = measure(lambda: codec.encode(data), number)
+            else:
+                elapsed = measure(lambda: codec.decode(encoded), number)
+            baseline = baseline or elapsed
+            print(
+                "{:<24}{:>9}K{:>10}{:>12.2f}{:>7.0f}%".format(
+                    name,
+                    len(encoded) // 1024,
+                    codec.name,
+                    elapsed * 1e3,
+                    (1 - elapsed / baseline) * 100,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+"""Measure the CPU time spent parsing responses in each parse mode.
+
+For every response type, the raw JSON payload is parsed with the API handler and
+the fields a typical caller reads are accessed. Run from the repository root with pythx installed or on the path:
+
+    PYTHONPATH=. python benchmarks/parse_response.py
+"""
+
+import json
+import time
+from pathlib import Path
+
+from mythx_models import response as respmodels
+
+from pythx.api.handler import APIHandler
+from pythx.api.parsing import PARSE_MODES
+
+TESTDATA = Path(__file__).parent.parent / "tests" / "testdata"
+
+CASES = [
+    (
+        "analysis status",
+        "analysis-status-response.json",
+        respmodels.AnalysisStatusResponse,
+        lambda resp: resp.status,
+    ),
+    (
+        "analysis list",
+        "analysis-list-response.json",
+        respmodels.AnalysisListResponse,
+        lambda resp: [a.uuid for a in resp.analyses],
+    ),
+    (
+        "detected issues",
+        "detected-issues-response.json",
+        respmodels.DetectedIssuesResponse,
+        lambda resp: [i.swc_id for r in resp.issue_reports for i in r.issues],
+    ),
+]
+
+
+def measure(handler, payload, model_cls, access, number):
+    start = time.process_time()
+    for _ in range(number):
+        access(handler.parse_response(payload, model_cls))
+    return (time.process_time() - start) / number
+
+
+def main(number=5000):
+    print("{:<18}{:>10}{:>14}{:>10}".format("response", "mode", "us per call", "saved"))
+    for name, filename, model_cls, access in CASES:
+        payload = json.loads((TESTDATA / filename).read_text())
+        baseline = None
+        for mode in PARSE_MODES:
+            elapsed = measure(APIHandler(parse_mode=mode), payload, model_cls, access, number)
+            baseline = baseline or elapsed
+            print(
+                "{:<18}{:>10}{:>14.1f}{:>9.0f}%".format(
+                    name, mode, elapsed * 1e6, (1 - elapsed / baseline) * 100
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,4 +5,6 @@ __email__ = "dominik.muhs@consensys.net"
 __version__ = "1.7.3"
 
 from mythx_models.exceptions import MythXAPIError
+from pythx.exceptions import MythXTimeoutError
+from pythx.api.async_client import AsyncClient
 from pythx.api.client import Client
@@ -1,4 +1,6 @@
 """This package contans the API request handler and Client implementations."""
 
+from pythx.api.async_client import AsyncClient
+from pythx.api.async_handler import AsyncAPIHandler
 from pythx.api.client import Client
 from pythx.api.handler import APIHandler
@@ -0,0 +1,813 @@
+"""This module contains the asynchronous API Client implementation."""
+
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from mythx_models import request as reqmodels
+from mythx_models import response as respmodels
+from mythx_models.response.analysis import AnalysisShort
+from mythx_models.response.project import ShortProject
+from pythx.types import RESPONSE_MODELS, REQUEST_MODELS
+from pythx.api.async_handler import AsyncAPIHandler
+from pythx.api.client import Client
+from pythx.api.compression import CompressionPolicy
+from pythx.api.deadline import DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT
+from pythx.api.parsing import STRICT
+from pythx.api.ratelimit import BaseRateLimiter
+from pythx.api.refresher import DEFAULT_REFRESH_LEAD, AsyncTokenRefresher
+from pythx.api.retry import RetryPolicy
+from pythx.api.sharding import DEFAULT_SHARD_SIZE, split_range
+from pythx.api.tokens import DEFAULT_REFRESH_MARGIN, TokenPair
+from pythx.api.tokenstore import BaseTokenStore
+from pythx.api.transport import BaseAsyncTransport
+from pythx.cache import BaseCache
+from pythx.middleware import BaseMiddleware
+
+LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncClient:
+    """The asynchronous class for API interaction.
+
+    The asynchronous client exposes the same actions as :code:`Client`, but each of
+    them is a coroutine. This allows a single event loop to keep many requests to
+    the MythX API in flight at the same time, e.g. when polling the status of a
+    large number of analysis jobs.
+
+    Requests are assembled, passed through the middlewares, and parsed exactly like
+    in the synchronous client. The same internal middlewares are added if they are
+    missing in the user-defined list.
+    """
+
+    def __init__(
+        self,
+        username: str = None,
+        password: str = None,
+        api_key: str = None,
+        refresh_token: str = None,
+        handler: AsyncAPIHandler = None,
+        no_cache: bool = False,
+        middlewares: List[BaseMiddleware] = None,
+        api_url: Union[str, Sequence[str]] = None,
+        transport: BaseAsyncTransport = None,
+        caches: List[BaseCache] = None,
+        retry_policy: RetryPolicy = None,
+        rate_limiter: BaseRateLimiter = None,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+        background_refresh: bool = False,
+        token_store: BaseTokenStore = None,
+        parse_mode: str = STRICT,
+        compression: CompressionPolicy = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+    ):
+        """Instantiate a new asynchronous MythX API client.
+
+        :param username: The MythX account's username
+        :param password: The MythX account's password
+        :param api_key: The MythX API key from the dashboard
+        :param refresh_token: The JWT refresh token
+        :param handler: Use a custom asynchronous API handler instance
+        :param no_cache: Disable the cache (special privileges required)
+        :param middlewares: A list of custom middlewares to include
+        :param api_url: A custom API endpoint for dedicated MythX deployments, or a list of them
+        :param transport: A custom asynchronous transport to send requests through
+        :param caches: A list of response caches, e.g. a :code:`DiskCache` (optional)
+        :param retry_policy: The policy for retrying transiently failed requests (optional)
+        :param rate_limiter: A rate limiter throttling the requests sent, e.g. a
+            :code:`SharedRateLimiter` (optional)
+        :param refresh_margin: The number of seconds before expiry the JWT tokens are renewed
+        :param background_refresh: Renew the JWT tokens ahead of their expiry in a background task
+            once the client's context is entered
+        :param token_store: A store to share the JWT tokens with other
+            processes, e.g. a :code:`FileTokenStore`
+        :param parse_mode: How responses are turned into models: :code:`strict`,
+            :code:`lazy`, or :code:`trusted`
+        :param compression: A policy for compressing large request bodies, e.g.
+            submissions (optional)
+        :param connect_timeout: The seconds to wait for a connection to the API
+            (:code:`None` for no limit)
+        :param read_timeout: The seconds to wait for response data (:code:`None` for no limit)
+        """
+        self.username = username
+        self.password = password
+        middlewares = Client._default_middlewares(middlewares, no_cache)
+        self.handler = handler or AsyncAPIHandler(
+            middlewares=middlewares,
+            api_url=api_url,
+            transport=transport,
+            caches=caches,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            parse_mode=parse_mode,
+            compression=compression,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+        )
+        self.refresh_margin = refresh_margin
+        self._tokens = TokenPair.create(api_key, refresh_token)
+        self._auth_lock = None
+        self.token_store = token_store
+        if token_store is not None and api_key is None and refresh_token is None:
+            stored = token_store.load()
+            if stored is not None:
+                self._tokens = TokenPair.create(*stored)
+        self.background_refresh = background_refresh
+        self._refresher = None
+
+    api_key = Client.api_key
+    refresh_token = Client.refresh_token
+    _reload_tokens = Client._reload_tokens
+    _publish_tokens = Client._publish_tokens
+    deadline = Client.deadline
+    _report_needs_status = Client._report_needs_status
+
+    async def _assemble_send_parse(
+        self,
+        req_obj: REQUEST_MODELS,
+        resp_model: Type[RESPONSE_MODELS],
+        assert_authentication: bool = True,
+        include_auth_header: bool = True,
+        params: Dict[str, str] = None,
+    ) -> RESPONSE_MODELS:
+        """Assemble the request, send it, parse and return the response.
+
+        :param req_obj: The request object to send to the API
+        :param resp_model: The response model class to parse the requested results into
+        :param assert_authentication: Auto-check authentication
+        :param include_auth_header: Include authentication header on request
+        :param params: URL parameters overriding the ones of the request object
+            (:code:`None` values remove a parameter)
+        :return: The parsed API response
+        """
+        if assert_authentication:
+            await self.assert_authentication()
+        auth_header = (
+            {"Authorization": "Bearer {}".format(self.api_key)}
+            if include_auth_header
+            else None
+        )
+        req_dict = self.handler.assemble_request(req_obj)
+        for key, value in (params or {}).items():
+            if value is None:
+                req_dict["params"].pop(key, None)
+            else:
+                req_dict["params"][key] = value
+        LOGGER.debug("Sending request")
+        return await self.handler.execute_request(
+            req_dict, resp_model, auth_header=auth_header
+        )
+
+    async def assert_authentication(self) -> None:
+        """Make sure the user is authenticated.
+
+        If necessary, this coroutine will refresh the access token, or perform another
+        login to get a fresh combination of tokens if both are expired. Concurrent
+        callers wait for a single renewal instead of each starting their own.
+
+        :return: None
+        """
+        if self._tokens.renewal(self.refresh_margin) is None:
+            return
+        await self._renew_tokens(self.refresh_margin)
+
+    async def _renew_tokens(self, margin: float) -> None:
+        """Renew the tokens if they expire within the given margin.
+
+        Tokens renewed by another process are picked up from the token store. Unlike
+        the synchronous client, the store is not locked during the renewal, as this
+        would block the event loop.
+
+        :param margin: The number of seconds before expiry the tokens are renewed
+        :return: None
+        """
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+        async with self._auth_lock:
+            # the tokens may have been renewed while waiting for the lock
+            self._reload_tokens(margin)
+            renewal = self._tokens.renewal(margin)
+            if renewal == "refresh":
+                LOGGER.debug("Auth refresh needed")
+                await self.refresh()
+            elif renewal == "login":
+                LOGGER.debug("No valid access or refresh token - logging in")
+                await self.login()
+
+    def start_token_refresher(self, lead: float = DEFAULT_REFRESH_LEAD) -> AsyncTokenRefresher:
+        """Renew the JWT tokens in a background task before they expire.
+
+        The task runs on the current event loop. It is cancelled when leaving the
+        client's context, or by awaiting :code:`stop_token_refresher`.
+
+        :param lead: The number of seconds before expiry the tokens are renewed
+        :return: The running :code:`AsyncTokenRefresher`
+        """
+        if self._refresher is not None and self._refresher.running:
+            return self._refresher
+        self._refresher = AsyncTokenRefresher(self, lead=lead)
+        self._refresher.start()
+        return self._refresher
+
+    async def stop_token_refresher(self) -> None:
+        """Stop the background token refresher, if one is running.
+
+        :return: None
+        """
+        if self._refresher is not None:
+            await self._refresher.stop()
+            self._refresher = None
+
+    async def login(self) -> respmodels.AuthLoginResponse:
+        """Perform a login request on the API and return the response.
+
+        :return: :code:`AuthLoginResponse`
+        """
+        req = reqmodels.AuthLoginRequest(username=self.username, password=self.password)
+        resp_model: respmodels.AuthLoginResponse = await self._assemble_send_parse(
+            req,
+            respmodels.AuthLoginResponse,
+            assert_authentication=False,
+            include_auth_header=False,
+        )
+        self._publish_tokens(TokenPair.create(resp_model.access_token, resp_model.refresh_token))
+        return resp_model
+
+    async def logout(self) -> respmodels.AuthLogoutResponse:
+        """Perform a logout request on the API and return the response.
+
+        As the logout invalidates the user's tokens globally, they are also removed
+        from the token store.
+
+        :return: :code:`AuthLogoutResponse`
+        """
+        req = reqmodels.AuthLogoutRequest(**{"global": True})
+        resp_model = await self._assemble_send_parse(
+            req, respmodels.AuthLogoutResponse
+        )
+        self._tokens = TokenPair()
+        if self.token_store is not None:
+            self.token_store.clear()
+        return resp_model
+
+    async def refresh(self) -> respmodels.AuthRefreshResponse:
+        """Perform a JWT refresh on the API and return the response.
+
+        :return: :code:`AuthRefreshResponse`
+        """
+        tokens = self._tokens
+        req = reqmodels.AuthRefreshRequest(
+            access_token=tokens.api_key, refresh_token=tokens.refresh_token
+        )
+        resp_model: respmodels.AuthRefreshResponse = await self._assemble_send_parse(
+            req,
+            respmodels.AuthRefreshResponse,
+            assert_authentication=False,
+            include_auth_header=False,
+        )
+        self._publish_tokens(TokenPair.create(resp_model.access_token, resp_model.refresh_token))
+        return resp_model
+
+    async def project_list(
+        self, offset: int = None, limit: int = None, name: str = ""
+    ) -> respmodels.ProjectListResponse:
+        """List the existing projects on the platform
+
+        :param offset: The number of projects to skip (optional)
+        :param limit: The number of projects to return (optional)
+        :param name: The name to filter projects by (optional)
+        :return: :code:`ProjectListResponse`
+        """
+        req = reqmodels.ProjectListRequest(offset=offset, limit=limit, name=name)
+        return await self._assemble_send_parse(req, respmodels.ProjectListResponse)
+
+    async def project_status(
+        self, project_id: str = ""
+    ) -> respmodels.ProjectStatusResponse:
+        """Get detailed information for a project.
+
+        :param project_id: The project's ID
+        :return: :code:`ProjectStatusResponse`
+        """
+        req = reqmodels.ProjectStatusRequest(project_id=project_id)
+        return await self._assemble_send_parse(req, respmodels.ProjectStatusResponse)
+
+    async def delete_project(
+        self, project_id: str = ""
+    ) -> respmodels.ProjectDeletionResponse:
+        """Delete an existing project.
+
+        :param project_id: The project's ID
+        :return: :code:`ProjectDeletionResponse`
+        """
+        req = reqmodels.ProjectDeleteRequest(project_id=project_id)
+        return await self._assemble_send_parse(
+            req, respmodels.ProjectDeletionResponse
+        )
+
+    async def create_project(
+        self, name: str = "", description: str = "", groups: List[str] = None
+    ) -> respmodels.ProjectCreationResponse:
+        """Create a new project.
+
+        :param name: The project name
+        :param description: The project description
+        :param groups: List of group IDs belonging to the project (optional)
+        :return: :code:`ProjectCreationResponse`
+        """
+        req = reqmodels.ProjectCreationRequest(
+            name=name, description=description, groups=groups or []
+        )
+        return await self._assemble_send_parse(
+            req, respmodels.ProjectCreationResponse
+        )
+
+    async def update_project(
+        self, project_id: str = "", name: str = "", description: str = ""
+    ) -> respmodels.ProjectUpdateResponse:
+        """Update an existing project.
+
+        :param project_id: The ID of the project to update
+        :param name: The new project name (optional)
+        :param description: The new project description (optional)
+        :return: :code:`ProjectUpdateResponse`
+        """
+        req = reqmodels.ProjectUpdateRequest(
+            project_id=project_id, name=name, description=description
+        )
+        return await self._assemble_send_parse(req, respmodels.ProjectUpdateResponse)
+
+    async def group_list(
+        self,
+        offset: int = None,
+        created_by: str = "",
+        group_name: str = "",
+        date_from: datetime = None,
+        date_to: datetime = None,
+    ) -> respmodels.GroupListResponse:
+        """Get a list of the currently defined MythX analysis groups.
+
+        :param offset: The number of results to skip (used for pagination)
+        :param created_by: Filter the list results by the creator's user ID
+        :param group_name: Filter the list results by the group's name
+        :param date_from: Only display results after the given date
+        :param date_to: Only display results until the given date
+        :return: :code:`GroupListResponse`
+        """
+        req = reqmodels.GroupListRequest(
+            offset=offset,
+            created_by=created_by,
+            group_name=group_name,
+            date_from=date_from,
+            date_to=date_to,
+        )
+        return await self._assemble_send_parse(req, respmodels.GroupListResponse)
+
+    async def analysis_list(
+        self,
+        date_from: datetime = None,
+        date_to: datetime = None,
+        offset: int = None,
+        created_by: str = None,
+        group_name: str = None,
+        group_id: str = None,
+        main_source: str = None,
+    ) -> respmodels.AnalysisListResponse:
+        """Get a list of the user's analyses jobs.
+
+        :param date_from: Start of the date range (optional)
+        :param date_to: End of the date range (optional)
+        :param offset: The number of results to skip (used for pagination)
+        :param created_by: Filter analysis results based on the creator
+        :param group_name: Filter analysis results based on the group name
+        :param group_id: Filter analysis results based on their group ID
+        :param main_source: Filter analysis results based on their main source name
+        :return: :code:`AnalysisListResponse`
+        """
+        req = reqmodels.AnalysisListRequest(
+            offset=offset,
+            date_from=date_from,
+            date_to=date_to,
+            created_by=created_by,
+            group_name=group_name,
+            group_id=group_id,
+            main_source=main_source,
+        )
+        # the request model sends date_from for both bounds
+        params = {"dateTo": date_to.isoformat() if date_to is not None else None}
+        return await self._assemble_send_parse(
+            req, respmodels.AnalysisListResponse, params=params
+        )
+
+    @staticmethod
+    async def _iter_pages(
+        fetch_page: Callable[[int], Awaitable[RESPONSE_MODELS]],
+        items: Callable[[RESPONSE_MODELS], List[T]],
+        key: Callable[[T], str],
+        prefetch: bool = True,
+    ) -> AsyncIterator[T]:
+        """Lazily walk through all pages of a list endpoint.
+
+        This is the asynchronous counterpart of :code:`Client._iter_pages`. The next
+        page is fetched in a separate task while the current one is consumed.
+
+        :param fetch_page: A coroutine function returning the list response for an offset
+        :param items: A function returning the items of a list response
+        :param key: A function returning an item's unique ID
+        :param prefetch: Fetch the next page while the current one is consumed
+        :return: An asynchronous iterator over the items of all pages
+        """
+        next_page = None
+        seen = set()
+        try:
+            offset = 0
+            page = await fetch_page(offset)
+            while True:
+                batch = items(page)
+                offset += len(batch)
+                has_next = bool(batch) and offset < page.total
+                if has_next and prefetch:
+                    next_page = asyncio.ensure_future(fetch_page(offset))
+                for item in batch:
+                    item_key = key(item)
+                    if item_key not in seen:
+                        seen.add(item_key)
+                        yield item
+                if not has_next:
+                    return
+                page = await next_page if next_page is not None else await fetch_page(offset)
+                next_page = None
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    def iter_analyses(
+        self,
+        date_from: datetime = None,
+        date_to: datetime = None,
+        created_by: str = None,
+        group_name: str = None,
+        group_id: str = None,
+        main_source: str = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[AnalysisShort]:
+        """Iterate over all of the user's analysis jobs matching the given
+        filters.
+
+        :param date_from: Start of the date range (optional)
+        :param date_to: End of the date range (optional)
+        :param created_by: Filter analysis results based on the creator
+        :param group_name: Filter analysis results based on the group name
+        :param group_id: Filter analysis results based on their group ID
+        :param main_source: Filter analysis results based on their main source name
+        :param prefetch: Fetch the next page in the background while the current one is consumed
+        :return: An asynchronous iterator over :code:`AnalysisShort` models
+        """
+        return self._iter_pages(
+            lambda offset: self.analysis_list(
+                date_from=date_from,
+                date_to=date_to,
+                offset=offset,
+                created_by=created_by,
+                group_name=group_name,
+                group_id=group_id,
+                main_source=main_source,
+            ),
+            items=lambda page: page.analyses,
+            key=lambda analysis: analysis.uuid,
+            prefetch=prefetch,
+        )
+
+    def iter_groups(
+        self,
+        created_by: str = "",
+        group_name: str = "",
+        date_from: datetime = None,
+        date_to: datetime = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[respmodels.Group]:
+        """Iterate over all analysis groups matching the given filters.
+
+        :param created_by: Filter the list results by the creator's user ID
+        :param group_name: Filter the list results by the group's name
+        :param date_from: Only display results after the given date
+        :param date_to: Only display results until the given date
+        :param prefetch: Fetch the next page in the background while the current one is consumed
+        :return: An asynchronous iterator over :code:`Group` models
+        """
+        return self._iter_pages(
+            lambda offset: self.group_list(
+                offset=offset,
+                created_by=created_by,
+                group_name=group_name,
+                date_from=date_from,
+                date_to=date_to,
+            ),
+            items=lambda page: page.groups,
+            key=lambda group: group.identifier,
+            prefetch=prefetch,
+        )
+
+    def iter_projects(
+        self, name: str = "", page_size: int = None, prefetch: bool = True
+    ) -> AsyncIterator[ShortProject]:
+        """Iterate over all projects matching the given name.
+
+        :param name: The name to filter projects by (optional)
+        :param page_size: The number of projects to request per page (optional)
+        :param prefetch: Fetch the next page in the background while the current one is consumed
+        :return: An asynchronous iterator over :code:`ShortProject` models
+        """
+        return self._iter_pages(
+            lambda offset: self.project_list(offset=offset, limit=page_size, name=name),
+            items=lambda page: page.projects,
+            key=lambda project: project.id,
+            prefetch=prefetch,
+        )
+
+    async def export_analyses(
+        self,
+        date_from: datetime,
+        date_to: datetime = None,
+        created_by: str = None,
+        group_name: str = None,
+        group_id: str = None,
+        main_source: str = None,
+        max_workers: int = 4,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+    ) -> AsyncIterator[AnalysisShort]:
+        """Iterate over all of the user's analysis jobs in a date window, listing
+        parts of the window concurrently.
+
+        This is the asynchronous counterpart of :code:`Client.export_analyses`. Up to
+        :code:`max_workers` shards are listed in separate tasks.
+
+        :param date_from: Start of the date range
+        :param date_to: End of the date range (defaults to now)
+        :param created_by: Filter analysis results based on the creator
+        :param group_name: Filter analysis results based on the group name
+        :param group_id: Filter analysis results based on their group ID
+        :param main_source: Filter analysis results based on their main source name
+        :param max_workers: The maximum number of shards listed concurrently
+        :param shard_size: The maximum number of analyses listed serially in one shard
+        :return: An asynchronous iterator over :code:`AnalysisShort` models
+        """
+        if date_to is None:
+            date_to = datetime.now(tz=date_from.tzinfo)
+        filters = dict(
+            created_by=created_by,
+            group_name=group_name,
+            group_id=group_id,
+            main_source=main_source,
+        )
+
+        async def fetch(shard):
+            first = await self.analysis_list(
+                date_from=shard.date_from, date_to=shard.date_to, **filters
+            )
+            parts = shard.split(first.total, shard_size)
+            if parts is not None:
+                return parts, None
+
+            async def fetch_page(offset):
+                if offset == 0:
+                    return first
+                return await self.analysis_list(
+                    date_from=shard.date_from,
+                    date_to=shard.date_to,
+                    offset=offset,
+                    **filters
+                )
+
+            pages = self._iter_pages(
+                fetch_page,
+                items=lambda page: page.analyses,
+                key=lambda analysis: analysis.uuid,
+                prefetch=False,
+            )
+            return None, [analysis async for analysis in pages]
+
+        await self.assert_authentication()
+
+        shards = deque(split_range(date_from, date_to, max_workers))
+        pending = {}
+        previous = set()
+        try:
+            while shards:
+                for shard in islice(shards, max_workers):
+                    if shard not in pending:
+                        pending[shard] = asyncio.ensure_future(fetch(shard))
+                shard = shards.popleft()
+                parts, analyses = await pending.pop(shard)
+                if parts is not None:
+                    shards.extendleft(reversed(parts))
+                    continue
+                # only adjacent shards overlap, so older UUIDs can be forgotten
+                current = set()
+                for analysis in analyses:
+                    current.add(analysis.uuid)
+                    if analysis.uuid not in previous:
+                        yield analysis
+                previous = current
+        finally:
+            for task in pending.values():
+                task.cancel()
+
+    async def analyze(
+        self,
+        bytecode: str = None,
+        main_source: str = None,
+        sources: Dict[str, Dict[str, str]] = None,
+        contract_name: str = None,
+        source_map: str = None,
+        deployed_bytecode: str = None,
+        deployed_source_map: str = None,
+        source_list: List[str] = None,
+        solc_version: str = None,
+        analysis_mode: str = "quick",
+        payload: reqmodels.AnalysisSubmissionRequest = None,
+    ) -> respmodels.AnalysisSubmissionResponse:
+        """Submit a new analysis job.
+
+        :param contract_name: The main Solidity contract's name
+        :param bytecode: The EVM creation bytecode obtained
+        :param source_map: The source map for the EVM creation bytecode
+        :param deployed_bytecode: The deployed EVM bytecode
+        :param deployed_source_map: The deployed bytecode's source map
+        :param main_source: The main source file to start analysis from
+        :param sources: A dictionary holding the source file data
+        :param source_list: A list of source files (ordered by the source map locs)
+        :param solc_version: The solc version used for compilation
+        :param analysis_mode: The analysis mode
+        :param payload: Directly inject an :code:`AnalysisSubmissionRequest` model
+        :return: :code:`AnalysisSubmissionResponse`
+        """
+        req = payload or reqmodels.AnalysisSubmissionRequest(
+            contract_name=contract_name,
+            bytecode=bytecode,
+            source_map=source_map,
+            deployed_bytecode=deployed_bytecode,
+            deployed_source_map=deployed_source_map,
+            main_source=main_source,
+            sources=sources,
+            source_list=source_list,
+            solc_version=solc_version,
+            analysis_mode=analysis_mode,
+        )
+        return await self._assemble_send_parse(
+            req, respmodels.AnalysisSubmissionResponse
+        )
+
+    async def group_status(self, group_id: str) -> respmodels.GroupStatusResponse:
+        """Get the status of an analysis group by its ID.
+
+        :param group_id: The group ID to fetch the status for
+        :return: :code:`GroupStatusResponse`
+        """
+        req = reqmodels.GroupStatusRequest(group_id=group_id)
+        return await self._assemble_send_parse(req, respmodels.GroupStatusResponse)
+
+    async def analysis_status(self, uuid: str) -> respmodels.AnalysisStatusResponse:
+        """Get the status of an analysis job based on its UUID.
+
+        :param uuid: The job's UUID
+        :return: :code:`AnalysisStatusResponse`
+        """
+        req = reqmodels.AnalysisStatusRequest(uuid=uuid)
+        return await self._assemble_send_parse(
+            req, respmodels.AnalysisStatusResponse
+        )
+
+    async def analysis_ready(self, uuid: str) -> bool:
+        """Return a boolean whether the analysis job with the given UUID has
+        finished processing.
+
+        :param uuid: The analysis job UUID
+        :return: bool indicating whether the analysis has finished
+        """
+        resp = await self.analysis_status(uuid)
+        return (
+            resp.status == respmodels.AnalysisStatus.FINISHED
+            or resp.status == respmodels.AnalysisStatus.ERROR
+        )
+
+    async def report(self, uuid: str) -> respmodels.DetectedIssuesResponse:
+        """Get the report holding found issues for an analysis job based on its
+        UUID.
+
+        The job's status is looked up first if a registered cache requires it, see
+        :code:`Client.report`.
+
+        :param uuid: The analysis job UUID
+        :return: :code:`DetectedIssuesResponse`
+        """
+        if self._report_needs_status():
+            await self.analysis_status(uuid)
+        req = reqmodels.DetectedIssuesRequest(uuid=uuid)
+        return await self._assemble_send_parse(
+            req, respmodels.DetectedIssuesResponse
+        )
+
+    async def request_by_uuid(self, uuid: str) -> respmodels.AnalysisInputResponse:
+        """Get the input request based on the analysis job's UUID.
+
+        :param uuid: The analysis job UUID
+        :return: :code:`AnalysisInputResponse`
+        """
+        req = reqmodels.AnalysisInputRequest(uuid=uuid)
+        return await self._assemble_send_parse(req, respmodels.AnalysisInputResponse)
+
+    async def create_group(
+        self, group_name: str = ""
+    ) -> respmodels.GroupCreationResponse:
+        """Create a new group.
+
+        :param group_name: The name of the group (max. 256 characters, optional)
+        :return: :code:`GroupCreationResponse`
+        """
+        req = reqmodels.GroupCreationRequest(group_name=group_name)
+        return await self._assemble_send_parse(req, respmodels.GroupCreationResponse)
+
+    async def seal_group(self, group_id: str) -> respmodels.GroupOperationResponse:
+        """Seal the group.
+
+        This closes an open group for the submission of any further analyses.
+
+        :param group_id: The target group ID
+        :return: :code:`GroupOperationResponse`
+        """
+        req = reqmodels.GroupOperationRequest(group_id=group_id, type_="seal_group")
+        return await self._assemble_send_parse(
+            req, respmodels.GroupOperationResponse
+        )
+
+    async def add_group_to_project(
+        self, group_id: str, project_id: str
+    ) -> respmodels.GroupOperationResponse:
+        """Adds group to the project.
+
+        :param group_id: The target group ID
+        :param project_id: The target project ID
+        :return: :code:`GroupOperationResponse`
+        """
+        req = reqmodels.GroupOperationRequest(
+            group_id=group_id, type_="add_to_project", project_id=project_id
+        )
+        return await self._assemble_send_parse(
+            req, respmodels.GroupOperationResponse
+        )
+
+    async def version(self) -> respmodels.VersionResponse:
+        """Call the APIs version endpoint to get its backend version numbers.
+
+        :return: :code:`VersionResponse`
+        """
+        req = reqmodels.VersionRequest()
+        return await self._assemble_send_parse(
+            req,
+            respmodels.VersionResponse,
+            assert_authentication=False,
+            include_auth_header=False,
+        )
+
+    async def __aenter__(self):
+        """Entry point for the asynchronous client context handler.
+
+        :return: An :code:`AsyncClient` instance
+        """
+        await self.assert_authentication()
+        if self.background_refresh:
+            self.start_token_refresher()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """Exit point for the asynchronous client context handler.
+
+        The background token refresher is stopped before logging out. Afterwards, the
+        handler's transport is closed - even if the logout request failed.
+
+        :param exc_type: The exception type during context execution
+        :param exc_value: The exception value from context execution
+        :param traceback: The traceback from context execution
+        """
+        await self.stop_token_refresher()
+        try:
+            await self.logout()
+        finally:
+            await self.handler.close()
@@ -0,0 +1,344 @@
+"""This module contains the asynchronous API request handler
+implementation."""
+
+import asyncio
+import functools
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
+
+import requests
+
+from pythx.types import RESPONSE_MODELS
+from pythx.api.handler import (
+    DEFAULT_LOG_BODY_LIMIT,
+    APIHandler,
+    _Attempts,
+    _leader_gave_up,
+)
+from pythx.api.codec import BaseCodec
+from pythx.api.compression import CompressionPolicy
+from pythx.api.deadline import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    TIMEOUT,
+    Deadline,
+)
+from pythx.api.endpoints import DEFAULT_MAX_FAILURES, DEFAULT_PROBE_INTERVAL
+from pythx.api.parsing import STRICT
+from pythx.api.ratelimit import BaseRateLimiter
+from pythx.api.retry import RetryPolicy
+from pythx.api.transport import (
+    BaseAsyncTransport,
+    RequestsTransport,
+    default_async_transport,
+)
+from pythx.cache.base import BaseCache
+from pythx.middleware.base import BaseMiddleware
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AsyncAPIHandler(APIHandler):
+    """Handle the low-level API interaction without blocking the event loop.
+
+    The asynchronous handler shares request assembly, middleware execution, and
+    response parsing with :code:`APIHandler`. Only sending a request and closing
+    the transport are coroutines, as they are delegated to an asynchronous
+    transport.
+
+    The health checks of multiple API endpoints run in a background thread, so they
+    are sent through a separate synchronous transport.
+    """
+
+    def __init__(
+        self,
+        middlewares: List[BaseMiddleware] = None,
+        api_url: Union[str, Sequence[str]] = None,
+        transport: BaseAsyncTransport = None,
+        caches: List[BaseCache] = None,
+        coalesce_requests: bool = True,
+        retry_policy: RetryPolicy = None,
+        rate_limiter: BaseRateLimiter = None,
+        log_body_limit: Optional[int] = DEFAULT_LOG_BODY_LIMIT,
+        parse_mode: str = STRICT,
+        codec: BaseCodec = None,
+        compression: CompressionPolicy = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        max_failures: int = DEFAULT_MAX_FAILURES,
+        probe_interval: Optional[float] = DEFAULT_PROBE_INTERVAL,
+    ):
+        """Instantiate a new asynchronous API handler class.
+
+        If no transport is given, an :code:`AiohttpTransport` is used if aiohttp is
+        installed. Otherwise, requests are run in the event loop's executor.
+
+        :param middlewares: A list of custom middlewares to include
+        :param api_url: A custom API endpoint for dedicated MythX deployments, or a list of them
+        :param transport: A custom asynchronous transport to send requests through
+        :param caches: A list of response caches to include
+        :param coalesce_requests: Share the response of identical concurrent GET requests
+        :param retry_policy: The policy for retrying failed requests (retries transient errors by default)
+        :param rate_limiter: A rate limiter throttling the requests sent (optional)
+        :param log_body_limit: The maximum number of body bytes to trace (:code:`None` for no limit)
+        :param parse_mode: How responses are turned into models: :code:`strict`, :code:`lazy`, or :code:`trusted`
+        :param codec: The JSON codec for payloads and responses (the fastest installed one by default)
+        :param compression: A policy for compressing large request bodies (optional)
+        :param connect_timeout: The seconds to wait for a connection (:code:`None` for no limit)
+        :param read_timeout: The seconds to wait for response data (:code:`None` for no limit)
+        :param max_failures: The consecutive failures after which an endpoint is ejected
+        :param probe_interval: The seconds between health checks of multiple endpoints (:code:`None` to disable them)
+        """
+        super().__init__(
+            middlewares=middlewares,
+            api_url=api_url,
+            transport=transport or default_async_transport(),
+            caches=caches,
+            coalesce_requests=coalesce_requests,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            log_body_limit=log_body_limit,
+            parse_mode=parse_mode,
+            codec=codec,
+            compression=compression,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            max_failures=max_failures,
+            probe_interval=probe_interval,
+        )
+        self._async_in_flight = {}
+        self._probe_transport = None
+
+    async def close(self) -> None:
+        """Close the handler's transport and release its pooled connections.
+
+        :return: None
+        """
+        self.endpoints.stop()
+        if self._probe_transport is not None:
+            self._probe_transport.close()
+        await self.transport.close()
+
+    def _probe_endpoint(self, url: str) -> None:
+        """Check whether an API endpoint is available.
+
+        This is called from the endpoint pool's background thread, so the request
+        is sent through a synchronous transport.
+
+        :param url: The endpoint's base URL
+        :return: None
+        """
+        if self._probe_transport is None:
+            self._probe_transport = RequestsTransport(pool_maxsize=1)
+        response = self._probe_transport.request(
+            **self._prepare_request(self._probe_request(url))
+        )
+        try:
+            self._process_response(response)
+        finally:
+            response.close()
+
+    async def send_request(
+        self,
+        request_data: Dict,
+        auth_header: Dict[str, str] = None,
+        timeout: TIMEOUT = None,
+    ) -> Dict:
+        """Send a request to the API.
+
+        This is the asynchronous counterpart of :code:`APIHandler.send_request`,
+        taking the same request data dictionary, consulting the same caches, retrying
+        transient failures without blocking the event loop, and raising a
+        :code:`MythXAPIError` if the request finally fails. Timeouts and deadlines
+        apply as they do for the synchronous handler. Caches blocking on IO, such as
+        the :code:`DiskCache`, are consulted in the event loop's executor.
+
+        :param request_data: The request data dictionary
+        :param auth_header: The authorization header carrying the access token
+        :param timeout: The seconds to wait, or a (connect, read) tuple (optional)
+        :return: The raw response payload string
+        """
+        content = await self._call_caches(self.lookup_caches, request_data)
+        if content is not None:
+            return content
+        response = await self._send_with_retries(
+            request_data, auth_header, timeout=timeout
+        )
+        content = self._process_response(response)
+        await self._call_caches(self.update_caches, request_data, content)
+        return content
+
+    async def _call_caches(self, method: Callable, *args) -> Any:
+        """Run a cache operation without blocking the event loop on cache IO.
+
+        :param method: The handler method consulting the caches
+        :param args: The method's arguments
+        :return: The method's return value
+        """
+        if any(cache.blocking for cache in self.caches):
+            return await asyncio.get_event_loop().run_in_executor(None, method, *args)
+        return method(*args)
+
+    def stream_request(self, *args, **kwargs):
+        """Streaming responses is not supported by the asynchronous handler.
+
+        The asynchronous transports read each response completely, so there is
+        nothing to stream. Use :code:`send_request` instead.
+
+        :raises TypeError: Always
+        """
+        raise TypeError(
+            "{} does not support streaming responses - use send_request instead".format(
+                type(self).__name__
+            )
+        )
+
+    async def _send_with_retries(
+        self,
+        request_data: Dict,
+        auth_header: Dict[str, str] = None,
+        timeout: TIMEOUT = None,
+    ) -> requests.Response:
+        """Send a request through the transport, retrying transient failures.
+
+        :param request_data: The request data dictionary
+        :param auth_header: The authorization header carrying the access token
+        :param timeout: The seconds to wait, or a (connect, read) tuple (optional)
+        :return: The final HTTP response
+        """
+        kwargs = self._prepare_request(request_data, auth_header, timeout=timeout)
+        wire_kwargs, encoding = self._compress_request(kwargs)
+        response = await self._send_attempts(request_data, wire_kwargs)
+        if encoding is not None and self.compression.rejected(response):
+            wire_kwargs, encoding = kwargs, None
+            response = await self._send_attempts(request_data, kwargs)
+        if self.compression is not None:
+            self.compression.record(
+                kwargs["method"],
+                kwargs["url"],
+                kwargs["payload"],
+                wire_kwargs["payload"],
+                encoding,
+                response,
+            )
+        return response
+
+    async def _send_attempts(self, request_data: Dict, kwargs: Dict) -> requests.Response:
+        """Send the request until it succeeds or the retry policy gives up.
+
+        :param request_data: The request data dictionary
+        :param kwargs: The keyword arguments for the transport's :code:`request` method
+        :return: The final HTTP response
+        """
+        attempts = _Attempts(self, kwargs)
+        while True:
+            response, error = None, None
+            if self.rate_limiter is not None:
+                # limiters may block, e.g. on the database of a shared limiter
+                wait_time = await asyncio.get_event_loop().run_in_executor(
+                    None, self.rate_limiter.reserve, request_data, attempts.budget()
+                )
+                await asyncio.sleep(attempts.admit(wait_time))
+            try:
+                response = await self.transport.request(**attempts.next())
+            except requests.RequestException as e:
+                error = attempts.raised(e)
+            delay = attempts.retry_delay(response, error)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return response
+
+    async def execute_request(
+        self,
+        request_data: Dict,
+        model_cls: Type[RESPONSE_MODELS],
+        auth_header: Dict[str, str] = None,
+        timeout: TIMEOUT = None,
+    ) -> RESPONSE_MODELS:
+        """Send a request to the API and parse the response into its domain
+        model.
+
+        This is the asynchronous counterpart of :code:`APIHandler.execute_request`.
+        Coroutines issuing an identical GET request while one is in flight wait for it
+        and receive the very same domain model (or exception). The request is sent in a
+        task of its own, so cancelling the coroutine that issued it first does not
+        affect the others. If it fails because that coroutine's deadline has passed, a
+        waiting coroutine sends it again.
+
+        :param request_data: The request data dictionary
+        :param model_cls: The domain model class the data should be deserialized into
+        :param auth_header: The authorization header carrying the access token
+        :param timeout: The seconds to wait, or a (connect, read) tuple (optional)
+        :return: The domain model holding the response data
+        """
+        key = self._coalesce_key(request_data, model_cls, auth_header)
+        if key is None:
+            resp = await self.send_request(
+                request_data, auth_header=auth_header, timeout=timeout
+            )
+            return self.parse_response(resp, model_cls)
+
+        while True:
+            task = self._async_in_flight.get(key)
+            if task is None:
+                # send in a task of its own, so cancelling the caller only detaches it
+                task = asyncio.ensure_future(
+                    self._send_and_parse(request_data, model_cls, auth_header, timeout)
+                )
+                task.add_done_callback(functools.partial(self._release_in_flight, key))
+                self._async_in_flight[key] = task
+                is_leader = True
+            else:
+                LOGGER.debug("Joining in-flight request to %s", request_data["url"])
+                is_leader = False
+            try:
+                return await self._wait_in_flight(task, request_data)
+            except BaseException as e:
+                if is_leader or not _leader_gave_up(task, e):
+                    raise
+            LOGGER.debug(
+                "In-flight request to %s gave up - resending", request_data["url"]
+            )
+
+    async def _send_and_parse(
+        self,
+        request_data: Dict,
+        model_cls: Type[RESPONSE_MODELS],
+        auth_header: Optional[Dict[str, str]],
+        timeout: TIMEOUT,
+    ) -> RESPONSE_MODELS:
+        resp = await self.send_request(
+            request_data, auth_header=auth_header, timeout=timeout
+        )
+        return self.parse_response(resp, model_cls)
+
+    @staticmethod
+    async def _wait_in_flight(
+        task: asyncio.Future, request_data: Dict
+    ) -> RESPONSE_MODELS:
+        """Wait for a request shared by several coroutines.
+
+        :param task: The task sending the request
+        :param request_data: The request data dictionary
+        :return: The domain model holding the response data
+        """
+        # shield the shared task, so cancelling one waiter does not cancel the others
+        deadline = Deadline.current()
+        if deadline is None:
+            return await asyncio.shield(task)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), deadline.remaining())
+        except asyncio.TimeoutError:
+            raise deadline.error(
+                "waiting for in-flight request to {}".format(request_data["url"])
+            )
+
+    def _release_in_flight(self, key: Tuple, task: asyncio.Future) -> None:
+        if self._async_in_flight.get(key) is task:
+            del self._async_in_flight[key]
+        if not task.cancelled():
+            # mark the exception as retrieved in case nobody was waiting any more
+            task.exception()
@@ -1,22 +1,66 @@
 """This module contains the main API Client implementation."""
 
+import heapq
 import logging
+import threading
+import time
+from collections import deque
+from contextvars import copy_context
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Type, TypeVar
+from itertools import islice
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    Set,
+    Type,
+    TypeVar,
+    Union,
+)
 
-import jwt
 from mythx_models import request as reqmodels
 from mythx_models import response as respmodels
+from mythx_models.exceptions import MythXAPIError
+from mythx_models.response.analysis import AnalysisShort
+from mythx_models.response.group import GroupState
+from mythx_models.response.issue import Issue
+from mythx_models.response.project import ShortProject
 from pythx.types import RESPONSE_MODELS, REQUEST_MODELS
 from pythx.api.handler import APIHandler
+from pythx.api.polling import TERMINAL_STATUSES, Backoff
+from pythx.api.compression import CompressionPolicy
+from pythx.api.deadline import DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT, Deadline
+from pythx.api.parsing import STRICT
+from pythx.api.ratelimit import BaseRateLimiter
+from pythx.api.refresher import DEFAULT_REFRESH_LEAD, TokenRefresher
+from pythx.api.retry import RetryPolicy
+from pythx.api.sharding import DEFAULT_SHARD_SIZE, split_range
+from pythx.api.streaming import DEFAULT_CHUNK_SIZE, IssueStreamParser
+from pythx.api.tokens import DEFAULT_REFRESH_MARGIN, TokenPair
+from pythx.api.tokenstore import BaseTokenStore
+from pythx.api.transport import (
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    RequestsTransport,
+)
+from pythx.exceptions import MythXTimeoutError
+from pythx.cache import BaseCache, SubmissionIndex
 from pythx.middleware import (
     AnalysisCacheMiddleware,
     BaseMiddleware,
     ClientToolNameMiddleware,
+    GroupDataMiddleware,
 )
 
 LOGGER = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class Client:
     """The main class for API interaction.
@@ -51,7 +95,21 @@ class Client:
         handler: APIHandler = None,
         no_cache: bool = False,
         middlewares: List[BaseMiddleware] = None,
-        api_url: str = None,
+        api_url: Union[str, Sequence[str]] = None,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        keep_alive: bool = True,
+        caches: List[BaseCache] = None,
+        submission_index: SubmissionIndex = None,
+        retry_policy: RetryPolicy = None,
+        rate_limiter: BaseRateLimiter = None,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+        background_refresh: bool = False,
+        token_store: BaseTokenStore = None,
+        parse_mode: str = STRICT,
+        compression: CompressionPolicy = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
     ):
         """Instantiate a new MythX API client.
 
@@ -64,8 +122,10 @@ class Client:
         If a login action using username and password is chosen, the API key and JWT
         refresh token are set internally if the login attempt was successful.
 
-        The middleware list and the API URL are directly forwarded to the API handler
-        class unless a custom instance has already been provided.
+        The middleware list, the API URL, the connection pool settings, the response
+        caches, the retry policy, the rate limiter, the parse mode, the compression
+        policy, and the timeouts are directly forwarded to the API handler class unless
+        a custom instance has already been provided.
 
         :param username: The MythX account's username
         :param password: The MythX account's password
@@ -74,11 +134,89 @@ class Client:
         :param handler: Use a custom API handler instance
         :param no_cache: Disable the cache (special privileges required)
         :param middlewares: A list of custom middlewares to include
-        :param api_url: A custom API endpoint for dedicated MythX deployments
+        :param api_url: A custom API endpoint for dedicated MythX deployments, or a list of them
+        :param pool_connections: The number of per-host connection pools to cache
+        :param pool_maxsize: The maximum number of connections kept open per host
+        :param keep_alive: Keep connections to the API open for reuse
+        :param caches: A list of response caches, e.g. a :code:`DiskCache` (optional)
+        :param submission_index: An index to skip re-submitting identical payloads (optional)
+        :param retry_policy: The policy for retrying transiently failed requests (optional)
+        :param rate_limiter: A rate limiter throttling the requests sent, e.g. a
+            :code:`SharedRateLimiter` (optional)
+        :param refresh_margin: The number of seconds before expiry the JWT tokens are renewed
+        :param background_refresh: Renew the JWT tokens ahead of their expiry in a background thread
+        :param token_store: A store to share the JWT tokens with other
+            processes, e.g. a :code:`FileTokenStore`
+        :param parse_mode: How responses are turned into models: :code:`strict`,
+            :code:`lazy`, or :code:`trusted`
+        :param compression: A policy for compressing large request bodies, e.g.
+            submissions (optional)
+        :param connect_timeout: The seconds to wait for a connection to the API
+            (:code:`None` for no limit)
+        :param read_timeout: The seconds to wait for response data (:code:`None` for no limit)
         """
         self.username = username
         self.password = password
 
+        middlewares = self._default_middlewares(middlewares, no_cache)
+        self.handler = handler or APIHandler(
+            middlewares=middlewares,
+            api_url=api_url,
+            transport=RequestsTransport(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                keep_alive=keep_alive,
+            ),
+            caches=caches,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            parse_mode=parse_mode,
+            compression=compression,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+        )
+        self.refresh_margin = refresh_margin
+        self._tokens = TokenPair.create(api_key, refresh_token)
+        self._auth_lock = threading.RLock()
+        self.token_store = token_store
+        if token_store is not None and api_key is None and refresh_token is None:
+            stored = token_store.load()
+            if stored is not None:
+                LOGGER.debug("Using tokens from %s", token_store)
+                self._tokens = TokenPair.create(*stored)
+        self.submission_index = submission_index
+        self._refresher = None
+        if background_refresh:
+            self.start_token_refresher()
+
+    @property
+    def api_key(self) -> str:
+        """The JWT access token (or API key) sent with authenticated requests."""
+        return self._tokens.api_key
+
+    @api_key.setter
+    def api_key(self, value: str) -> None:
+        self._tokens = self._tokens.with_api_key(value)
+
+    @property
+    def refresh_token(self) -> str:
+        """The JWT refresh token used to renew the access token."""
+        return self._tokens.refresh_token
+
+    @refresh_token.setter
+    def refresh_token(self, value: str) -> None:
+        self._tokens = self._tokens.with_refresh_token(value)
+
+    @staticmethod
+    def _default_middlewares(
+        middlewares: List[BaseMiddleware], no_cache: bool
+    ) -> List[BaseMiddleware]:
+        """Add the required internal middlewares to the user-defined ones.
+
+        :param middlewares: A list of custom middlewares to include
+        :param no_cache: Disable the cache (special privileges required)
+        :return: The complete list of middlewares
+        """
         if not middlewares:
             # initialize without custom middlewares
             middlewares = [
@@ -93,9 +231,7 @@ class Client:
             if AnalysisCacheMiddleware not in type_list:
                 middlewares.append(AnalysisCacheMiddleware(no_cache))
 
-        self.handler = handler or APIHandler(middlewares=middlewares, api_url=api_url)
-        self.api_key = api_key
-        self.refresh_token = refresh_token
+        return middlewares
 
     def _assemble_send_parse(
         self,
@@ -103,6 +239,7 @@ class Client:
         resp_model: Type[RESPONSE_MODELS],
         assert_authentication: bool = True,
         include_auth_header: bool = True,
+        middlewares: List[BaseMiddleware] = None,
     ) -> RESPONSE_MODELS:
         """Assemble the request, send it, parse and return the response.
 
@@ -115,10 +252,52 @@ class Client:
         this method will additionally make sure the user session is valid and if that is not
         the case, try to renew the authentication on a best-effort basis.
 
+        Additional request middlewares can be passed to only apply them to this specific
+        request. They are executed after the handler's registered middlewares.
+
         :param req_obj: The request object to send to the API
         :param resp_model: The response model class to parse the requested results into
         :param assert_authentication: Auto-check authentication
         :param include_auth_header: Include authentication header on request
+        :param middlewares: Additional request middlewares for this request only
+        :return: The parsed API response
+        """
+        req_dict = self._assemble(req_obj, middlewares=middlewares)
+        return self._send_parse(
+            req_dict,
+            resp_model,
+            assert_authentication=assert_authentication,
+            include_auth_header=include_auth_header,
+        )
+
+    def _assemble(
+        self, req_obj: REQUEST_MODELS, middlewares: List[BaseMiddleware] = None
+    ) -> Dict:
+        """Assemble the request and apply the additional request middlewares.
+
+        :param req_obj: The request object to send to the API
+        :param middlewares: Additional request middlewares for this request only
+        :return: The request data dictionary
+        """
+        req_dict = self.handler.assemble_request(req_obj)
+        for mw in middlewares or []:
+            LOGGER.debug("Executing request middleware: %s", mw)
+            req_dict = mw.process_request(req_dict)
+        return req_dict
+
+    def _send_parse(
+        self,
+        req_dict: Dict,
+        resp_model: Type[RESPONSE_MODELS],
+        assert_authentication: bool = True,
+        include_auth_header: bool = True,
+    ) -> RESPONSE_MODELS:
+        """Send an assembled request, parse and return the response.
+
+        :param req_dict: The request data dictionary
+        :param resp_model: The response model class to parse the requested results into
+        :param assert_authentication: Auto-check authentication
+        :param include_auth_header: Include authentication header on request
         :return: The parsed API response
         """
         if assert_authentication:
@@ -128,58 +307,172 @@ class Client:
             if include_auth_header
             else None
         )
-        req_dict = self.handler.assemble_request(req_obj)
         LOGGER.debug("Sending request")
-        resp = self.handler.send_request(req_dict, auth_header=auth_header)
-        LOGGER.debug("Parsing response")
-        return self.handler.parse_response(resp, resp_model)
+        return self.handler.execute_request(req_dict, resp_model, auth_header=auth_header)
 
-    @staticmethod
-    def _get_jwt_expiration_ts(token: str) -> datetime:
-        """Decode the APIs JWT to get their expiration time in UTC.
+    def _submit(
+        self,
+        req_obj: reqmodels.AnalysisSubmissionRequest,
+        middlewares: List[BaseMiddleware] = None,
+    ) -> respmodels.AnalysisSubmissionResponse:
+        """Submit an analysis job, unless an identical one is already known.
+
+        If a submission index is configured, the digest of the assembled payload is
+        looked up in it first. If a recent job for the same payload exists and has not
+        failed, its status is returned as submission response instead of uploading the
+        payload again. Submissions that are added to a group or explicitly bypass the
+        API's cache are always sent, as reusing a job would not honour these options.
 
-        :param token: The JWT to perform the check on
-        :return: The UTC expiration datetime object
+        :param req_obj: The analysis submission request
+        :param middlewares: Additional request middlewares for this request only
+        :return: :code:`AnalysisSubmissionResponse`
         """
-        return datetime.utcfromtimestamp((jwt.decode(token, verify=False)["exp"]))
+        req_dict = self._assemble(req_obj, middlewares=middlewares)
+        payload = req_dict["payload"]
+        use_index = self.submission_index is not None and not (
+            payload.get("groupId") or payload.get("groupName") or payload.get("noCacheLookup")
+        )
+        if not use_index:
+            return self._send_parse(req_dict, respmodels.AnalysisSubmissionResponse)
+
+        digest = self.submission_index.digest(payload)
+        uuid = self.submission_index.lookup(digest)
+        if uuid is not None:
+            status = self.analysis_status(uuid)
+            if status.status != respmodels.AnalysisStatus.ERROR:
+                LOGGER.debug("Reusing analysis %s for identical payload", uuid)
+                return respmodels.AnalysisSubmissionResponse(**status.dict(by_alias=True))
+            LOGGER.debug("Known analysis %s has failed - submitting again", uuid)
+            self.submission_index.discard(digest)
+
+        resp = self._send_parse(req_dict, respmodels.AnalysisSubmissionResponse)
+        self.submission_index.record(digest, resp.uuid)
+        return resp
 
     def assert_authentication(self) -> None:
         """Make sure the user is authenticated.
 
         If necessary, this method will refresh the access token, or perform another
-        login to get a fresh combination of tokens if both are expired.
+        login to get a fresh combination of tokens if both are expired. The tokens'
+        expiration times are decoded once when they are set, so this check is cheap.
+        Tokens are renewed :code:`refresh_margin` seconds before they actually expire.
+
+        The client can be shared between threads. Only one of them renews the tokens,
+        while the others wait for it and continue with the new pair. With a token store,
+        the same applies to all processes using the store: before renewing, the store is
+        locked and tokens renewed by another process in the meantime are adopted.
 
         :return: None
         """
-        if self.api_key is not None and self.refresh_token is None:
-            # Override with access token if it's the only thing we were given
+        if self._tokens.renewal(self.refresh_margin) is None:
+            LOGGER.debug("Auth check passed, token still valid")
             return
-        elif self.api_key is None and self.refresh_token is None:
-            # We haven't authenticated yet
-            self.login()
+        self._renew_tokens(self.refresh_margin)
+
+    def _renew_tokens(self, margin: float) -> None:
+        """Renew the tokens if they expire within the given margin.
+
+        :param margin: The number of seconds before expiry the tokens are renewed
+        :return: None
+        """
+        with self._auth_lock, self._store_lock():
+            # another thread or process may have renewed the tokens while we were waiting
+            self._reload_tokens(margin)
+            renewal = self._tokens.renewal(margin)
+            if renewal == "refresh":
+                # access token (nearly) expired, but refresh token hasn't - use it to get
+                # a new access token
+                LOGGER.debug("Auth refresh needed")
+                self.refresh()
+            elif renewal == "login":
+                # not authenticated yet, or the refresh token has also expired - let's login again
+                LOGGER.debug("No valid access or refresh token - logging in")
+                self.login()
+
+    @contextmanager
+    def _store_lock(self) -> Iterator[None]:
+        """Lock the token store, if one is configured.
+
+        :return: None
+        """
+        if self.token_store is None:
+            yield
             return
-        now = datetime.utcnow()
-        access_expiration = self._get_jwt_expiration_ts(self.api_key)
-        refresh_expiration = self._get_jwt_expiration_ts(self.refresh_token)
-        if now < access_expiration:
-            # auth token still valid - continue
-            LOGGER.debug(
-                "Auth check passed, token still valid: {} < {}".format(
-                    now, access_expiration
-                )
-            )
-        elif access_expiration < now < refresh_expiration:
-            # access token expired, but refresh token hasn't - use it to get new access token
-            LOGGER.debug(
-                "Auth refresh needed: {} < {} < {}".format(
-                    access_expiration, now, refresh_expiration
-                )
-            )
-            self.refresh()
-        else:
-            # refresh token has also expired - let's login again
-            LOGGER.debug("Access and refresh token have expired - logging in again")
-            self.login()
+        with self.token_store.lock():
+            yield
+
+    def _reload_tokens(self, margin: float) -> None:
+        """Adopt the tokens from the token store if they are usable.
+
+        :param margin: The number of seconds before expiry the tokens are renewed
+        :return: None
+        """
+        if self.token_store is None:
+            return
+        stored = self.token_store.load()
+        if stored is None or stored == (self.api_key, self.refresh_token):
+            return
+        tokens = TokenPair.create(*stored)
+        if tokens.renewal(margin) is None:
+            LOGGER.debug("Using tokens renewed by another process")
+            self._tokens = tokens
+
+    def _publish_tokens(self, tokens: TokenPair) -> None:
+        """Replace the client's tokens and save them in the token store.
+
+        :param tokens: The new token pair
+        :return: None
+        """
+        self._tokens = tokens
+        if self.token_store is not None:
+            self.token_store.save(tokens.api_key, tokens.refresh_token)
+
+    def start_token_refresher(self, lead: float = DEFAULT_REFRESH_LEAD) -> TokenRefresher:
+        """Renew the JWT tokens in a background thread before they expire.
+
+        This is useful for long-running processes, whose requests would otherwise
+        have to wait for a refresh or login every now and then. The thread is stopped
+        when leaving the client's context, or by calling :code:`stop_token_refresher`.
+
+        :param lead: The number of seconds before expiry the tokens are renewed
+        :return: The running :code:`TokenRefresher`
+        """
+        self.stop_token_refresher()
+        self._refresher = TokenRefresher(self, lead=lead)
+        self._refresher.start()
+        return self._refresher
+
+    def stop_token_refresher(self) -> None:
+        """Stop the background token refresher, if one is running.
+
+        :return: None
+        """
+        if self._refresher is not None:
+            self._refresher.stop()
+            self._refresher = None
+
+    def deadline(self, timeout: float) -> Deadline:
+        """Share a time budget between all requests made within a block.
+
+        This bounds composite operations, such as submitting an analysis, waiting for
+        it, and fetching its report, by a single timeout. Request timeouts are
+        shortened to the time remaining, and a :code:`MythXTimeoutError` is raised as
+        soon as the budget has run out, instead of sending further requests. The
+        worker threads of :code:`analyze_many` and :code:`export_analyses` share the
+        budget of the block they are started in. Using a deadline with the
+        :code:`AsyncClient` requires Python 3.7 or later.
+
+        .. code-block:: python3
+
+            with client.deadline(600):
+                resp = client.analyze(bytecode=bytecode)
+                client.wait_for_analysis(resp.uuid)
+                report = client.report(resp.uuid)
+
+        :param timeout: The time budget in seconds
+        :return: A :code:`Deadline` to use as a context manager
+        """
+        return Deadline(timeout)
 
     def login(self) -> respmodels.AuthLoginResponse:
         """Perform a login request on the API and return the response.
@@ -187,25 +480,31 @@ class Client:
         :return: :code:`AuthLoginResponse`
         """
         req = reqmodels.AuthLoginRequest(username=self.username, password=self.password)
-        resp_model: respmodels.AuthLoginResponse = self._assemble_send_parse(
-            req,
-            respmodels.AuthLoginResponse,
-            assert_authentication=False,
-            include_auth_header=False,
-        )
-        self.api_key = resp_model.access_token
-        self.refresh_token = resp_model.refresh_token
+        with self._auth_lock, self._store_lock():
+            resp_model: respmodels.AuthLoginResponse = self._assemble_send_parse(
+                req,
+                respmodels.AuthLoginResponse,
+                assert_authentication=False,
+                include_auth_header=False,
+            )
+            self._publish_tokens(
+                TokenPair.create(resp_model.access_token, resp_model.refresh_token)
+            )
         return resp_model
 
     def logout(self) -> respmodels.AuthLogoutResponse:
         """Perform a logout request on the API and return the response.
 
+        As the logout invalidates the user's tokens globally, they are also removed
+        from the token store.
+
         :return: :code:`AuthLogoutResponse`
         """
         req = reqmodels.AuthLogoutRequest(**{"global": True})
         resp_model = self._assemble_send_parse(req, respmodels.AuthLogoutResponse)
-        self.api_key = None
-        self.refresh_token = None
+        self._tokens = TokenPair()
+        if self.token_store is not None:
+            self.token_store.clear()
         return resp_model
 
     def refresh(self) -> respmodels.AuthRefreshResponse:
@@ -213,17 +512,20 @@ class Client:
 
         :return: :code:`AuthRefreshResponse`
         """
-        req = reqmodels.AuthRefreshRequest(
-            access_token=self.api_key, refresh_token=self.refresh_token
-        )
-        resp_model: respmodels.AuthRefreshResponse = self._assemble_send_parse(
-            req,
-            respmodels.AuthRefreshResponse,
-            assert_authentication=False,
-            include_auth_header=False,
-        )
-        self.api_key = resp_model.access_token
-        self.refresh_token = resp_model.refresh_token
+        with self._auth_lock, self._store_lock():
+            tokens = self._tokens
+            req = reqmodels.AuthRefreshRequest(
+                access_token=tokens.api_key, refresh_token=tokens.refresh_token
+            )
+            resp_model: respmodels.AuthRefreshResponse = self._assemble_send_parse(
+                req,
+                respmodels.AuthRefreshResponse,
+                assert_authentication=False,
+                include_auth_header=False,
+            )
+            self._publish_tokens(
+                TokenPair.create(resp_model.access_token, resp_model.refresh_token)
+            )
         return resp_model
 
     def project_list(
@@ -352,7 +654,245 @@ class Client:
             group_id=group_id,
             main_source=main_source,
         )
-        return self._assemble_send_parse(req, respmodels.AnalysisListResponse)
+        req_dict = self._assemble(req)
+        # the request model sends date_from for both bounds
+        req_dict["params"].pop("dateTo", None)
+        if date_to is not None:
+            req_dict["params"]["dateTo"] = date_to.isoformat()
+        return self._send_parse(req_dict, respmodels.AnalysisListResponse)
+
+    @staticmethod
+    def _iter_pages(
+        fetch_page: Callable[[int], RESPONSE_MODELS],
+        items: Callable[[RESPONSE_MODELS], List[T]],
+        key: Callable[[T], str],
+        prefetch: bool = True,
+    ) -> Iterator[T]:
+        """Lazily walk through all pages of a list endpoint.
+
+        While the items of one page are consumed, the next page is already fetched in
+        a background thread. As new entries can shift the offsets between two page
+        requests, items that have already been yielded are skipped.
+
+        :param fetch_page: A function returning the list response for an offset
+        :param items: A function returning the items of a list response
+        :param key: A function returning an item's unique ID
+        :param prefetch: Fetch the next page while the current one is consumed
+        :return: An iterator over the items of all pages
+        """
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        future = None
+        seen = set()
+        try:
+            offset = 0
+            page = fetch_page(offset)
+            while True:
+                batch = items(page)
+                offset += len(batch)
+                has_next = bool(batch) and offset < page.total
+                if has_next and executor is not None:
+                    # run the worker in the caller's context to share its deadline
+                    future = executor.submit(copy_context().run, fetch_page, offset)
+                for item in batch:
+                    item_key = key(item)
+                    if item_key not in seen:
+                        seen.add(item_key)
+                        yield item
+                if not has_next:
+                    return
+                page = future.result() if future is not None else fetch_page(offset)
+                future = None
+        finally:
+            if executor is not None:
+                if future is not None:
+                    future.cancel()
+                executor.shutdown(wait=False)
+
+    def iter_analyses(
+        self,
+        date_from: datetime = None,
+        date_to: datetime = None,
+        created_by: str = None,
+        group_name: str = None,
+        group_id: str = None,
+        main_source: str = None,
+        prefetch: bool = True,
+    ) -> Iterator[AnalysisShort]:
+        """Iterate over all of the user's analysis jobs matching the given
+        filters.
+
+        Pages are requested lazily, so only the current and the next page are held in
+        memory.
+
+        :param date_from: Start of the date range (optional)
+        :param date_to: End of the date range (optional)
+        :param created_by: Filter analysis results based on the creator
+        :param group_name: Filter analysis results based on the group name
+        :param group_id: Filter analysis results based on their group ID
+        :param main_source: Filter analysis results based on their main source name
+        :param prefetch: Fetch the next page in the background while the current one is consumed
+        :return: An iterator over :code:`AnalysisShort` models
+        """
+        return self._iter_pages(
+            lambda offset: self.analysis_list(
+                date_from=date_from,
+                date_to=date_to,
+                offset=offset,
+                created_by=created_by,
+                group_name=group_name,
+                group_id=group_id,
+                main_source=main_source,
+            ),
+            items=lambda page: page.analyses,
+            key=lambda analysis: analysis.uuid,
+            prefetch=prefetch,
+        )
+
+    def iter_groups(
+        self,
+        created_by: str = "",
+        group_name: str = "",
+        date_from: datetime = None,
+        date_to: datetime = None,
+        prefetch: bool = True,
+    ) -> Iterator[respmodels.Group]:
+        """Iterate over all analysis groups matching the given filters.
+
+        :param created_by: Filter the list results by the creator's user ID
+        :param group_name: Filter the list results by the group's name
+        :param date_from: Only display results after the given date
+        :param date_to: Only display results until the given date
+        :param prefetch: Fetch the next page in the background while the current one is consumed
+        :return: An iterator over :code:`Group` models
+        """
+        return self._iter_pages(
+            lambda offset: self.group_list(
+                offset=offset,
+                created_by=created_by,
+                group_name=group_name,
+                date_from=date_from,
+                date_to=date_to,
+            ),
+            items=lambda page: page.groups,
+            key=lambda group: group.identifier,
+            prefetch=prefetch,
+        )
+
+    def iter_projects(
+        self, name: str = "", page_size: int = None, prefetch: bool = True
+    ) -> Iterator[ShortProject]:
+        """Iterate over all projects matching the given name.
+
+        :param name: The name to filter projects by (optional)
+        :param page_size: The number of projects to request per page (optional)
+        :param prefetch: Fetch the next page in the background while the current one is consumed
+        :return: An iterator over :code:`ShortProject` models
+        """
+        return self._iter_pages(
+            lambda offset: self.project_list(offset=offset, limit=page_size, name=name),
+            items=lambda page: page.projects,
+            key=lambda project: project.id,
+            prefetch=prefetch,
+        )
+
+    def export_analyses(
+        self,
+        date_from: datetime,
+        date_to: datetime = None,
+        created_by: str = None,
+        group_name: str = None,
+        group_id: str = None,
+        main_source: str = None,
+        max_workers: int = 4,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+    ) -> Iterator[AnalysisShort]:
+        """Iterate over all of the user's analysis jobs in a date window, listing
+        parts of the window in parallel.
+
+        Walking a long history with :code:`iter_analyses` is serial, and deep offsets
+        are slow to serve. Instead, the window is split into shards of equal length,
+        which are listed by a pool of :code:`max_workers` threads. The first page of
+        each shard tells how many analyses it holds. Shards with more than
+        :code:`shard_size` entries are split further according to that density, the
+        others are paged through.
+
+        The analyses are yielded newest first, like the API lists them. Only the shards
+        close to the consumer's position are fetched ahead, so at most
+        :code:`max_workers` shards are held in memory. Analyses submitted at the
+        boundary of two shards are yielded once.
+
+        :param date_from: Start of the date range
+        :param date_to: End of the date range (defaults to now)
+        :param created_by: Filter analysis results based on the creator
+        :param group_name: Filter analysis results based on the group name
+        :param group_id: Filter analysis results based on their group ID
+        :param main_source: Filter analysis results based on their main source name
+        :param max_workers: The maximum number of shards listed concurrently
+        :param shard_size: The maximum number of analyses listed serially in one shard
+        :return: An iterator over :code:`AnalysisShort` models
+        """
+        if date_to is None:
+            date_to = datetime.now(tz=date_from.tzinfo)
+        filters = dict(
+            created_by=created_by,
+            group_name=group_name,
+            group_id=group_id,
+            main_source=main_source,
+        )
+
+        def fetch(shard):
+            first = self.analysis_list(
+                date_from=shard.date_from, date_to=shard.date_to, **filters
+            )
+            parts = shard.split(first.total, shard_size)
+            if parts is not None:
+                return parts, None
+            pages = self._iter_pages(
+                lambda offset: first
+                if offset == 0
+                else self.analysis_list(
+                    date_from=shard.date_from,
+                    date_to=shard.date_to,
+                    offset=offset,
+                    **filters
+                ),
+                items=lambda page: page.analyses,
+                key=lambda analysis: analysis.uuid,
+                prefetch=False,
+            )
+            return None, list(pages)
+
+        # authenticate once up front instead of racing for it in the workers
+        self.assert_authentication()
+
+        shards = deque(split_range(date_from, date_to, max_workers))
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = {}
+        previous = set()
+        try:
+            while shards:
+                for shard in islice(shards, max_workers):
+                    if shard not in pending:
+                        # run the workers in the caller's context to share its deadline
+                        pending[shard] = executor.submit(
+                            copy_context().run, fetch, shard
+                        )
+                shard = shards.popleft()
+                parts, analyses = pending.pop(shard).result()
+                if parts is not None:
+                    shards.extendleft(reversed(parts))
+                    continue
+                # only adjacent shards overlap, so older UUIDs can be forgotten
+                current = set()
+                for analysis in analyses:
+                    current.add(analysis.uuid)
+                    if analysis.uuid not in previous:
+                        yield analysis
+                previous = current
+        finally:
+            for future in pending.values():
+                future.cancel()
+            executor.shutdown(wait=False)
 
     def analyze(
         self,
@@ -398,7 +938,102 @@ class Client:
             solc_version=solc_version,
             analysis_mode=analysis_mode,
         )
-        return self._assemble_send_parse(req, respmodels.AnalysisSubmissionResponse)
+        return self._submit(req)
+
+    def analyze_many(
+        self,
+        payloads: Iterable[reqmodels.AnalysisSubmissionRequest],
+        max_in_flight: int = 4,
+        group_id: str = None,
+        group_name: str = None,
+        on_error: Callable[[reqmodels.AnalysisSubmissionRequest, Exception], None] = None,
+    ) -> Iterator[respmodels.AnalysisSubmissionResponse]:
+        """Submit a batch of analysis jobs concurrently.
+
+        The payloads are submitted by a pool of at most :code:`max_in_flight` worker
+        threads. The iterable is consumed lazily, so only as many payloads are held in
+        memory as there are submissions in flight. Submission responses are yielded in
+        the order the submissions complete, not in the order of the payloads.
+
+        A failed submission does not abort the batch. If an :code:`on_error` callback
+        is given, it is called with the failed payload and the raised exception.
+        Otherwise, the failures are collected and a :code:`MythXAPIError` listing them
+        is raised once all other submissions have been yielded.
+
+        The batch can be tagged as a single analysis group. If a :code:`group_id` is
+        given, all submissions are added to that group. If only a :code:`group_name` is
+        given, a new group with that name is created before the first submission and
+        sealed after the last one has completed, or once the batch has been aborted.
+
+        Note that submitting more payloads in parallel than the transport's
+        :code:`pool_maxsize` allows will open connections that are not reused.
+
+        :param payloads: An iterable of :code:`AnalysisSubmissionRequest` models
+        :param max_in_flight: The maximum number of concurrent submissions
+        :param group_id: The ID of the group to add all submissions to (optional)
+        :param group_name: The name of a new group to add all submissions to (optional)
+        :param on_error: Callback receiving the payload and exception of failed submissions
+        :return: An iterator over :code:`AnalysisSubmissionResponse` models
+        """
+        # authenticate once up front instead of racing for it in the workers
+        self.assert_authentication()
+
+        created_group = False
+        if group_id is None and group_name:
+            group_id = self.create_group(group_name=group_name).identifier
+            created_group = True
+        middlewares = [GroupDataMiddleware(group_id=group_id)] if group_id else []
+
+        def submit(payload):
+            return self._submit(payload, middlewares=middlewares)
+
+        failures = []
+        payloads = iter(payloads)
+        try:
+            with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+                pending = {}
+                for payload in payloads:
+                    # run the workers in the caller's context to share its deadline
+                    future = executor.submit(copy_context().run, submit, payload)
+                    pending[future] = payload
+                    if len(pending) >= max_in_flight:
+                        break
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        payload = pending.pop(future)
+                        next_payload = next(payloads, None)
+                        if next_payload is not None:
+                            next_future = executor.submit(
+                                copy_context().run, submit, next_payload
+                            )
+                            pending[next_future] = next_payload
+                        try:
+                            resp = future.result()
+                        except Exception as e:
+                            LOGGER.debug(
+                                "Submission of %s failed: %s", payload.main_source, e
+                            )
+                            if on_error is None:
+                                failures.append((payload, e))
+                            else:
+                                on_error(payload, e)
+                            continue
+                        yield resp
+        finally:
+            # seal the group even if the batch is aborted, e.g. by closing the iterator
+            if created_group:
+                self.seal_group(group_id)
+
+        if failures:
+            raise MythXAPIError(
+                "{} of the batch submissions failed: {}".format(
+                    len(failures),
+                    "; ".join(
+                        "{}: {}".format(payload.main_source, e) for payload, e in failures
+                    ),
+                )
+            )
 
     def group_status(self, group_id: str) -> respmodels.GroupStatusResponse:
         """Get the status of an analysis group by its ID.
@@ -431,16 +1066,263 @@ class Client:
             or resp.status == respmodels.AnalysisStatus.ERROR
         )
 
+    def wait_for_analysis(
+        self,
+        uuid: str,
+        timeout: float = None,
+        analysis_mode: str = None,
+        backoff: Backoff = None,
+    ) -> respmodels.AnalysisStatusResponse:
+        """Wait until the analysis job with the given UUID has finished
+        processing.
+
+        The job's status is polled with an exponentially growing delay, see
+        :code:`wait_for_many` for details.
+
+        :param uuid: The analysis job UUID
+        :param timeout: The overall time budget in seconds (optional)
+        :param analysis_mode: The job's analysis mode, used as a polling hint (optional)
+        :param backoff: A custom backoff curve (optional)
+        :return: The job's final :code:`AnalysisStatusResponse`
+        """
+        return next(
+            self.wait_for_many(
+                [uuid], timeout=timeout, analysis_mode=analysis_mode, backoff=backoff
+            )
+        )
+
+    def wait_for_many(
+        self,
+        uuids: Iterable[str],
+        timeout: float = None,
+        analysis_mode: str = None,
+        backoff: Backoff = None,
+    ) -> Iterator[respmodels.AnalysisStatusResponse]:
+        """Wait for multiple analysis jobs and yield each as soon as it has
+        finished processing.
+
+        All jobs are multiplexed over a single scheduler, which always polls the job
+        that is due soonest. After each poll of a job that is still queued or running,
+        its next poll is scheduled after a delay taken from an exponential backoff
+        curve with jitter. If no custom curve is given, it is derived from the analysis
+        mode, which is taken from the first status response if not passed explicitly.
+
+        A job's status response is yielded once it reaches the :code:`Finished` or
+        :code:`Error` state. If a timeout is given and the next poll of a pending job
+        would happen after it has passed, a :code:`MythXTimeoutError` is raised right
+        away instead of sleeping until then. Within a :code:`deadline` block, the
+        earlier of the timeout and the block's deadline applies.
+
+        :param uuids: The analysis job UUIDs
+        :param timeout: The overall time budget in seconds (optional)
+        :param analysis_mode: The jobs' analysis mode, used as a polling hint (optional)
+        :param backoff: A custom backoff curve (optional)
+        :return: An iterator over the final :code:`AnalysisStatusResponse` models
+        """
+        deadline = Deadline.within(timeout)
+        now = time.monotonic()
+        # (due time, sequence number, uuid, attempt, backoff curve) - each job is
+        # scheduled once, and dropped as soon as it is terminal
+        schedule = [
+            (now, seq, uuid, 0, backoff) for seq, uuid in enumerate(dict.fromkeys(uuids))
+        ]
+        heapq.heapify(schedule)
+        seq = len(schedule)
+
+        while schedule:
+            due, _, uuid, attempt, job_backoff = heapq.heappop(schedule)
+            if deadline is not None and due > deadline.expires_at:
+                pending = [uuid] + [entry[2] for entry in schedule]
+                raise MythXTimeoutError(
+                    "Timed out after {}s waiting for analyses: {}".format(
+                        deadline.timeout, ", ".join(pending)
+                    )
+                )
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            resp = self.analysis_status(uuid)
+            if resp.status in TERMINAL_STATUSES:
+                yield resp
+                continue
+
+            if job_backoff is None:
+                job_backoff = Backoff.for_mode(analysis_mode or resp.analysis_mode)
+            next_delay = job_backoff.delay(attempt)
+            LOGGER.debug(
+                "Analysis %s is %s - polling again in %.2fs", uuid, resp.status, next_delay
+            )
+            heapq.heappush(
+                schedule,
+                (time.monotonic() + next_delay, seq, uuid, attempt + 1, job_backoff),
+            )
+            seq += 1
+
+    def wait_for_group(
+        self,
+        group_id: str,
+        uuids: Iterable[str] = None,
+        timeout: float = None,
+        analysis_mode: str = None,
+        backoff: Backoff = None,
+        seal: bool = False,
+    ) -> Iterator[respmodels.AnalysisStatusResponse]:
+        """Wait for the analysis jobs of a group and yield each as soon as it
+        has finished processing.
+
+        Instead of polling every job's status, this polls the group's status once per
+        round. Only if the group's number of finished and failed jobs has changed since
+        the last round, the pending jobs' statuses are fetched - and only until the new
+        terminal jobs have been found. For grouped submissions, e.g. the ones made
+        through :code:`analyze_many` with a group name, this keeps the polling traffic
+        constant instead of growing with the number of jobs.
+
+        The UUIDs of the group's jobs should be passed if they are known. Otherwise,
+        they are discovered by listing the group's analyses whenever the group holds
+        more jobs than known so far. In that case, waiting only ends once the group
+        has been sealed, which can be done right away by setting :code:`seal`.
+
+        Each round fetches job statuses only while the group reports more terminal
+        jobs than in the previous round, starting with the jobs that have not been
+        checked the longest. Terminal jobs in the group that are not waited for, e.g.
+        because only some of its UUIDs were passed, therefore do not cause the pending
+        jobs to be polled again. Once the group reports all of its jobs as terminal,
+        the remaining pending jobs are checked every round, as their states lag behind.
+
+        Poll delays and the timeout behave like in :code:`wait_for_many`. The delay
+        is reset whenever a round has made progress.
+
+        :param group_id: The ID of the group to wait for
+        :param uuids: The UUIDs of the jobs in the group (optional)
+        :param timeout: The overall time budget in seconds (optional)
+        :param analysis_mode: The jobs' analysis mode, used as a polling hint (optional)
+        :param backoff: A custom backoff curve (optional)
+        :param seal: Seal the group before waiting for it
+        :return: An iterator over the final :code:`AnalysisStatusResponse` models
+        """
+        deadline = Deadline.within(timeout)
+        backoff = backoff or Backoff.for_mode(analysis_mode)
+        if seal:
+            self.seal_group(group_id)
+
+        discover = uuids is None
+        pending = deque() if discover else deque(dict.fromkeys(uuids))
+        known = set(pending)
+        seen_terminal = 0
+        attempt = 0
+
+        while True:
+            group = self.group_status(group_id)
+            stats = group.analysis_statistics
+            if discover and stats.total > len(known):
+                new_uuids = self._group_analysis_uuids(group_id) - known
+                known |= new_uuids
+                pending.extend(sorted(new_uuids))
+
+            terminal = stats.finished + stats.failed
+            # once the group is done, the jobs still pending only lag behind it
+            if terminal >= stats.total:
+                expected = len(pending)
+            else:
+                expected = terminal - seen_terminal
+            if expected > 0:
+                LOGGER.debug("Group %s has %s new terminal jobs", group_id, expected)
+                found = 0
+                for _ in range(len(pending)):
+                    uuid = pending.popleft()
+                    resp = self.analysis_status(uuid)
+                    if resp.status not in TERMINAL_STATUSES:
+                        # check the others first next time
+                        pending.append(uuid)
+                        continue
+                    found += 1
+                    yield resp
+                    if found >= expected:
+                        break
+                seen_terminal = terminal
+                if found:
+                    attempt = 0
+
+            if not pending and (
+                not discover
+                or (group.status == GroupState.SEALED and stats.total == len(known))
+            ):
+                return
+
+            next_poll = time.monotonic() + backoff.delay(attempt)
+            if deadline is not None and next_poll > deadline.expires_at:
+                raise MythXTimeoutError(
+                    "Timed out after {}s waiting for group {} with pending analyses: {}".format(
+                        deadline.timeout, group_id, ", ".join(pending)
+                    )
+                )
+            time.sleep(max(0.0, next_poll - time.monotonic()))
+            attempt += 1
+
+    def _group_analysis_uuids(self, group_id: str) -> Set[str]:
+        """List the UUIDs of all analysis jobs in a group.
+
+        :param group_id: The group ID
+        :return: The set of job UUIDs
+        """
+        return {analysis.uuid for analysis in self.iter_analyses(group_id=group_id)}
+
     def report(self, uuid: str) -> respmodels.DetectedIssuesResponse:
         """Get the report holding found issues for an analysis job based on its
         UUID.
 
+        If a cache storing reports only for jobs with a cached final status is
+        registered, e.g. a :code:`DiskCache`, the job's status is looked up first. A
+        finished job's status and report are then both served from the cache on later
+        calls.
+
         :param uuid: The analysis job UUID
         :return: :code:`DetectedIssuesResponse`
         """
+        if self._report_needs_status():
+            self.analysis_status(uuid)
         req = reqmodels.DetectedIssuesRequest(uuid=uuid)
         return self._assemble_send_parse(req, respmodels.DetectedIssuesResponse)
 
+    def _report_needs_status(self) -> bool:
+        """Check whether a registered cache only stores reports of jobs whose final
+        status it holds.
+
+        :return: Whether the job's status should be looked up before its report
+        """
+        return any(cache.requires_final_status for cache in self.handler.caches)
+
+    def iter_issues(self, uuid: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Issue]:
+        """Iterate over the issues found by an analysis job while its report is
+        being downloaded.
+
+        Reports of large code bases can be huge. Unlike :code:`report`, which holds
+        the whole response body, its decoded JSON, and the parsed models in memory at
+        the same time, this parses the body incrementally as it is received from the
+        socket, and yields one :code:`Issue` at a time. Report level fields, such as
+        the source list and meta data, are skipped, as each issue carries its own
+        locations.
+
+        The streamed report bypasses the response caches and response middlewares.
+        The request is only sent once iteration starts.
+
+        :param uuid: The analysis job UUID
+        :param chunk_size: The maximum number of bytes read from the socket at a time
+        :return: An iterator over :code:`Issue` models
+        """
+        req_dict = self._assemble(reqmodels.DetectedIssuesRequest(uuid=uuid))
+        self.assert_authentication()
+        auth_header = {"Authorization": "Bearer {}".format(self.api_key)}
+        parser = IssueStreamParser()
+        for chunk in self.handler.stream_request(
+            req_dict, auth_header=auth_header, chunk_size=chunk_size
+        ):
+            for issue in parser.feed(chunk):
+                yield Issue.parse_obj(issue)
+        for issue in parser.close():
+            yield Issue.parse_obj(issue)
+
     def request_by_uuid(self, uuid: str) -> respmodels.AnalysisInputResponse:
         """Get the input request based on the analysis job's UUID.
 
@@ -507,10 +1389,16 @@ class Client:
         """Exit point for the client context handler.
 
         This method takes in parameters from context execution to handle
-        exceptions that might have arisen.
+        exceptions that might have arisen. The background token refresher is
+        stopped before logging out. Afterwards, the handler's connection pool is
+        closed - even if the logout request failed.
 
         :param exc_type: The exception type during context execution
         :param exc_value: The exception value from context execution
         :param traceback: The traceback from context execution
         """
-        self.logout()
+        self.stop_token_refresher()
+        try:
+            self.logout()
+        finally:
+            self.handler.close()
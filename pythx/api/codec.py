@@ -0,0 +1,96 @@
+"""This module contains the JSON codecs used to encode request payloads and
+decode response bodies."""
+
+import abc
+import json
+import logging
+from typing import Any
+
+LOGGER = logging.getLogger(__name__)
+
+JSON_CONTENT_TYPE = "application/json"
+
+
+class BaseCodec(abc.ABC):
+    """Abstract codec class that can be used by developers to build their own.
+
+    A codec turns request payloads into the raw bytes sent over the wire, and raw
+    response bodies back into Python objects. Invalid response bodies are expected
+    to raise a :code:`json.JSONDecodeError` (or a subclass of it), so the handler
+    can report them as API errors.
+    """
+
+    #: A short name of the JSON library used, for logging purposes
+    name = None
+
+    @abc.abstractmethod
+    def encode(self, obj: Any) -> bytes:
+        """Abstract method for encoding a request payload.
+
+        :param obj: The JSON-serializable payload
+        :return: The UTF-8 encoded JSON document
+        """
+        pass
+
+    @abc.abstractmethod
+    def decode(self, data: bytes) -> Any:
+        """Abstract method for decoding a response body.
+
+        :param data: The raw response body
+        :return: The decoded JSON document
+        """
+        pass
+
+    def __repr__(self) -> str:
+        return "<{}>".format(self.__class__.__name__)
+
+
+class StdlibCodec(BaseCodec):
+    """A codec based on Python's built-in :code:`json` module.
+
+    Payloads are encoded without any insignificant whitespace.
+    """
+
+    name = "json"
+
+    def encode(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    def decode(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(BaseCodec):
+    """A codec based on :code:`orjson`, which encodes and decodes JSON several
+    times faster than the standard library.
+
+    This codec requires the optional :code:`orjson` dependency, which can be
+    installed with :code:`pip install pythx[fast]`.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        """Instantiate a new orjson codec."""
+        import orjson
+
+        self._orjson = orjson
+
+    def encode(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj)
+
+    def decode(self, data: bytes) -> Any:
+        # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+        return self._orjson.loads(data)
+
+
+def default_codec() -> BaseCodec:
+    """Get the fastest available JSON codec.
+
+    :return: An :code:`OrjsonCodec` if orjson is installed, a :code:`StdlibCodec` otherwise
+    """
+    try:
+        return OrjsonCodec()
+    except ImportError:
+        LOGGER.debug("orjson is not installed - falling back to the json module")
+        return StdlibCodec()
@@ -0,0 +1,167 @@
+"""This module contains the compression policy for request bodies and the
+transfer statistics reported for each request."""
+
+import gzip
+import logging
+import threading
+import zlib
+from typing import Callable, NamedTuple, Optional, Tuple
+
+import requests
+
+LOGGER = logging.getLogger(__name__)
+
+# response encodings the client can decode, advertised with every request
+ACCEPT_ENCODING = "gzip, deflate"
+# bodies smaller than this are sent uncompressed
+DEFAULT_COMPRESSION_THRESHOLD = 16 * 1024
+DEFAULT_COMPRESSION_LEVEL = 6
+ENCODINGS = ("gzip", "deflate")
+# the status code of a server refusing the body's content encoding
+UNSUPPORTED_MEDIA_TYPE = 415
+
+
+class TransferStats(NamedTuple):
+    """The number of bytes a request and its response took up, before and after
+    compression."""
+
+    method: str
+    url: str
+    request_bytes: int
+    request_wire_bytes: int
+    request_encoding: Optional[str]
+    response_bytes: int
+    response_wire_bytes: int
+    response_encoding: Optional[str]
+
+
+def wire_size(response: requests.Response) -> int:
+    """Get the number of body bytes a response took up on the wire.
+
+    :param response: The HTTP response, with its body already read
+    :return: The size of the possibly compressed body
+    """
+    tell = getattr(response.raw, "tell", None)
+    if tell is not None:
+        try:
+            size = tell()
+        except (OSError, ValueError):
+            size = 0
+        if size:
+            return size
+    try:
+        return int(response.headers["Content-Length"])
+    except (KeyError, ValueError):
+        return len(response.content)
+
+
+class CompressionPolicy:
+    """Decide whether a request body is compressed before it is sent.
+
+    Bodies of at least :code:`threshold` bytes, e.g. analysis submissions carrying
+    the sources and ASTs of a project, are compressed with the configured
+    :code:`gzip` or :code:`deflate` encoding and sent with a matching
+    :code:`Content-Encoding` header. A body that would not shrink is sent as is.
+
+    If the API refuses a compressed body with status 415, the handler sends it again
+    uncompressed, and compression is turned off for the rest of the policy's
+    lifetime, so later requests do not pay for the round trip.
+
+    An optional :code:`on_transfer` callback receives a :code:`TransferStats` event
+    after every request, e.g. to feed metrics.
+    """
+
+    def __init__(
+        self,
+        threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+        encoding: str = "gzip",
+        level: int = DEFAULT_COMPRESSION_LEVEL,
+        on_transfer: Callable[[TransferStats], None] = None,
+    ):
+        """Instantiate a new compression policy.
+
+        :param threshold: The minimum body size in bytes to compress
+        :param encoding: The content encoding to use, :code:`gzip` or :code:`deflate`
+        :param level: The compression level from 1 (fastest) to 9 (smallest)
+        :param on_transfer: A callback receiving the byte counts of every request
+        """
+        if encoding not in ENCODINGS:
+            raise ValueError("Unsupported content encoding: {}".format(encoding))
+        self.threshold = threshold
+        self.encoding = encoding
+        self.level = level
+        self.on_transfer = on_transfer
+        self.enabled = True
+        self._lock = threading.Lock()
+
+    def compress(self, body: Optional[bytes]) -> Tuple[Optional[bytes], Optional[str]]:
+        """Compress a request body if it is worth it.
+
+        :param body: The encoded request body
+        :return: The body to send and its content encoding, or :code:`None` if it is
+            sent uncompressed
+        """
+        if not self.enabled or body is None or len(body) < self.threshold:
+            return body, None
+        if self.encoding == "gzip":
+            compressed = gzip.compress(body, compresslevel=self.level)
+        else:
+            compressed = zlib.compress(body, self.level)
+        if len(compressed) >= len(body):
+            return body, None
+        LOGGER.debug(
+            "Compressed request body from %s to %s bytes", len(body), len(compressed)
+        )
+        return compressed, self.encoding
+
+    def rejected(self, response: Optional[requests.Response]) -> bool:
+        """Check whether the API refused a compressed body, and if so, stop
+        compressing.
+
+        :param response: The response to a request with a compressed body
+        :return: Whether the body should be sent again uncompressed
+        """
+        if response is None or response.status_code != UNSUPPORTED_MEDIA_TYPE:
+            return False
+        with self._lock:
+            if self.enabled:
+                LOGGER.warning(
+                    "The API does not accept %s request bodies - disabling compression",
+                    self.encoding,
+                )
+                self.enabled = False
+        return True
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        wire_body: Optional[bytes],
+        encoding: Optional[str],
+        response: requests.Response,
+    ) -> Optional[TransferStats]:
+        """Report the byte counts of a finished request.
+
+        :param method: The HTTP verb
+        :param url: The request URL
+        :param body: The uncompressed request body
+        :param wire_body: The request body as it was sent
+        :param encoding: The request body's content encoding
+        :param response: The HTTP response, with its body already read
+        :return: The transfer statistics, or :code:`None` if nobody listens
+        """
+        if self.on_transfer is None:
+            return None
+        stats = TransferStats(
+            method=method,
+            url=url,
+            request_bytes=len(body or b""),
+            request_wire_bytes=len(wire_body or b""),
+            request_encoding=encoding,
+            response_bytes=len(response.content),
+            response_wire_bytes=wire_size(response),
+            response_encoding=response.headers.get("Content-Encoding"),
+        )
+        self.on_transfer(stats)
+        return stats
@@ -0,0 +1,158 @@
+"""This module contains the request timeouts and the deadline shared by all
+requests made within a composite operation."""
+
+import asyncio
+import logging
+import sys
+import time
+from contextvars import ContextVar
+from typing import Optional, Tuple, Union
+
+from pythx.exceptions import MythXTimeoutError
+
+LOGGER = logging.getLogger(__name__)
+
+# seconds to wait for a connection to the API to be established
+DEFAULT_CONNECT_TIMEOUT = 10.0
+# seconds to wait for the API to send data, e.g. while it assembles a large report
+DEFAULT_READ_TIMEOUT = 120.0
+
+TIMEOUT = Union[float, Tuple[float, float]]
+
+_CURRENT_DEADLINE = ContextVar("pythx_deadline", default=None)
+
+# asyncio tasks only run in a copy of their creator's context since Python 3.7 - with
+# the contextvars backport, all tasks of a thread would share a single deadline
+ASYNC_DEADLINES = sys.version_info >= (3, 7)
+
+
+def as_timeout_pair(timeout: Optional[TIMEOUT]) -> Tuple[float, float]:
+    """Turn a timeout into separate connect and read timeouts.
+
+    :param timeout: A single timeout for both phases, or a (connect, read) tuple
+    :return: The connect and read timeouts in seconds
+    """
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return connect, read
+    return timeout, timeout
+
+
+class Deadline:
+    """A point in time by which a composite operation has to be completed.
+
+    Used as a context manager, the deadline applies to all requests made within its
+    block, no matter which client method sends them. A deadline of e.g. 300 seconds
+    around submitting an analysis, waiting for it, and fetching its report therefore
+    bounds the whole workflow:
+
+    .. code-block:: python3
+
+        with client.deadline(300):
+            resp = client.analyze(bytecode=bytecode)
+            client.wait_for_analysis(resp.uuid)
+            report = client.report(resp.uuid)
+
+    The timeouts of each request are shortened to the remaining time, and retries or
+    polls that could not finish in time are given up right away. Once the deadline has
+    passed, a :code:`MythXTimeoutError` is raised.
+
+    Deadlines can be nested, in which case the inner block can not extend the outer
+    budget. The deadline is bound to the current thread or asyncio task. Tasks created
+    within the block inherit it, while other threads only do if they are started in a
+    copy of the block's context, as the client's worker pools are.
+
+    Deadlines in asyncio code require Python 3.7 or later, where tasks inherit the
+    context they are created in. On Python 3.6, entering a deadline block inside a
+    running event loop raises a :code:`RuntimeError`.
+    """
+
+    def __init__(self, timeout: float):
+        """Instantiate a new deadline.
+
+        :param timeout: The time budget in seconds, starting now
+        """
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+        self._token = None
+
+    @classmethod
+    def current(cls) -> Optional["Deadline"]:
+        """Get the deadline of the innermost active deadline block.
+
+        :return: The active deadline, or :code:`None` if there is none
+        """
+        return _CURRENT_DEADLINE.get()
+
+    @classmethod
+    def within(cls, timeout: Optional[float] = None) -> Optional["Deadline"]:
+        """Get the earlier of a new deadline and the active one.
+
+        :param timeout: The time budget in seconds (optional)
+        :return: The earlier deadline, or :code:`None` if there is neither
+        """
+        current = cls.current()
+        if timeout is None:
+            return current
+        deadline = cls(timeout)
+        if current is not None and current.expires_at < deadline.expires_at:
+            return current
+        return deadline
+
+    def remaining(self) -> float:
+        """Get the time left until the deadline.
+
+        :return: The remaining time in seconds, at least zero
+        """
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline has passed."""
+        return time.monotonic() >= self.expires_at
+
+    def check(self, action: str) -> None:
+        """Make sure the deadline has not passed yet.
+
+        :param action: A description of what is about to happen, for the error message
+        :return: None
+        """
+        if self.expired:
+            raise self.error(action)
+
+    def error(self, action: str) -> MythXTimeoutError:
+        """Get the exception reporting that an action ran out of time.
+
+        :param action: A description of the action that could not be completed
+        :return: The :code:`MythXTimeoutError` to raise
+        """
+        return MythXTimeoutError(
+            "Deadline of {}s exceeded {}".format(self.timeout, action)
+        )
+
+    def cap(self, timeout: Tuple[float, float]) -> Tuple[float, float]:
+        """Shorten request timeouts to the remaining time.
+
+        :param timeout: The connect and read timeouts in seconds
+        :return: The timeouts, each at most the remaining time
+        """
+        remaining = self.remaining()
+        return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+
+    def __enter__(self) -> "Deadline":
+        if not ASYNC_DEADLINES and asyncio.events._get_running_loop() is not None:
+            raise RuntimeError("Deadlines in asyncio code require Python 3.7 or later")
+        outer = self.current()
+        if outer is not None and outer.expires_at < self.expires_at:
+            self.expires_at = outer.expires_at
+        self._token = _CURRENT_DEADLINE.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _CURRENT_DEADLINE.reset(self._token)
+        self._token = None
+
+    def __repr__(self) -> str:
+        return "<Deadline timeout={} remaining={:.2f}>".format(
+            self.timeout, self.remaining()
+        )
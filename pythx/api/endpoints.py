@@ -0,0 +1,233 @@
+"""This module contains the health tracking of the API endpoints requests can
+be routed to."""
+
+import logging
+import threading
+import time
+from typing import Callable, Iterable, List, Optional, Sequence
+
+LOGGER = logging.getLogger(__name__)
+
+# consecutive failures after which an endpoint is taken out of rotation
+DEFAULT_MAX_FAILURES = 3
+# seconds between two rounds of background health checks
+DEFAULT_PROBE_INTERVAL = 30.0
+# the weight of the newest sample in an endpoint's average latency
+LATENCY_SMOOTHING = 0.3
+
+
+class Endpoint:
+    """The health state of a single API endpoint."""
+
+    def __init__(self, url: str):
+        """Instantiate a new endpoint.
+
+        :param url: The normalized base URL of the endpoint
+        """
+        self.url = url
+        self.latency = None
+        self.failures = 0
+        self.ejected_at = None
+
+    @property
+    def healthy(self) -> bool:
+        """Whether the endpoint is in rotation."""
+        return self.ejected_at is None
+
+    def __repr__(self) -> str:
+        return "<Endpoint url={} healthy={} latency={}>".format(
+            self.url, self.healthy, self.latency
+        )
+
+
+class EndpointPool:
+    """Route requests to the fastest healthy one of several API endpoints.
+
+    Dedicated MythX deployments can be reachable through multiple, e.g. regional,
+    endpoints. The pool ranks the healthy endpoints by their average latency, which
+    is measured by health checks in a background thread and by the requests routed
+    to them. Until the first measurement, the endpoints are ranked in the order they
+    were given.
+
+    An endpoint that fails :code:`max_failures` times in a row, through connection
+    errors or server errors, is ejected from the rotation. Ejected endpoints are
+    checked again in every round, and put back into rotation as soon as a check
+    succeeds. If all endpoints are ejected, requests are sent to the one that has
+    been ejected the longest, rather than not at all.
+
+    The health check is a callable receiving an endpoint's base URL and raising an
+    exception if the endpoint is unavailable. The API handler checks the
+    unauthenticated :code:`version` route. The background thread is only started
+    once a request is routed through a pool of more than one endpoint, and no
+    thread is started at all if the :code:`probe_interval` is :code:`None`.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        probe: Callable[[str], None] = None,
+        max_failures: int = DEFAULT_MAX_FAILURES,
+        probe_interval: Optional[float] = DEFAULT_PROBE_INTERVAL,
+    ):
+        """Instantiate a new endpoint pool.
+
+        :param urls: The normalized base URLs of the endpoints, in order of preference
+        :param probe: The health check, raising an exception for unavailable endpoints
+        :param max_failures: The number of consecutive failures ejecting an endpoint
+        :param probe_interval: The seconds between two rounds of health checks (:code:`None` to disable them)
+        """
+        if not urls:
+            raise ValueError("At least one API endpoint is required")
+        self.endpoints = []
+        for url in urls:
+            if url not in (e.url for e in self.endpoints):
+                self.endpoints.append(Endpoint(url))
+        self.probe = probe
+        self.max_failures = max_failures
+        self.probe_interval = probe_interval
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    @property
+    def primary(self) -> Endpoint:
+        """The most preferred endpoint, which requests are assembled for."""
+        return self.endpoints[0]
+
+    def _rank(self, endpoint: Endpoint) -> tuple:
+        if not endpoint.healthy:
+            return (2, endpoint.ejected_at, 0)
+        if endpoint.latency is None:
+            return (1, 0, self.endpoints.index(endpoint))
+        return (0, endpoint.latency, self.endpoints.index(endpoint))
+
+    def candidates(self) -> List[Endpoint]:
+        """Get all endpoints, from the most to the least preferred one.
+
+        :return: The healthy endpoints by latency, followed by the ejected ones
+        """
+        with self._lock:
+            return sorted(self.endpoints, key=self._rank)
+
+    def select(self, exclude: Iterable[Endpoint] = ()) -> Endpoint:
+        """Get the endpoint the next request should be sent to.
+
+        :param exclude: Endpoints to avoid, e.g. because the request failed there
+        :return: The most preferred endpoint that is not excluded, or the most
+            preferred one overall if all of them are
+        """
+        self._ensure_prober()
+        candidates = self.candidates()
+        exclude = set(exclude)
+        for endpoint in candidates:
+            if endpoint not in exclude:
+                return endpoint
+        return candidates[0]
+
+    def record_success(self, endpoint: Endpoint, latency: float = None) -> None:
+        """Mark a request or health check as successful.
+
+        :param endpoint: The endpoint that responded
+        :param latency: The measured round trip time in seconds (optional)
+        :return: None
+        """
+        with self._lock:
+            endpoint.failures = 0
+            if latency is not None:
+                endpoint.latency = (
+                    latency
+                    if endpoint.latency is None
+                    else LATENCY_SMOOTHING * latency
+                    + (1 - LATENCY_SMOOTHING) * endpoint.latency
+                )
+            if not endpoint.healthy:
+                LOGGER.info("Endpoint %s is available again", endpoint.url)
+                endpoint.ejected_at = None
+
+    def record_failure(self, endpoint: Endpoint, error: Exception = None) -> None:
+        """Mark a request or health check as failed, ejecting the endpoint if it
+        failed too often in a row.
+
+        :param endpoint: The endpoint that failed
+        :param error: The error that occurred (optional)
+        :return: None
+        """
+        with self._lock:
+            endpoint.failures += 1
+            if endpoint.healthy and endpoint.failures >= self.max_failures:
+                LOGGER.warning(
+                    "Ejecting endpoint %s after %s failures: %s",
+                    endpoint.url,
+                    endpoint.failures,
+                    error,
+                )
+                endpoint.ejected_at = time.monotonic()
+
+    def check(self) -> None:
+        """Run a round of health checks on all endpoints.
+
+        :return: None
+        """
+        for endpoint in list(self.endpoints):
+            start = time.monotonic()
+            try:
+                self.probe(endpoint.url)
+            except Exception as e:
+                LOGGER.debug("Health check of %s failed: %s", endpoint.url, e)
+                self.record_failure(endpoint, e)
+            else:
+                self.record_success(endpoint, time.monotonic() - start)
+
+    def _ensure_prober(self) -> None:
+        if (
+            self._thread is not None
+            or self.probe is None
+            or self.probe_interval is None
+            or len(self.endpoints) < 2
+        ):
+            return
+        with self._lock:
+            if self._thread is None:
+                self.start()
+
+    def start(self) -> None:
+        """Start the background health checks.
+
+        :return: None
+        """
+        LOGGER.debug("Starting health checks of %s endpoints", len(self.endpoints))
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="pythx-endpoint-prober", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = None) -> None:
+        """Stop the background health checks and wait for them to finish.
+
+        :param timeout: The maximum number of seconds to wait for the thread
+        :return: None
+        """
+        self._stopped.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            LOGGER.debug("Stopping endpoint health checks")
+            thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        """Whether the background thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self.check()
+            self._stopped.wait(self.probe_interval)
+
+    def __repr__(self) -> str:
+        return "<EndpointPool endpoints={}>".format(
+            ", ".join(e.url for e in self.endpoints)
+        )
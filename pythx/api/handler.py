@@ -3,47 +3,282 @@ from json import JSONDecodeError
 import logging
 import os
 import re
+import threading
+import time
 import urllib.parse
-from typing import Dict, List, Type
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 import requests
 from mythx_models.exceptions import MythXAPIError
-from mythx_models.response import DetectedIssuesResponse, IssueReport
+from mythx_models.request import VersionRequest
+from mythx_models.response import DetectedIssuesResponse
+from pythx.exceptions import MythXTimeoutError
 from pythx.types import RESPONSE_MODELS, REQUEST_MODELS
+from pythx.api.codec import JSON_CONTENT_TYPE, BaseCodec, default_codec
+from pythx.api.compression import ACCEPT_ENCODING, CompressionPolicy
+from pythx.api.deadline import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    TIMEOUT,
+    Deadline,
+    as_timeout_pair,
+)
+from pythx.api.endpoints import (
+    DEFAULT_MAX_FAILURES,
+    DEFAULT_PROBE_INTERVAL,
+    Endpoint,
+    EndpointPool,
+)
+from pythx.api.parsing import (
+    LAZY,
+    PARSE_MODES,
+    STRICT,
+    TRUSTED,
+    LazyModel,
+    construct_model,
+)
+from pythx.api.ratelimit import BaseRateLimiter
+from pythx.api.retry import RetryPolicy
+from pythx.api.streaming import DEFAULT_CHUNK_SIZE
+from pythx.api.transport import BaseTransport, RequestsTransport
+from pythx.cache.base import BaseCache
 from pythx.middleware.base import BaseMiddleware
-from pydantic import parse_obj_as
 DEFAULT_API_URL = "https://api.mythx.io/"
 
 
-def print_request(req: requests.PreparedRequest) -> str:
+DEFAULT_LOG_BODY_LIMIT = 4096
+REDACTED_HEADERS = frozenset(("authorization", "cookie", "set-cookie"))
+
+
+def _format_headers(headers: Dict[str, str], redact: Iterable[str]) -> str:
+    """Format HTTP headers, masking the values of sensitive ones.
+
+    :param headers: The HTTP headers
+    :param redact: The lowercase names of headers whose values are masked
+    :return: The headers, one per line
+    """
+    return "\n".join(
+        "{}: {}".format(k, "<redacted>" if k.lower() in redact else v)
+        for k, v in headers.items()
+    )
+
+
+def _format_body(body: Any, limit: Optional[int]) -> str:
+    """Decode an HTTP body for printing, truncating it if necessary.
+
+    Only the part that is printed is decoded, so large bodies are cheap to format.
+
+    :param body: The raw body as bytes, string, or :code:`None`
+    :param limit: The maximum number of bytes to print (:code:`None` for no limit)
+    :return: The printable body
+    """
+    if not body:
+        return ""
+    size = len(body)
+    if limit is not None and size > limit:
+        body = body[:limit]
+    if isinstance(body, bytes):
+        body = body.decode(errors="replace")
+    if limit is not None and size > limit:
+        body += "... ({} more bytes)".format(size - limit)
+    return body
+
+
+def print_request(
+    req: requests.PreparedRequest,
+    body_limit: Optional[int] = None,
+    redact: Iterable[str] = REDACTED_HEADERS,
+) -> str:
     """Generate a pretty-printed HTTP request string.
 
+    Compressed bodies are not printable, so only their size and encoding are shown.
+
     :param req: The prepared requests HTTP request
+    :param body_limit: The maximum number of body bytes to print (:code:`None` for no limit)
+    :param redact: The lowercase names of headers whose values are masked
     :return: Pretty HTTP request string
     """
+    encoding = req.headers.get("Content-Encoding")
+    if encoding and req.body:
+        body = "<{} bytes, {}>".format(len(req.body), encoding)
+    else:
+        body = _format_body(req.body, body_limit)
     return "\nHTTP/1.1 {method} {url}\n{headers}\n\n{body}\n".format(
         method=req.method,
         url=req.url,
-        headers="\n".join("{}: {}".format(k, v) for k, v in req.headers.items()),
-        body=req.body.decode(),
+        headers=_format_headers(req.headers, redact),
+        body=body,
     )
 
 
-def print_response(res: requests.Response) -> str:
+def print_response(
+    res: requests.Response,
+    body_limit: Optional[int] = None,
+    redact: Iterable[str] = REDACTED_HEADERS,
+) -> str:
     """Generate a pretty-printed HTTP response string.
 
     :param res: The received requests HTTP response
+    :param body_limit: The maximum number of body bytes to print (:code:`None` for no limit)
+    :param redact: The lowercase names of headers whose values are masked
     :return: Pretty HTTP response string
     """
     return "\nHTTP/1.1 {status_code}\n{headers}\n\n{body}\n".format(
         status_code=res.status_code,
-        headers="\n".join("{}: {}".format(k, v) for k, v in res.headers.items()),
-        body=res.content.decode(),
+        headers=_format_headers(res.headers, redact),
+        body=_format_body(res.content, body_limit),
     )
 
 
 LOGGER = logging.getLogger(__name__)
 
 
+def _leader_gave_up(future: Any, error: BaseException) -> bool:
+    """Check whether a coalesced request failed for a reason of the caller that sent
+    it, rather than of the request itself.
+
+    This is the case if the sender was cancelled or interrupted, or its deadline has
+    passed. Callers that have only been waiting for the request should then send it
+    again themselves.
+
+    :param future: The (asyncio or concurrent) future of the coalesced request
+    :param error: The exception raised while waiting for the future
+    :return: Whether the request should be sent again
+    """
+    if not future.done():
+        return False
+    if future.cancelled():
+        return True
+    exception = future.exception()
+    return error is exception and (
+        isinstance(exception, MythXTimeoutError) or not isinstance(exception, Exception)
+    )
+
+
+class _Attempts:
+    """The bookkeeping of sending a single request, shared by the synchronous and
+    asynchronous handlers.
+
+    The handlers only perform the waiting and the actual transport calls. Everything
+    else - applying the deadline, routing each attempt to an endpoint, recording the
+    endpoints' health, and consulting the retry policy - happens here.
+    """
+
+    def __init__(self, handler: "APIHandler", kwargs: Dict):
+        """Start sending a request.
+
+        :param handler: The handler sending the request
+        :param kwargs: The keyword arguments for the transport's :code:`request` method
+        """
+        self.handler = handler
+        self.kwargs = kwargs
+        self.deadline = Deadline.current()
+        self.action = "sending {} {}".format(kwargs["method"], kwargs["url"])
+        self.failed = []
+        self.count = 0
+        self.endpoint = None
+        self.started = None
+
+    def budget(self) -> Optional[float]:
+        """Get the time the rate limiter may delay the next attempt by.
+
+        :return: The seconds left until the deadline, or :code:`None` if there is none
+        """
+        if self.deadline is None:
+            return None
+        self.deadline.check(self.action)
+        return self.deadline.remaining()
+
+    def admit(self, wait_time: Optional[float]) -> float:
+        """Check that the rate limiter has reserved a slot for the next attempt.
+
+        :param wait_time: The seconds until the attempt may be sent, or :code:`None`
+            if no slot is free before the deadline
+        :return: The seconds to wait
+        """
+        if wait_time is None:
+            raise self.deadline.error(self.action)
+        return wait_time
+
+    def next(self) -> Dict:
+        """Get the transport arguments of the next attempt.
+
+        :return: The arguments routed to an endpoint, with timeouts fit into the deadline
+        """
+        self.count += 1
+        kwargs, self.endpoint = self.handler._route(self.kwargs, self.failed)
+        if self.deadline is not None:
+            self.deadline.check(self.action)
+            kwargs = dict(kwargs, timeout=self.deadline.cap(self.kwargs["timeout"]))
+        self.started = time.monotonic()
+        return kwargs
+
+    def raised(self, error: requests.RequestException) -> requests.RequestException:
+        """Handle an error raised by the transport.
+
+        :param error: The transport error
+        :return: The error, unless the deadline has passed in the meantime
+        """
+        if self.deadline is not None and self.deadline.expired:
+            raise self.deadline.error(self.action) from error
+        return error
+
+    def retry_delay(
+        self,
+        response: Optional[requests.Response],
+        error: Optional[requests.RequestException],
+    ) -> Optional[float]:
+        """Decide whether and when the request is sent again.
+
+        A request failing at one of multiple endpoints is resent to the next one right
+        away if the retry policy allows failing over, even if the failure is not
+        retryable at the same endpoint.
+
+        :param response: The HTTP response of the attempt, if there is one
+        :param error: The error raised by the transport, if any
+        :return: The seconds to wait before the next attempt, or :code:`None` if the
+            attempt is final
+        """
+        method = self.kwargs["method"]
+        failover = self.handler._record_health(
+            self.endpoint,
+            self.failed,
+            response,
+            error,
+            latency=time.monotonic() - self.started,
+        ) and self.handler.retry_policy.may_fail_over(method, response, error)
+        delay = self.handler.retry_policy.evaluate(
+            self.count,
+            method,
+            self.kwargs["url"],
+            response=response,
+            error=error,
+            failover=failover,
+        )
+        if delay is None:
+            return None
+        if failover:
+            LOGGER.debug("Failing over from endpoint %s", self.endpoint.url)
+        if self.deadline is not None and delay >= self.deadline.remaining():
+            if response is not None:
+                # release the connection of the discarded attempt
+                response.close()
+            raise self.deadline.error(self.action) from error
+        return delay
+
+
 class APIHandler:
     """Handle the low-level API interaction.
 
@@ -51,21 +286,104 @@ class APIHandler:
     to the configured endpoint, parsing the response into its respective
     domain model, as well as registering and executing request/response
     middlewares.
+
+    Requests are sent through a transport owned by the handler instance. By
+    default, this is a :code:`RequestsTransport` holding a persistent connection
+    pool, so consecutive calls reuse established connections to the API.
+
+    Optionally, response caches can be registered. They are consulted in order
+    before a request is sent, and every successful response is offered to them.
+
+    Identical GET requests that are executed concurrently, e.g. by multiple threads
+    polling the same analysis job, are coalesced: only the first one is sent, and all
+    callers receive the same parsed response model.
+
+    Transient failures, such as rate limiting or connection errors, are retried
+    according to the handler's :code:`RetryPolicy`. If a rate limiter is registered,
+    each attempt waits for its slot in the limiter's budget before it is sent.
+
+    Responses may be compressed by the API, which is advertised with every request.
+    Large request bodies are compressed as well if a :code:`CompressionPolicy` is
+    given.
+
+    Every request is sent with a connect and a read timeout, which can be overridden
+    per call. Within a :code:`Deadline` block, the timeouts are shortened to the time
+    remaining, and a :code:`MythXTimeoutError` is raised once it has run out.
+
+    If multiple API URLs are given, requests are routed through an
+    :code:`EndpointPool` to the fastest healthy endpoint. An attempt failing with a
+    connection or server error is retried at the next endpoint right away, and
+    endpoints failing repeatedly are ejected until a background health check of the
+    :code:`version` route succeeds again.
+
+    With the log level set to DEBUG, every HTTP request and response is traced.
+    Bodies are truncated to :code:`log_body_limit` bytes and credentials are masked.
+    If DEBUG logging is disabled, no tracing work is done at all.
     """
 
     def __init__(
-        self, middlewares: List[BaseMiddleware] = None, api_url: str = None
+        self,
+        middlewares: List[BaseMiddleware] = None,
+        api_url: Union[str, Sequence[str]] = None,
+        transport: BaseTransport = None,
+        caches: List[BaseCache] = None,
+        coalesce_requests: bool = True,
+        retry_policy: RetryPolicy = None,
+        rate_limiter: BaseRateLimiter = None,
+        log_body_limit: Optional[int] = DEFAULT_LOG_BODY_LIMIT,
+        parse_mode: str = STRICT,
+        codec: BaseCodec = None,
+        compression: CompressionPolicy = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        max_failures: int = DEFAULT_MAX_FAILURES,
+        probe_interval: Optional[float] = DEFAULT_PROBE_INTERVAL,
     ):
         """Instantiate a new API handler class.
 
         :param middlewares: A list of custom middlewares to include
-        :param api_url: A custom API endpoint for dedicated MythX deployments
+        :param api_url: A custom API endpoint for dedicated MythX deployments, or a list of them
+        :param transport: A custom transport to send requests through
+        :param caches: A list of response caches to include
+        :param coalesce_requests: Share the response of identical concurrent GET requests
+        :param retry_policy: The policy for retrying failed requests (retries transient errors by default)
+        :param rate_limiter: A rate limiter throttling the requests sent (optional)
+        :param log_body_limit: The maximum number of body bytes to trace (:code:`None` for no limit)
+        :param parse_mode: How responses are turned into models: :code:`strict`, :code:`lazy`, or :code:`trusted`
+        :param codec: The JSON codec for payloads and responses (the fastest installed one by default)
+        :param compression: A policy for compressing large request bodies (optional)
+        :param connect_timeout: The seconds to wait for a connection (:code:`None` for no limit)
+        :param read_timeout: The seconds to wait for response data (:code:`None` for no limit)
+        :param max_failures: The consecutive failures after which an endpoint is ejected
+        :param probe_interval: The seconds between health checks of multiple endpoints (:code:`None` to disable them)
         """
+        if parse_mode not in PARSE_MODES:
+            raise ValueError("Unknown parse mode: {}".format(parse_mode))
         middlewares = middlewares if middlewares is not None else []
         self.middlewares = middlewares
-        self.api_url = self._normalize_url(
-            api_url or os.environ.get("MYTHX_API_URL") or DEFAULT_API_URL
+        self.caches = caches if caches is not None else []
+        self.coalesce_requests = coalesce_requests
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
+        api_url = api_url or os.environ.get("MYTHX_API_URL") or DEFAULT_API_URL
+        if isinstance(api_url, str):
+            api_url = api_url.split(",")
+        self.endpoints = EndpointPool(
+            [self._normalize_url(url.strip()) for url in api_url if url.strip()],
+            probe=self._probe_endpoint,
+            max_failures=max_failures,
+            probe_interval=probe_interval,
         )
+        # requests are assembled for the primary endpoint and routed when sent
+        self.api_url = self.endpoints.primary.url
+        self.transport = transport or RequestsTransport()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.log_body_limit = log_body_limit
+        self.parse_mode = parse_mode
+        self.codec = codec or default_codec()
+        self.compression = compression
+        self.timeout = (connect_timeout, read_timeout)
 
     @staticmethod
     def _normalize_url(url: str) -> str:
@@ -82,8 +400,102 @@ class APIHandler:
         url = re.sub(r"v\d+/?", "", url)
         return url + "/" if not url.endswith("/") else url
 
-    @staticmethod
-    def send_request(request_data: Dict, auth_header: Dict[str, str] = None) -> Dict:
+    def close(self) -> None:
+        """Close the handler's transport and release its pooled connections.
+
+        The background health checks of the API endpoints are stopped as well.
+
+        :return: None
+        """
+        self.endpoints.stop()
+        self.transport.close()
+
+    def _probe_request(self, url: str) -> Dict:
+        """Get the request checking whether an API endpoint is available.
+
+        :param url: The endpoint's base URL
+        :return: The request data dictionary of an unauthenticated version call
+        """
+        req = VersionRequest()
+        return {
+            "method": req.method,
+            "payload": None,
+            "params": {},
+            "headers": {},
+            "url": urllib.parse.urljoin(url, req.endpoint),
+        }
+
+    def _probe_endpoint(self, url: str) -> None:
+        """Check whether an API endpoint is available.
+
+        The request is sent once, bypassing caches, middlewares, and retries.
+
+        :param url: The endpoint's base URL
+        :return: None
+        """
+        response = self.transport.request(
+            **self._prepare_request(self._probe_request(url))
+        )
+        try:
+            self._process_response(response)
+        finally:
+            response.close()
+
+    def _route(
+        self, kwargs: Dict, failed: List[Endpoint]
+    ) -> Tuple[Dict, Optional[Endpoint]]:
+        """Point a request attempt to the endpoint it should be sent to.
+
+        :param kwargs: The keyword arguments for the transport's :code:`request` method
+        :param failed: The endpoints previous attempts of the request have failed at
+        :return: The arguments with the endpoint's URL, and the endpoint if the
+            request is routed
+        """
+        if len(self.endpoints) < 2 or not kwargs["url"].startswith(self.api_url):
+            return kwargs, None
+        endpoint = self.endpoints.select(exclude=failed)
+        if endpoint is self.endpoints.primary:
+            return kwargs, endpoint
+        url = endpoint.url + kwargs["url"][len(self.api_url) :]
+        return dict(kwargs, url=url), endpoint
+
+    def _record_health(
+        self,
+        endpoint: Optional[Endpoint],
+        failed: List[Endpoint],
+        response: Optional[requests.Response],
+        error: Optional[Exception],
+        latency: float = None,
+    ) -> bool:
+        """Report the outcome of a request attempt to the endpoint pool.
+
+        Connection errors and server errors count as failures of the endpoint. The
+        round trip time of other responses is fed into the endpoint's latency.
+
+        :param endpoint: The endpoint the attempt was sent to, if it was routed
+        :param failed: The endpoints the request has failed at, updated in place
+        :param response: The HTTP response, if there is one
+        :param error: The error raised by the transport, if any
+        :param latency: The seconds the attempt took (optional)
+        :return: Whether another endpoint is available for the request
+        """
+        if endpoint is None:
+            return False
+        if error is None and response.status_code < 500:
+            self.endpoints.record_success(endpoint, latency)
+            return False
+        self.endpoints.record_failure(
+            endpoint, error or "HTTP status {}".format(response.status_code)
+        )
+        failed.append(endpoint)
+        return self.endpoints.select(exclude=failed) not in failed
+
+    def send_request(
+        self,
+        request_data: Dict,
+        auth_header: Dict[str, str] = None,
+        timeout: TIMEOUT = None,
+    ) -> Dict:
         """Send a request to the API.
 
         This method takes a data dictionary holding the request's method (HTTP verb),
@@ -106,25 +518,221 @@ class APIHandler:
         If the action requires authentication, the auth headers are passed in a separate, optional
         parameter. It holds the user's JWT access token.
 
-        If the request fails (returns a non 200 status code), a :code:`MythXAPIError` is raised.
+        The request is sent through the handler's transport, unless one of the registered
+        caches holds a response for it. Transient failures are retried as the handler's
+        retry policy allows. If the request finally fails (returns a non 200 status code),
+        a :code:`MythXAPIError` is raised. Connection errors are passed on to the caller.
+
+        A timeout given for this call replaces the handler's connect and read timeouts.
+        If the active :code:`Deadline` passes before the request has succeeded, a
+        :code:`MythXTimeoutError` is raised.
 
         :param request_data: The request data dictionary
         :param auth_header: The authorization header carrying the access token
+        :param timeout: The seconds to wait, or a (connect, read) tuple (optional)
         :return: The raw response payload string
         """
+        content = self.lookup_caches(request_data)
+        if content is not None:
+            return content
+        response = self._send_with_retries(request_data, auth_header, timeout=timeout)
+        content = self._process_response(response)
+        self.update_caches(request_data, content)
+        return content
+
+    def stream_request(
+        self,
+        request_data: Dict,
+        auth_header: Dict[str, str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        timeout: TIMEOUT = None,
+    ) -> Iterator[bytes]:
+        """Send a request to the API and stream the response body.
+
+        Instead of reading the whole body into memory, the body is yielded in chunks
+        as it is received from the socket. Failed requests are retried and checked
+        like in :code:`send_request`, but the response is not cached. An error
+        occurring while the body is read is passed on to the caller.
+
+        :param request_data: The request data dictionary
+        :param auth_header: The authorization header carrying the access token
+        :param chunk_size: The maximum number of bytes per chunk
+        :param timeout: The seconds to wait, or a (connect, read) tuple (optional)
+        :return: An iterator over the raw body chunks
+        """
+        response = self._send_with_retries(
+            request_data, auth_header, stream=True, timeout=timeout
+        )
+        try:
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                if response.request is not None:
+                    LOGGER.debug(print_request(response.request, self.log_body_limit))
+                LOGGER.debug(
+                    "HTTP/1.1 %s %s (streamed)", response.status_code, response.reason
+                )
+            if not 199 < response.status_code < 300:
+                raise MythXAPIError(
+                    "Got unexpected status code {}: {}".format(
+                        response.status_code, response.content.decode()
+                    )
+                )
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                yield chunk
+        finally:
+            response.close()
+
+    def _send_with_retries(
+        self,
+        request_data: Dict,
+        auth_header: Dict[str, str] = None,
+        stream: bool = False,
+        timeout: TIMEOUT = None,
+    ) -> requests.Response:
+        """Send a request through the transport, retrying transient failures.
+
+        :param request_data: The request data dictionary
+        :param auth_header: The authorization header carrying the access token
+        :param stream: Do not read the response body up front
+        :param timeout: The seconds to wait, or a (connect, read) tuple (optional)
+        :return: The final HTTP response
+        """
+        kwargs = self._prepare_request(request_data, auth_header, timeout=timeout)
+        if stream:
+            kwargs["stream"] = True
+        wire_kwargs, encoding = self._compress_request(kwargs)
+        response = self._send_attempts(request_data, wire_kwargs)
+        if encoding is not None and self.compression.rejected(response):
+            response.close()
+            wire_kwargs, encoding = kwargs, None
+            response = self._send_attempts(request_data, kwargs)
+        if self.compression is not None and not stream:
+            self.compression.record(
+                kwargs["method"],
+                kwargs["url"],
+                kwargs["payload"],
+                wire_kwargs["payload"],
+                encoding,
+                response,
+            )
+        return response
+
+    def _compress_request(self, kwargs: Dict) -> Tuple[Dict, Optional[str]]:
+        """Compress the request body as the handler's compression policy demands.
+
+        :param kwargs: The keyword arguments for the transport's :code:`request` method
+        :return: The arguments with the body to send, and the body's content encoding
+        """
+        if self.compression is None:
+            return kwargs, None
+        payload, encoding = self.compression.compress(kwargs["payload"])
+        if encoding is None:
+            return kwargs, None
+        headers = dict(kwargs["headers"])
+        headers["Content-Encoding"] = encoding
+        return dict(kwargs, payload=payload, headers=headers), encoding
+
+    def _send_attempts(self, request_data: Dict, kwargs: Dict) -> requests.Response:
+        """Send the request until it succeeds or the retry policy gives up.
+
+        :param request_data: The request data dictionary
+        :param kwargs: The keyword arguments for the transport's :code:`request` method
+        :return: The final HTTP response
+        """
+        attempts = _Attempts(self, kwargs)
+        while True:
+            response, error = None, None
+            if self.rate_limiter is not None:
+                wait_time = self.rate_limiter.reserve(request_data, attempts.budget())
+                time.sleep(attempts.admit(wait_time))
+            try:
+                response = self.transport.request(**attempts.next())
+            except requests.RequestException as e:
+                error = attempts.raised(e)
+            delay = attempts.retry_delay(response, error)
+            if delay is None:
+                break
+            if response is not None:
+                # release the connection of the discarded attempt
+                response.close()
+            time.sleep(delay)
+        if error is not None:
+            raise error
+        return response
+
+    def lookup_caches(self, request_data: Dict) -> Optional[Any]:
+        """Look up a response in the registered caches.
+
+        The caches are consulted in the order they were registered, and the first hit
+        is returned.
+
+        :param request_data: The request data dictionary
+        :return: The cached response payload, or :code:`None` if no cache holds it
+        """
+        for cache in self.caches:
+            content = cache.get(request_data)
+            if content is not None:
+                LOGGER.debug("Serving %s from cache: %s", request_data["url"], cache)
+                return content
+        return None
+
+    def update_caches(self, request_data: Dict, content: Any) -> None:
+        """Offer a successful response to all registered caches.
+
+        :param request_data: The request data dictionary
+        :param content: The decoded response payload
+        :return: None
+        """
+        for cache in self.caches:
+            cache.set(request_data, content)
+
+    def _prepare_request(
+        self,
+        request_data: Dict,
+        auth_header: Dict[str, str] = None,
+        timeout: TIMEOUT = None,
+    ) -> Dict:
+        """Turn the request data dictionary into transport arguments.
+
+        The payload is encoded with the handler's codec, so the transport sends it
+        as is.
+
+        :param request_data: The request data dictionary
+        :param auth_header: The authorization header carrying the access token
+        :param timeout: The seconds to wait, or a (connect, read) tuple (defaults to the handler's)
+        :return: The keyword arguments for the transport's :code:`request` method
+        """
         if auth_header is None:
             auth_header = {}
-        method = request_data["method"].upper()
         headers = request_data["headers"]
         headers.update(auth_header)
-        url = request_data["url"]
+        headers.setdefault("Accept-Encoding", ACCEPT_ENCODING)
         payload = request_data["payload"]
-        params = request_data["params"]
-        response = requests.request(
-            method=method, url=url, headers=headers, json=payload, params=params
-        )
-        LOGGER.debug(print_request(response.request))
-        LOGGER.debug(print_response(response))
+        if payload is not None:
+            payload = self.codec.encode(payload)
+            headers = dict(headers)
+            headers.setdefault("Content-Type", JSON_CONTENT_TYPE)
+        return {
+            "method": request_data["method"].upper(),
+            "url": request_data["url"],
+            "headers": headers,
+            "payload": payload,
+            "params": request_data["params"],
+            "timeout": self.timeout if timeout is None else as_timeout_pair(timeout),
+        }
+
+    def _process_response(self, response: requests.Response) -> Dict:
+        """Check the HTTP response and decode its JSON payload.
+
+        If the response does not carry a 2xx status code, or its body is not valid JSON,
+        a :code:`MythXAPIError` is raised.
+
+        :param response: The HTTP response returned by the transport
+        :return: The decoded response payload
+        """
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            if response.request is not None:
+                LOGGER.debug(print_request(response.request, self.log_body_limit))
+            LOGGER.debug(print_response(response, self.log_body_limit))
         if not 199 < response.status_code < 300:
             raise MythXAPIError(
                 "Got unexpected status code {}: {}".format(
@@ -132,7 +740,7 @@ class APIHandler:
                 )
             )
         try:
-            content = response.json()
+            content = self.codec.decode(response.content)
         except JSONDecodeError:
             raise MythXAPIError(
                 "Got unexpected response data: Expected JSON but got {}".format(
@@ -141,6 +749,117 @@ class APIHandler:
             )
         return content
 
+    def _coalesce_key(
+        self,
+        request_data: Dict,
+        model_cls: Type[RESPONSE_MODELS],
+        auth_header: Dict[str, str] = None,
+    ) -> Optional[Tuple]:
+        """Get the key identifying identical requests.
+
+        Only GET requests are coalesced. Two requests are identical if they target the
+        same URL with the same parameters on behalf of the same user, and are parsed
+        into the same domain model.
+
+        :param request_data: The request data dictionary
+        :param model_cls: The domain model class the response is parsed into
+        :param auth_header: The authorization header carrying the access token
+        :return: The key, or :code:`None` if the request must not be coalesced
+        """
+        if not self.coalesce_requests or request_data["method"].upper() != "GET":
+            return None
+        return (
+            request_data["url"],
+            tuple(sorted((k, str(v)) for k, v in request_data["params"].items())),
+            (auth_header or {}).get("Authorization"),
+            model_cls,
+        )
+
+    def execute_request(
+        self,
+        request_data: Dict,
+        model_cls: Type[RESPONSE_MODELS],
+        auth_header: Dict[str, str] = None,
+        timeout: TIMEOUT = None,
+    ) -> RESPONSE_MODELS:
+        """Send a request to the API and parse the response into its domain
+        model.
+
+        If an identical GET request is already in flight, no new request is sent.
+        Instead, the caller waits for the pending one and receives the very same domain
+        model (or exception). As a consequence, the response middlewares are executed
+        only once for all coalesced callers, and the returned model should not be
+        modified. Within a :code:`Deadline` block, the wait is bounded by the time
+        remaining. If the pending request fails because the caller that sent it has run
+        out of time or was interrupted, a waiting caller sends the request again.
+
+        :param request_data: The request data dictionary
+        :param model_cls: The domain model class the data should be deserialized into
+        :param auth_header: The authorization header carrying the access token
+        :param timeout: The seconds to wait, or a (connect, read) tuple (optional)
+        :return: The domain model holding the response data
+        """
+        key = self._coalesce_key(request_data, model_cls, auth_header)
+        if key is None:
+            return self.parse_response(
+                self.send_request(request_data, auth_header=auth_header, timeout=timeout),
+                model_cls,
+            )
+
+        while True:
+            with self._in_flight_lock:
+                future = self._in_flight.get(key)
+                is_leader = future is None
+                if is_leader:
+                    future = Future()
+                    self._in_flight[key] = future
+            if is_leader:
+                break
+            LOGGER.debug("Joining in-flight request to %s", request_data["url"])
+            try:
+                return self._wait_in_flight(future, request_data)
+            except BaseException as e:
+                if not _leader_gave_up(future, e):
+                    raise
+            LOGGER.debug(
+                "In-flight request to %s gave up - resending", request_data["url"]
+            )
+
+        try:
+            result = self.parse_response(
+                self.send_request(request_data, auth_header=auth_header, timeout=timeout),
+                model_cls,
+            )
+        except BaseException as e:
+            self._release_in_flight(key)
+            future.set_exception(e)
+            raise
+        self._release_in_flight(key)
+        future.set_result(result)
+        return result
+
+    @staticmethod
+    def _wait_in_flight(future: Future, request_data: Dict) -> RESPONSE_MODELS:
+        """Wait for an identical request sent by another caller.
+
+        :param future: The future of the pending request
+        :param request_data: The request data dictionary
+        :return: The domain model holding the response data
+        """
+        deadline = Deadline.current()
+        if deadline is None:
+            return future.result()
+        try:
+            return future.result(timeout=deadline.remaining())
+        except FutureTimeoutError:
+            raise deadline.error(
+                "waiting for in-flight request to {}".format(request_data["url"])
+            )
+
+    def _release_in_flight(self, key: Tuple) -> None:
+        with self._in_flight_lock:
+            del self._in_flight[key]
+
     def execute_request_middlewares(self, req: Dict) -> Dict:
         """Sequentially execute the registered request middlewares.
 
@@ -197,12 +916,22 @@ class APIHandler:
         If a deserialization or validation error is raised, it is not caught and directly passed
         on to the user.
 
+        The handler's parse mode determines when the data is validated. In :code:`strict`
+        mode, the whole response is validated up front. In :code:`lazy` mode, a
+        :code:`LazyModel` proxy is returned, which validates each field on first access.
+        In :code:`trusted` mode, the model is built without any validation, which is the
+        cheapest option, but malformed data goes unnoticed.
+
         :param resp: The raw HTTP response JSON payload
         :param model_cls: The domain model class the data should be deserialized into
         :return: The domain model holding the response data
         """
         if type(resp) is list and model_cls is DetectedIssuesResponse:
-            m = DetectedIssuesResponse(issue_reports=parse_obj_as(List[IssueReport], resp))
+            resp = {"issue_reports": resp}
+        if self.parse_mode == LAZY:
+            m = LazyModel(model_cls, resp)
+        elif self.parse_mode == TRUSTED:
+            m = construct_model(model_cls, resp)
         else:
             m = model_cls(**resp)
         return self.execute_response_middlewares(m)
@@ -0,0 +1,158 @@
+"""This module contains the strategies for turning API responses into their
+domain models."""
+
+import logging
+from typing import Any, Dict, List, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import MissingError
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON
+
+LOGGER = logging.getLogger(__name__)
+
+# validate the whole response up front
+STRICT = "strict"
+# validate each field of the response when it is accessed for the first time
+LAZY = "lazy"
+# skip validation and trust the API to send well-formed data
+TRUSTED = "trusted"
+PARSE_MODES = (STRICT, LAZY, TRUSTED)
+
+_PLANS = {}
+
+
+def _construction_plan(model_cls: Type[BaseModel]) -> List[Tuple]:
+    """Get the fields of a model along with the nested model each of them holds.
+
+    :param model_cls: The model class
+    :return: A list of field name, alias, field, nested model class, and shape tuples
+    """
+    plan = _PLANS.get(model_cls)
+    if plan is None:
+        plan = []
+        for name, field in model_cls.__fields__.items():
+            sub_model = field.type_
+            if not (isinstance(sub_model, type) and issubclass(sub_model, BaseModel)):
+                sub_model = None
+            plan.append((name, field.alias, field, sub_model, field.shape))
+        _PLANS[model_cls] = plan
+    return plan
+
+
+def construct_model(model_cls: Type[BaseModel], data: Any) -> Any:
+    """Build a model without validating the data.
+
+    Nested models and lists of models are constructed recursively, so attribute
+    access works as on a validated model. Scalar values are taken over as they were
+    decoded from JSON, and they are neither checked nor coerced. Data that does not
+    fit the model is returned as is.
+
+    :param model_cls: The model class to build
+    :param data: The decoded JSON data
+    :return: The unvalidated model instance
+    """
+    if not isinstance(data, dict):
+        return data
+    values = {}
+    fields_set = set()
+    for name, alias, field, sub_model, shape in _construction_plan(model_cls):
+        if alias in data:
+            value = data[alias]
+        elif name in data:
+            value = data[name]
+        else:
+            values[name] = field.get_default()
+            continue
+        if sub_model is not None:
+            if shape == SHAPE_SINGLETON:
+                value = construct_model(sub_model, value)
+            elif shape == SHAPE_LIST and isinstance(value, list):
+                value = [construct_model(sub_model, item) for item in value]
+        values[name] = value
+        fields_set.add(name)
+    # the same as BaseModel.construct, minus its per-call overhead
+    model = model_cls.__new__(model_cls)
+    object.__setattr__(model, "__dict__", values)
+    object.__setattr__(model, "__fields_set__", fields_set)
+    return model
+
+
+class LazyModel:
+    """A read-only proxy validating the fields of a response model on first
+    access.
+
+    Creating the proxy only stores the raw response data. When a field is read,
+    only that field is validated, exactly as the model would do it, and the result
+    is kept for later accesses. Fields that are never read are never validated,
+    which saves most of the parsing work when a caller is only interested in a
+    single field, e.g. when polling an analysis job's status.
+
+    Anything that is not a field, such as :code:`dict()` or :code:`json()`, is
+    served by the fully validated model, which is built once on demand. Invalid
+    data raises a :code:`ValidationError` when it is accessed instead of when the
+    response is parsed. Note that the proxy is not an instance of the model class.
+    """
+
+    __slots__ = ("_model_cls", "_data", "_values", "_model")
+
+    def __init__(self, model_cls: Type[BaseModel], data: Dict):
+        """Instantiate a new lazy model proxy.
+
+        :param model_cls: The response model class
+        :param data: The decoded JSON response
+        """
+        self._model_cls = model_cls
+        self._data = data
+        self._values = {}
+        self._model = None
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+        field = self._model_cls.__fields__.get(name)
+        if field is None:
+            return getattr(self.validate(), name)
+
+        if field.alias in self._data:
+            raw = self._data[field.alias]
+        elif name in self._data:
+            raw = self._data[name]
+        elif field.required:
+            raise ValidationError(
+                [ErrorWrapper(MissingError(), loc=field.alias)], self._model_cls
+            )
+        else:
+            raw = field.get_default()
+        value, errors = field.validate(raw, {}, loc=field.alias, cls=self._model_cls)
+        if errors:
+            raise ValidationError(
+                errors if isinstance(errors, list) else [errors], self._model_cls
+            )
+        self._values[name] = value
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in LazyModel.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            raise AttributeError("Lazy response models are read-only")
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyModel):
+            other = other.validate()
+        return self.validate() == other
+
+    def __repr__(self) -> str:
+        return "<Lazy {}>".format(self._model_cls.__name__)
+
+    def validate(self) -> BaseModel:
+        """Validate all fields and get the actual response model.
+
+        :return: The validated response model
+        """
+        if self._model is None:
+            self._model = self._model_cls(**self._data)
+        return self._model
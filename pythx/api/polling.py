@@ -0,0 +1,79 @@
+"""This module contains the backoff policy used to poll the API."""
+
+import logging
+import random
+
+from mythx_models.response import AnalysisStatus
+
+LOGGER = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = (AnalysisStatus.FINISHED, AnalysisStatus.ERROR)
+
+# initial delay and delay cap in seconds, based on typical run times of each mode
+MODE_BACKOFF_HINTS = {
+    "quick": (3.0, 30.0),
+    "standard": (30.0, 120.0),
+    "full": (30.0, 120.0),
+    "deep": (120.0, 300.0),
+}
+
+
+class Backoff:
+    """An exponential backoff curve with jitter.
+
+    The n-th delay (starting at zero) is :code:`initial * factor ** n`, capped at
+    :code:`maximum`. Each delay is randomly spread by up to :code:`jitter` times its
+    value in both directions, so that many clients started at the same time do not
+    end up polling the API in lockstep.
+    """
+
+    def __init__(
+        self,
+        initial: float = 1.0,
+        factor: float = 2.0,
+        maximum: float = 60.0,
+        jitter: float = 0.1,
+    ):
+        """Instantiate a new backoff curve.
+
+        :param initial: The first delay in seconds
+        :param factor: The factor each consecutive delay is multiplied with
+        :param maximum: The upper bound for a single delay in seconds
+        :param jitter: The relative amount of random spread applied to each delay
+        """
+        self.initial = initial
+        self.factor = factor
+        self.maximum = maximum
+        self.jitter = jitter
+
+    @classmethod
+    def for_mode(cls, analysis_mode: str = None) -> "Backoff":
+        """Get a backoff curve suited for the given analysis mode.
+
+        Quick analyses finish within minutes, while deep analyses can take hours, so
+        there is no point in polling the latter every few seconds. Unknown modes get
+        the default curve.
+
+        :param analysis_mode: The analysis mode, e.g. quick, standard, or deep
+        :return: The backoff curve for the mode
+        """
+        hint = MODE_BACKOFF_HINTS.get((analysis_mode or "").lower())
+        if hint is None:
+            return cls()
+        initial, maximum = hint
+        return cls(initial=initial, maximum=maximum)
+
+    def delay(self, attempt: int) -> float:
+        """Get the delay before the next attempt.
+
+        :param attempt: The number of attempts made so far, starting at zero
+        :return: The delay in seconds
+        """
+        base = min(self.maximum, self.initial * self.factor ** attempt)
+        spread = base * self.jitter
+        return max(0.0, base + random.uniform(-spread, spread))
+
+    def __repr__(self):
+        return "<Backoff initial={} factor={} maximum={} jitter={}>".format(
+            self.initial, self.factor, self.maximum, self.jitter
+        )
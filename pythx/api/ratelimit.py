@@ -0,0 +1,214 @@
+"""This module contains client-side rate limiters throttling requests to the
+API."""
+
+import abc
+import logging
+import re
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Dict, Optional, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+# requests per second and burst size for each endpoint class
+DEFAULT_LIMITS = {
+    "submission": (1.0, 5),
+    "status": (5.0, 10),
+    "report": (2.0, 5),
+    "other": (5.0, 10),
+}
+
+SUBMISSION_PATH = re.compile(r"/v1/analyses/?$")
+REPORT_PATH = re.compile(r"/v1/analyses/[^/]+/(issues|input)/?$")
+STATUS_PATH = re.compile(r"/v1/(analyses|analysis-groups|projects)(/[^/]+)?/?$")
+
+
+def take_token(
+    tokens: float, updated: float, now: float, rate: float, capacity: float
+) -> Tuple[float, float]:
+    """Take a token from a bucket, going into debt if it is empty.
+
+    The bucket is refilled at :code:`rate` tokens per second up to its
+    :code:`capacity`. A negative balance means that earlier callers have reserved
+    tokens that are yet to be refilled, so the caller has to queue up behind them.
+
+    :param tokens: The number of tokens in the bucket at the time of the last update
+    :param updated: The time of the last update
+    :param now: The current time
+    :param rate: The refill rate in tokens per second
+    :param capacity: The maximum number of tokens in the bucket
+    :return: The new number of tokens and the time to wait before sending the request
+    """
+    tokens = min(capacity, tokens + max(0.0, now - updated) * rate) - 1
+    return tokens, max(0.0, -tokens / rate)
+
+
+class BaseRateLimiter(abc.ABC):
+    """Abstract rate limiter class that can be used by developers to build
+    their own.
+
+    Requests are sorted into endpoint classes, each of which has its own token
+    bucket: analysis submissions, status and list polls, report and input
+    downloads, and everything else (e.g. authentication). A limit is given as a
+    tuple of the sustained rate in requests per second and the burst size. Endpoint
+    classes without a limit are not throttled.
+
+    A request exceeding its budget is not rejected. Instead, the limiter reserves the
+    next free slot and tells the handler how long to wait for it, so requests queue
+    up in the order they arrived. A caller that can only wait for a limited time,
+    e.g. because of a deadline, passes a :code:`max_wait`. If the next free slot is
+    further away, no token is taken, so the queue does not grow by requests that
+    are never sent.
+    """
+
+    def __init__(self, limits: Dict[str, Tuple[float, float]] = None):
+        """Instantiate a new rate limiter.
+
+        :param limits: Per-endpoint class limits, overriding the defaults
+        """
+        self.limits = dict(DEFAULT_LIMITS)
+        self.limits.update(limits or {})
+
+    @staticmethod
+    def endpoint_class(request_data: Dict) -> str:
+        """Get the endpoint class a request belongs to.
+
+        :param request_data: The request's data dictionary
+        :return: The endpoint class name
+        """
+        method = request_data["method"].upper()
+        url = request_data["url"].split("?", 1)[0]
+        if method == "POST" and SUBMISSION_PATH.search(url):
+            return "submission"
+        if method == "GET" and REPORT_PATH.search(url):
+            return "report"
+        if method == "GET" and STATUS_PATH.search(url):
+            return "status"
+        return "other"
+
+    def reserve(self, request_data: Dict, max_wait: float = None) -> Optional[float]:
+        """Reserve a slot for sending the request.
+
+        :param request_data: The request's data dictionary
+        :param max_wait: The maximum number of seconds the caller can wait (optional)
+        :return: The time in seconds to wait before the request may be sent, or
+            :code:`None` if no slot is free within :code:`max_wait`
+        """
+        name = self.endpoint_class(request_data)
+        limit = self.limits.get(name)
+        if not limit:
+            return 0.0
+        rate, burst = limit
+        delay = self._take(name, rate, burst, max_wait)
+        if delay is None:
+            LOGGER.debug("No %s slot free within %.2fs", name, max_wait)
+        elif delay > 0:
+            LOGGER.debug("Delaying %s request by %.2fs", name, delay)
+        return delay
+
+    @abc.abstractmethod
+    def _take(
+        self, name: str, rate: float, capacity: float, max_wait: float = None
+    ) -> Optional[float]:
+        """Abstract method for taking a token from an endpoint class's bucket.
+
+        The token must only be taken if the resulting delay is shorter than
+        :code:`max_wait`.
+
+        :param name: The endpoint class name
+        :param rate: The refill rate in tokens per second
+        :param capacity: The maximum number of tokens in the bucket
+        :param max_wait: The maximum number of seconds the caller can wait (optional)
+        :return: The time in seconds to wait before the request may be sent, or
+            :code:`None` if the token was not taken
+        """
+        pass
+
+
+class RateLimiter(BaseRateLimiter):
+    """A rate limiter whose buckets are shared by all threads of a process.
+
+    Share one instance between handlers to give them a common budget.
+    """
+
+    def __init__(self, limits: Dict[str, Tuple[float, float]] = None):
+        """Instantiate a new in-process rate limiter.
+
+        :param limits: Per-endpoint class limits, overriding the defaults
+        """
+        super().__init__(limits)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _take(
+        self, name: str, rate: float, capacity: float, max_wait: float = None
+    ) -> Optional[float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(name, (capacity, now))
+            tokens, delay = take_token(tokens, updated, now, rate, capacity)
+            if max_wait is not None and delay >= max_wait:
+                return None
+            self._buckets[name] = (tokens, now)
+        return delay
+
+
+class SharedRateLimiter(BaseRateLimiter):
+    """A rate limiter whose buckets are shared by all processes on a host.
+
+    The buckets are stored in an SQLite database. Each token is taken in an
+    exclusive transaction, so worker processes pointing to the same file draw from
+    one common budget, e.g. to stay within the rate limits of a single MythX
+    account.
+    """
+
+    def __init__(self, path: str, limits: Dict[str, Tuple[float, float]] = None):
+        """Instantiate a new shared rate limiter.
+
+        :param path: The path of the SQLite database file
+        :param limits: Per-endpoint class limits, overriding the defaults
+        """
+        super().__init__(limits)
+        LOGGER.debug("Initializing at %s", path)
+        self.path = path
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets "
+                "(name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection to the bucket database.
+
+        :return: The database connection in autocommit mode
+        """
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def _take(
+        self, name: str, rate: float, capacity: float, max_wait: float = None
+    ) -> Optional[float]:
+        with closing(self._connect()) as conn:
+            # lock the database before reading, so no other process takes the same token
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # wall clock time, as monotonic clocks are not comparable across processes
+                now = time.time()
+                row = conn.execute(
+                    "SELECT tokens, updated FROM buckets WHERE name = ?", (name,)
+                ).fetchone()
+                tokens, updated = row if row else (capacity, now)
+                tokens, delay = take_token(tokens, updated, now, rate, capacity)
+                if max_wait is not None and delay >= max_wait:
+                    conn.execute("ROLLBACK")
+                    return None
+                conn.execute(
+                    "INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)",
+                    (name, tokens, now),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return delay
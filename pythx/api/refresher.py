@@ -0,0 +1,203 @@
+"""This module contains background workers renewing a client's JWT tokens
+ahead of their expiry."""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Optional
+
+from pythx.api.polling import Backoff
+
+LOGGER = logging.getLogger(__name__)
+
+# renew tokens this many seconds before they expire
+DEFAULT_REFRESH_LEAD = 120.0
+# check this often for new tokens if the client has none that could be renewed
+IDLE_INTERVAL = 60.0
+
+
+class BaseTokenRefresher:
+    """Shared scheduling logic of the background token refreshers.
+
+    The refresher wakes up :code:`lead` seconds before the client's access or
+    refresh token expires, and lets the client renew its tokens. The client decides
+    whether a refresh is sufficient, or whether it has to log in again because the
+    refresh token is about to expire as well. As the lead is larger than the
+    client's own refresh margin, requests do not have to renew the tokens inline.
+
+    Failed renewals are retried following the refresher's backoff curve. A lone
+    access token, e.g. an API key, can not be renewed and is left alone.
+    """
+
+    def __init__(self, client, lead: float = DEFAULT_REFRESH_LEAD, backoff: Backoff = None):
+        """Instantiate a new token refresher.
+
+        :param client: The client whose tokens should be renewed
+        :param lead: The number of seconds before expiry the tokens are renewed
+        :param backoff: The backoff curve for retrying failed renewals
+        """
+        self.client = client
+        self.lead = lead
+        self.backoff = backoff or Backoff(initial=5.0, maximum=300.0)
+        self._failures = 0
+
+    def _next_delay(self) -> float:
+        """Get the time until the next renewal is due.
+
+        :return: The delay in seconds, possibly negative if the renewal is overdue
+        """
+        due = self.client._tokens.renewal_due(self.lead)
+        if due is None:
+            return IDLE_INTERVAL
+        return due[0] - time.monotonic()
+
+    def _margin(self) -> Optional[float]:
+        """Get the margin the client should check its tokens with.
+
+        :return: The margin in seconds, or :code:`None` if there is nothing to renew
+        """
+        due = self.client._tokens.renewal_due(self.lead)
+        return due[1] if due is not None else None
+
+    def _wait_time(self) -> float:
+        """Get the time to wait before the next attempt, honouring the backoff
+        after failed renewals.
+
+        :return: The delay in seconds
+        """
+        delay = max(0.0, self._next_delay())
+        if self._failures:
+            delay = max(delay, self.backoff.delay(self._failures - 1))
+        return delay
+
+    def _record_failure(self, error: Exception) -> None:
+        self._failures += 1
+        LOGGER.warning("Background token renewal failed (%s attempts): %s", self._failures, error)
+
+    def _record_success(self) -> None:
+        # a renewal that does not push the next one into the future counts as failed
+        if self._next_delay() <= 0:
+            self._record_failure(Exception("Renewed tokens are already due for renewal"))
+        else:
+            self._failures = 0
+
+
+class TokenRefresher(BaseTokenRefresher):
+    """Renew the tokens of a :code:`Client` in a background thread.
+
+    The thread is a daemon, so it does not keep the interpreter alive. It should
+    still be stopped when the client is not used anymore, which the client's context
+    handler does automatically.
+    """
+
+    def __init__(self, client, lead: float = DEFAULT_REFRESH_LEAD, backoff: Backoff = None):
+        """Instantiate a new threaded token refresher.
+
+        :param client: The client whose tokens should be renewed
+        :param lead: The number of seconds before expiry the tokens are renewed
+        :param backoff: The backoff curve for retrying failed renewals
+        """
+        super().__init__(client, lead=lead, backoff=backoff)
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Start the background thread.
+
+        :return: None
+        """
+        LOGGER.debug("Starting background token refresher with lead=%s", self.lead)
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="pythx-token-refresher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = None) -> None:
+        """Stop the background thread and wait for it to finish.
+
+        A renewal that is in progress is completed first.
+
+        :param timeout: The maximum number of seconds to wait for the thread
+        :return: None
+        """
+        LOGGER.debug("Stopping background token refresher")
+        self._stopped.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        """Whether the background thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._wait_time()):
+            margin = self._margin()
+            if margin is None:
+                continue
+            try:
+                self.client._renew_tokens(margin)
+            except Exception as e:
+                self._record_failure(e)
+            else:
+                self._record_success()
+
+
+class AsyncTokenRefresher(BaseTokenRefresher):
+    """Renew the tokens of an :code:`AsyncClient` in an asyncio task.
+
+    The task runs on the event loop that is running when the refresher is started.
+    """
+
+    def __init__(self, client, lead: float = DEFAULT_REFRESH_LEAD, backoff: Backoff = None):
+        """Instantiate a new asynchronous token refresher.
+
+        :param client: The client whose tokens should be renewed
+        :param lead: The number of seconds before expiry the tokens are renewed
+        :param backoff: The backoff curve for retrying failed renewals
+        """
+        super().__init__(client, lead=lead, backoff=backoff)
+        self._task = None
+
+    def start(self) -> None:
+        """Start the background task on the running event loop.
+
+        :return: None
+        """
+        LOGGER.debug("Starting background token refresher with lead=%s", self.lead)
+        self._task = asyncio.get_event_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the background task and wait for it to finish.
+
+        :return: None
+        """
+        LOGGER.debug("Stopping background token refresher")
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background task is alive."""
+        return self._task is not None and not self._task.done()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._wait_time())
+            margin = self._margin()
+            if margin is None:
+                continue
+            try:
+                await self.client._renew_tokens(margin)
+            except Exception as e:
+                self._record_failure(e)
+            else:
+                self._record_success()
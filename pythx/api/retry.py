@@ -0,0 +1,254 @@
+"""This module contains the retry policy used to recover from transient API
+errors."""
+
+import logging
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable, Iterable, NamedTuple, Optional
+
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from pythx.api.polling import Backoff
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_STATUSES = frozenset((429, 502, 503, 504))
+DEFAULT_MAX_RETRY_AFTER = 60.0
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+
+
+class RetryAttempt(NamedTuple):
+    """The outcome of a single attempt to send a request.
+
+    An event is emitted for every attempt, including successful ones. The
+    :code:`delay` is the time waited before the next attempt, or :code:`None` if
+    there will not be another one.
+    """
+
+    attempt: int
+    method: str
+    url: str
+    status_code: Optional[int]
+    error: Optional[Exception]
+    delay: Optional[float]
+
+
+def is_connect_error(error: Exception) -> bool:
+    """Check whether a request failed before a connection was established.
+
+    In this case, the request has never reached the API, so it can be retried even
+    if it is not idempotent.
+
+    :param error: The exception raised by the transport
+    :return: Whether the connection could not be established
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.exceptions.ConnectionError) or not error.args:
+        return False
+    reason = error.args[0]
+    if isinstance(reason, MaxRetryError):
+        reason = reason.reason
+    return isinstance(reason, NewConnectionError)
+
+
+class RetryPolicy:
+    """Decide whether and when a failed request is sent again.
+
+    Requests are retried if the connection failed or timed out, or if the API
+    answered with one of the retryable status codes, which by default are the ones
+    signalling rate limiting (429) or a temporarily unavailable backend (502, 503,
+    504). The delay between attempts follows an exponential backoff curve with
+    jitter. If the API sends a :code:`Retry-After` header, the delay is at least as
+    long as requested. Should the API ask for a longer break than
+    :code:`max_retry_after`, the request is not retried at all.
+
+    Requests with a non-idempotent method, such as submitting an analysis with
+    :code:`POST`, are only retried if they have certainly not been processed: when
+    no connection could be established, or when the API rejected them with status
+    429. A timeout or a 5xx response could mean that the analysis was created, and
+    sending it again would create a duplicate.
+
+    An optional :code:`on_attempt` callback receives a :code:`RetryAttempt` event
+    after every attempt, e.g. to feed metrics.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff: Backoff = None,
+        retry_statuses: Iterable[int] = DEFAULT_RETRY_STATUSES,
+        max_retry_after: float = DEFAULT_MAX_RETRY_AFTER,
+        on_attempt: Callable[[RetryAttempt], None] = None,
+    ):
+        """Instantiate a new retry policy.
+
+        :param max_attempts: The maximum number of attempts per request, including the first one
+        :param backoff: The backoff curve for the delays between attempts
+        :param retry_statuses: The HTTP status codes considered transient
+        :param max_retry_after: The longest :code:`Retry-After` delay in seconds to honour
+        :param on_attempt: A callback receiving an event after every attempt
+        """
+        self.max_attempts = max_attempts
+        self.backoff = backoff or Backoff(initial=0.5, maximum=30.0)
+        self.retry_statuses = frozenset(retry_statuses)
+        self.max_retry_after = max_retry_after
+        self.on_attempt = on_attempt
+
+    @classmethod
+    def disabled(cls) -> "RetryPolicy":
+        """Get a policy that sends every request exactly once.
+
+        :return: The retry policy
+        """
+        return cls(max_attempts=1)
+
+    @staticmethod
+    def retry_after(response: requests.Response) -> Optional[float]:
+        """Parse the response's :code:`Retry-After` header.
+
+        Both the delay-seconds and the HTTP-date format are supported.
+
+        :param response: The HTTP response
+        :return: The requested delay in seconds, or :code:`None` if not given or invalid
+        """
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+        return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+    def is_retryable(
+        self,
+        method: str,
+        response: requests.Response = None,
+        error: Exception = None,
+    ) -> bool:
+        """Check whether the outcome of an attempt warrants another one.
+
+        :param method: The HTTP verb
+        :param response: The HTTP response, if one was received
+        :param error: The exception raised by the transport, if any
+        :return: Whether the request may be sent again
+        """
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        if error is not None:
+            if not isinstance(error, (requests.ConnectionError, requests.Timeout)):
+                return False
+            return idempotent or is_connect_error(error)
+        if response.status_code not in self.retry_statuses:
+            return False
+        return idempotent or response.status_code == 429
+
+    @staticmethod
+    def may_fail_over(
+        method: str,
+        response: requests.Response = None,
+        error: Exception = None,
+    ) -> bool:
+        """Check whether a failed attempt may be resent to another API endpoint.
+
+        This is independent of the retryable status codes: a connection error or a
+        server error is specific to the endpoint, so the request may succeed at
+        another one right away. As with retries, requests with a non-idempotent method
+        are only resent if they have certainly not been processed.
+
+        :param method: The HTTP verb
+        :param response: The HTTP response, if one was received
+        :param error: The exception raised by the transport, if any
+        :return: Whether the request may be sent to another endpoint
+        """
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        if error is not None:
+            if not isinstance(error, (requests.ConnectionError, requests.Timeout)):
+                return False
+            return idempotent or is_connect_error(error)
+        return response.status_code >= 500 and idempotent
+
+    def next_delay(
+        self,
+        attempt: int,
+        method: str,
+        response: requests.Response = None,
+        error: Exception = None,
+    ) -> Optional[float]:
+        """Get the delay before the next attempt.
+
+        :param attempt: The number of attempts made so far, starting at one
+        :param method: The HTTP verb
+        :param response: The HTTP response, if one was received
+        :param error: The exception raised by the transport, if any
+        :return: The delay in seconds, or :code:`None` if the request must not be retried
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(method, response, error):
+            return None
+        delay = self.backoff.delay(attempt - 1)
+        retry_after = self.retry_after(response) if response is not None else None
+        if retry_after is not None:
+            if retry_after > self.max_retry_after:
+                LOGGER.debug("Not retrying - API asked to wait %ss", retry_after)
+                return None
+            delay = max(delay, retry_after)
+        return delay
+
+    def evaluate(
+        self,
+        attempt: int,
+        method: str,
+        url: str,
+        response: requests.Response = None,
+        error: Exception = None,
+        failover: bool = False,
+    ) -> Optional[float]:
+        """Decide on the next step after an attempt and emit its event.
+
+        :param attempt: The number of attempts made so far, starting at one
+        :param method: The HTTP verb
+        :param url: The request URL
+        :param response: The HTTP response, if one was received
+        :param error: The exception raised by the transport, if any
+        :param failover: Whether the request can be resent to another endpoint
+        :return: The delay in seconds, or :code:`None` if the request must not be retried
+        """
+        if failover and attempt < self.max_attempts:
+            # another endpoint is not affected by this one's backoff
+            delay = 0.0
+        else:
+            delay = self.next_delay(attempt, method, response=response, error=error)
+        status_code = response.status_code if response is not None else None
+        if delay is not None:
+            LOGGER.debug(
+                "Attempt %s of %s %s failed (%s) - retrying in %.2fs",
+                attempt,
+                method,
+                url,
+                error or status_code,
+                delay,
+            )
+        if self.on_attempt is not None:
+            self.on_attempt(
+                RetryAttempt(
+                    attempt=attempt,
+                    method=method,
+                    url=url,
+                    status_code=status_code,
+                    error=error,
+                    delay=delay,
+                )
+            )
+        return delay
+
+    def __repr__(self):
+        return "<RetryPolicy max_attempts={} backoff={} retry_statuses={}>".format(
+            self.max_attempts, self.backoff, sorted(self.retry_statuses)
+        )
@@ -0,0 +1,65 @@
+"""This module contains helpers splitting a date range into shards that can be
+listed in parallel."""
+
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import List, NamedTuple, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+# the maximum number of analyses listed serially within a single shard
+DEFAULT_SHARD_SIZE = 1000
+# shards are not split below this span, as the API compares timestamps in seconds
+MIN_SHARD_SPAN = timedelta(seconds=1)
+
+
+class Shard(NamedTuple):
+    """A sub-range of a date window that is listed on its own.
+
+    Both bounds are inclusive, so entries submitted exactly at the boundary of two
+    adjacent shards are listed by both of them.
+    """
+
+    date_from: datetime
+    date_to: datetime
+
+    @property
+    def span(self) -> timedelta:
+        """The length of the shard's date range."""
+        return self.date_to - self.date_from
+
+    def split(self, total: int, shard_size: int = DEFAULT_SHARD_SIZE) -> Optional[List["Shard"]]:
+        """Split the shard according to the number of entries observed in it.
+
+        The shard is cut into as many equally long sub-ranges as would be needed to
+        hold :code:`total` entries evenly spread at :code:`shard_size` entries each.
+        Sub-ranges that turn out to be denser are split again once they are listed.
+
+        :param total: The number of entries in the shard reported by the API
+        :param shard_size: The maximum number of entries to list serially
+        :return: The sub-shards, newest first, or :code:`None` if the shard is small
+            enough or can not be split any further
+        """
+        if total <= shard_size or self.span <= MIN_SHARD_SPAN:
+            return None
+        parts = min(math.ceil(total / shard_size), int(self.span / MIN_SHARD_SPAN))
+        LOGGER.debug("Splitting shard of %s entries into %s parts", total, parts)
+        return split_range(self.date_from, self.date_to, parts)
+
+
+def split_range(date_from: datetime, date_to: datetime, parts: int) -> List[Shard]:
+    """Split a date range into equally long shards.
+
+    The shards are returned newest first, matching the order in which the API lists
+    analyses.
+
+    :param date_from: Start of the date range
+    :param date_to: End of the date range
+    :param parts: The number of shards
+    :return: The list of shards
+    """
+    parts = max(1, parts)
+    step = (date_to - date_from) / parts
+    bounds = [date_from + step * i for i in range(parts)] + [date_to]
+    return [Shard(bounds[i], bounds[i + 1]) for i in reversed(range(parts))]
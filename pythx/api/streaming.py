@@ -0,0 +1,192 @@
+"""This module contains an incremental parser extracting issues from a
+streamed report response."""
+
+import codecs
+import json
+import logging
+from typing import Dict, List
+
+from mythx_models.exceptions import MythXAPIError
+
+LOGGER = logging.getLogger(__name__)
+
+# the number of bytes read from the socket at a time
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+WHITESPACE = " \t\n\r"
+
+# parser states, named after the token that is expected next
+START = "start"
+REPORT = "report"
+REPORT_OR_END = "report_or_end"
+AFTER_REPORT = "after_report"
+KEY = "key"
+KEY_OR_END = "key_or_end"
+COLON = "colon"
+VALUE = "value"
+AFTER_VALUE = "after_value"
+ISSUE = "issue"
+ISSUE_OR_END = "issue_or_end"
+AFTER_ISSUE = "after_issue"
+DONE = "done"
+
+
+class IssueStreamParser:
+    """Push parser extracting the issues of a :code:`DetectedIssuesResponse`
+    payload while it is being received.
+
+    The report payload is a JSON list of issue reports, each of which holds a list
+    of issues. Instead of decoding the whole document, the parser walks through the
+    enclosing lists and objects token by token, and only fully decodes one issue at
+    a time. Other report fields, e.g. the source list and meta data, are decoded and
+    dropped. Each issue carries its own locations, so it can be processed on its own.
+
+    Body chunks are passed to :code:`feed` as they arrive, which returns the issues
+    that have been completed by the chunk. Once the body has been received,
+    :code:`close` checks that the document was complete. Malformed documents raise a
+    :code:`MythXAPIError`.
+    """
+
+    def __init__(self):
+        """Instantiate a new issue stream parser."""
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._retry_at = 0
+        self._state = START
+        self._key = None
+
+    def feed(self, data: bytes) -> List[Dict]:
+        """Parse the next chunk of the response body.
+
+        :param data: The raw body chunk
+        :return: The issues completed by the chunk, as decoded JSON objects
+        """
+        self._buffer = self._buffer[self._pos :] + self._decoder.decode(data)
+        self._retry_at -= self._pos
+        self._pos = 0
+        return self._parse(final=False)
+
+    def close(self) -> List[Dict]:
+        """Finish parsing after the whole body has been received.
+
+        :return: The remaining issues
+        """
+        self._buffer = self._buffer[self._pos :] + self._decoder.decode(b"", final=True)
+        self._pos = 0
+        self._retry_at = 0
+        issues = self._parse(final=True)
+        if self._state != DONE:
+            raise MythXAPIError("Got unexpected response data: Incomplete issue report")
+        if self._buffer[self._pos :].strip(WHITESPACE):
+            raise MythXAPIError("Got unexpected response data: Trailing data after report")
+        return issues
+
+    def _next_char(self) -> str:
+        """Skip whitespace and get the next character without consuming it.
+
+        :return: The character, or an empty string if more data is needed
+        """
+        while self._pos < len(self._buffer) and self._buffer[self._pos] in WHITESPACE:
+            self._pos += 1
+        return self._buffer[self._pos] if self._pos < len(self._buffer) else ""
+
+    def _decode_value(self, final: bool):
+        """Decode the JSON value at the current position.
+
+        Decoding a value that is still incomplete fails, in which case it is retried
+        once the buffer has doubled, so large values are not decoded over and over.
+
+        :param final: Whether the whole body has been received
+        :return: A tuple of a success flag and the decoded value
+        """
+        if not final and len(self._buffer) < self._retry_at:
+            return False, None
+        try:
+            value, end = self._json.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError as e:
+            if final:
+                raise MythXAPIError("Got unexpected response data: {}".format(e))
+            self._retry_at = self._pos + 2 * (len(self._buffer) - self._pos)
+            return False, None
+        if end == len(self._buffer) and not final and isinstance(value, (int, float)):
+            # a number at the end of the buffer might continue in the next chunk
+            self._retry_at = len(self._buffer) + 1
+            return False, None
+        self._pos = end
+        self._retry_at = 0
+        return True, value
+
+    def _expect(self, char: str, expected: str) -> None:
+        if char not in expected:
+            raise MythXAPIError(
+                "Got unexpected response data: Expected one of {!r} but got {!r}".format(
+                    expected, char
+                )
+            )
+        self._pos += 1
+
+    def _parse(self, final: bool) -> List[Dict]:
+        """Advance the parser's state machine as far as the buffer allows.
+
+        :param final: Whether the whole body has been received
+        :return: The issues decoded on the way
+        """
+        issues = []
+        while self._state != DONE:
+            char = self._next_char()
+            if not char:
+                break
+            state = self._state
+            if state == START:
+                self._expect(char, "[")
+                self._state = REPORT_OR_END
+            elif state in (REPORT, REPORT_OR_END):
+                self._expect(char, "{]" if state == REPORT_OR_END else "{")
+                self._state = KEY_OR_END if char == "{" else DONE
+            elif state == AFTER_REPORT:
+                self._expect(char, ",]")
+                self._state = REPORT if char == "," else DONE
+            elif state in (KEY, KEY_OR_END):
+                if state == KEY_OR_END and char == "}":
+                    self._pos += 1
+                    self._state = AFTER_REPORT
+                    continue
+                self._expect(char, '"')
+                self._pos -= 1
+                done, self._key = self._decode_value(final)
+                if not done:
+                    break
+                self._state = COLON
+            elif state == COLON:
+                self._expect(char, ":")
+                self._state = VALUE
+            elif state == VALUE:
+                if self._key == "issues":
+                    self._expect(char, "[")
+                    self._state = ISSUE_OR_END
+                    continue
+                done, _ = self._decode_value(final)
+                if not done:
+                    break
+                self._state = AFTER_VALUE
+            elif state == AFTER_VALUE:
+                self._expect(char, ",}")
+                self._state = KEY if char == "," else AFTER_REPORT
+            elif state in (ISSUE, ISSUE_OR_END):
+                if state == ISSUE_OR_END and char == "]":
+                    self._pos += 1
+                    self._state = AFTER_VALUE
+                    continue
+                self._expect(char, "{")
+                self._pos -= 1
+                done, issue = self._decode_value(final)
+                if not done:
+                    break
+                issues.append(issue)
+                self._state = AFTER_ISSUE
+            elif state == AFTER_ISSUE:
+                self._expect(char, ",]")
+                self._state = ISSUE if char == "," else AFTER_VALUE
+        return issues
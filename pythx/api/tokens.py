@@ -0,0 +1,124 @@
+"""This module contains the client's view on its pair of JWT tokens."""
+
+import logging
+import time
+from typing import NamedTuple, Optional, Tuple
+
+import jwt
+
+LOGGER = logging.getLogger(__name__)
+
+# renew tokens this many seconds before they expire
+DEFAULT_REFRESH_MARGIN = 30.0
+
+
+def token_deadline(token: Optional[str]) -> Optional[float]:
+    """Decode a JWT to get its expiration time on the monotonic clock.
+
+    Comparing monotonic deadlines is much cheaper than decoding the token for
+    every request, and it is not affected by changes of the system clock once the
+    token has been decoded. Tokens that cannot be decoded are considered expired.
+
+    :param token: The JWT to decode
+    :return: The monotonic expiration time, or :code:`None` if no token is given
+    """
+    if token is None:
+        return None
+    try:
+        exp = jwt.decode(token, verify=False)["exp"]
+    except (jwt.InvalidTokenError, KeyError, TypeError):
+        LOGGER.debug("Could not decode the token's expiration time")
+        return float("-inf")
+    return time.monotonic() + (exp - time.time())
+
+
+class TokenPair(NamedTuple):
+    """An immutable pair of access and refresh token with their decoded
+    deadlines.
+
+    The tokens are decoded once when the pair is created. Being immutable, a pair
+    can be replaced in a single assignment, so readers never see an access token
+    belonging to a different refresh token.
+    """
+
+    api_key: Optional[str] = None
+    refresh_token: Optional[str] = None
+    access_deadline: Optional[float] = None
+    refresh_deadline: Optional[float] = None
+    issued: Optional[float] = None
+
+    @classmethod
+    def create(cls, api_key: str = None, refresh_token: str = None) -> "TokenPair":
+        """Create a new pair, decoding the tokens' expiration times.
+
+        :param api_key: The JWT access token (or API key)
+        :param refresh_token: The JWT refresh token
+        :return: The token pair
+        """
+        return cls(
+            api_key=api_key,
+            refresh_token=refresh_token,
+            access_deadline=token_deadline(api_key),
+            refresh_deadline=token_deadline(refresh_token),
+            issued=time.monotonic(),
+        )
+
+    def with_api_key(self, api_key: Optional[str]) -> "TokenPair":
+        """Get a copy of the pair with a different access token.
+
+        :param api_key: The new JWT access token (or API key)
+        :return: The updated token pair
+        """
+        return self._replace(
+            api_key=api_key, access_deadline=token_deadline(api_key), issued=time.monotonic()
+        )
+
+    def with_refresh_token(self, refresh_token: Optional[str]) -> "TokenPair":
+        """Get a copy of the pair with a different refresh token.
+
+        :param refresh_token: The new JWT refresh token
+        :return: The updated token pair
+        """
+        return self._replace(
+            refresh_token=refresh_token,
+            refresh_deadline=token_deadline(refresh_token),
+            issued=time.monotonic(),
+        )
+
+    def renewal(self, margin: float = DEFAULT_REFRESH_MARGIN) -> Optional[str]:
+        """Determine how the pair has to be renewed before it can be used.
+
+        A token is treated as expired once it is within :code:`margin` seconds of its
+        expiration time, so it is renewed before requests start failing. A lone access
+        token, e.g. an API key from the dashboard, is used as is.
+
+        :param margin: The number of seconds before expiry a token is renewed
+        :return: :code:`None` if the pair is usable, :code:`refresh`, or :code:`login`
+        """
+        if self.api_key is None:
+            return "login"
+        if self.refresh_token is None:
+            return None
+        now = time.monotonic() + margin
+        if now < self.access_deadline:
+            return None
+        if now < self.refresh_deadline:
+            return "refresh"
+        return "login"
+
+    def renewal_due(self, lead: float) -> Optional[Tuple[float, float]]:
+        """Schedule the renewal of the pair ahead of its expiry.
+
+        The renewal is due :code:`lead` seconds before the first of the two tokens
+        expires, but no earlier than halfway through its lifetime, so that short-lived
+        tokens are not renewed over and over again.
+
+        :param lead: The number of seconds before expiry the pair should be renewed
+        :return: The monotonic time the renewal is due and the margin to check the pair
+            with at that time, or :code:`None` if the pair can not be renewed
+        """
+        if self.api_key is None or self.refresh_token is None:
+            return None
+        deadline = min(self.access_deadline, self.refresh_deadline)
+        lead = min(lead, max(0.0, (deadline - self.issued) / 2))
+        return deadline - lead, lead
@@ -0,0 +1,168 @@
+"""This module contains stores persisting the client's JWT tokens across
+processes."""
+
+import abc
+import json
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+LOGGER = logging.getLogger(__name__)
+
+
+class BaseTokenStore(abc.ABC):
+    """Abstract token store class that can be used by developers to build their
+    own.
+
+    A token store holds the access and refresh token of a single MythX account. The
+    client loads the tokens from the store when it is created, and saves them after
+    every login or refresh. Before renewing its tokens, the client locks the store
+    and reloads them, so that a renewal done by another process is picked up instead
+    of being repeated.
+    """
+
+    @abc.abstractmethod
+    def load(self) -> Optional[Tuple[str, str]]:
+        """Abstract method for loading the stored tokens.
+
+        :return: The access and refresh token, or :code:`None` if none are stored
+        """
+        pass
+
+    @abc.abstractmethod
+    def save(self, api_key: str, refresh_token: str) -> None:
+        """Abstract method for storing a new pair of tokens.
+
+        :param api_key: The JWT access token
+        :param refresh_token: The JWT refresh token
+        :return: None
+        """
+        pass
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Abstract method for removing the stored tokens.
+
+        :return: None
+        """
+        pass
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Hold an exclusive lock on the store while renewing the tokens.
+
+        The default implementation does not lock anything.
+        """
+        yield
+
+
+def _to_str(token) -> str:
+    return token.decode() if isinstance(token, bytes) else token
+
+
+class FileTokenStore(BaseTokenStore):
+    """A token store keeping the tokens in a JSON file.
+
+    The file is only readable by its owner, and it is replaced atomically on every
+    update, so readers never see a partially written pair. Renewals are serialized
+    with an advisory lock on a separate :code:`.lock` file next to it, which works
+    across all processes on the host. On platforms without :code:`fcntl`, renewals
+    are only serialized within the current process.
+
+    As the file holds valid credentials, it should be kept in a private location,
+    e.g. the user's cache directory. Every MythX account needs its own file.
+    """
+
+    def __init__(self, path: str):
+        """Instantiate a new file token store.
+
+        :param path: The path of the token file
+        """
+        LOGGER.debug("Initializing at %s", path)
+        self.path = Path(path)
+        self.lock_path = Path(str(path) + ".lock")
+        self._thread_lock = threading.RLock()
+        self._lock_depth = 0
+
+    def load(self) -> Optional[Tuple[str, str]]:
+        """Load the tokens from the file.
+
+        A missing or corrupt file is treated as an empty store.
+
+        :return: The access and refresh token, or :code:`None` if none are stored
+        """
+        try:
+            with self.path.open("r") as f:
+                data = json.load(f)
+            return data["access"], data["refresh"]
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError):
+            LOGGER.debug("Ignoring corrupt token file %s", self.path)
+            return None
+
+    def save(self, api_key: str, refresh_token: str) -> None:
+        """Atomically replace the token file with a new pair of tokens.
+
+        :param api_key: The JWT access token
+        :param refresh_token: The JWT refresh token
+        :return: None
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # mkstemp creates the file with permissions for the owner only
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.path.parent), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"access": _to_str(api_key), "refresh": _to_str(refresh_token)}, f)
+            os.replace(tmp_path, str(self.path))
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def clear(self) -> None:
+        """Remove the token file.
+
+        :return: None
+        """
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Hold an exclusive lock on the store while renewing the tokens.
+
+        The lock is reentrant within a thread, and blocks other threads and processes
+        until it is released.
+        """
+        with self._thread_lock:
+            if self._lock_depth or fcntl is None:
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                return
+
+            self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(str(self.lock_path), "a") as f:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
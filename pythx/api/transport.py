@@ -0,0 +1,402 @@
+"""This module contains the HTTP transport implementations used by the API
+handler."""
+
+import abc
+import asyncio
+import functools
+import logging
+from concurrent.futures import Executor
+from typing import Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.exceptions import NewConnectionError
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_ASYNC_POOL_SIZE = 100
+
+
+def _body(payload) -> Dict:
+    """Get the :code:`requests` arguments for sending a payload.
+
+    :param payload: The encoded payload, or a dictionary to encode as JSON
+    :return: The keyword arguments for the request
+    """
+    if isinstance(payload, bytes):
+        return {"data": payload}
+    return {"json": payload}
+
+
+class BaseTransport(abc.ABC):
+    """Abstract transport class that can be used by developers to build their
+    own.
+
+    A transport is owned by an :code:`APIHandler` instance and is responsible for
+    moving the assembled request over the wire. It is expected to expose a
+    :code:`request` method returning the HTTP response object, and a :code:`close`
+    method releasing any resources (e.g. pooled connections) it holds.
+    """
+
+    @abc.abstractmethod
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        payload: Union[bytes, Dict],
+        params: Dict,
+        stream: bool = False,
+        timeout: Tuple[Optional[float], Optional[float]] = None,
+    ) -> requests.Response:
+        """Abstract method for sending a single HTTP request.
+
+        Streamed responses are only requested for large downloads, e.g. by
+        :code:`APIHandler.stream_request`. The handler passes the connect and read
+        timeouts of every request, which the transport is expected to enforce.
+
+        :param method: The HTTP verb
+        :param url: The full URL to send the request to
+        :param headers: The request headers, including authentication data
+        :param payload: The JSON payload to send, either encoded or as a dictionary
+        :param params: The URL parameters
+        :param stream: Do not read the response body before returning
+        :param timeout: The connect and read timeouts in seconds (:code:`None` for no limit)
+        :return: The HTTP response
+        """
+        pass
+
+    def close(self) -> None:
+        """Release the resources held by the transport.
+
+        The default implementation does not hold any resources, so there is nothing
+        to do here.
+        """
+        pass
+
+
+class RequestsTransport(BaseTransport):
+    """A transport holding a persistent connection pool.
+
+    Instead of opening a fresh TCP and TLS connection for every request, the
+    transport keeps a :code:`requests.Session` around, whose adapters reuse
+    connections to the MythX API across calls.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+    ):
+        """Instantiate a new pooled transport.
+
+        :param pool_connections: The number of per-host connection pools to cache
+        :param pool_maxsize: The maximum number of connections kept open per host
+        :param pool_block: Block instead of opening excess connections when a host's pool is exhausted
+        :param keep_alive: Keep connections open for reuse after a request has finished
+        """
+        LOGGER.debug(
+            "Initializing with pool_connections=%s, pool_maxsize=%s, pool_block=%s, keep_alive=%s",
+            pool_connections,
+            pool_maxsize,
+            pool_block,
+            keep_alive,
+        )
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.session = self._build_session()
+
+    def _build_session(self) -> requests.Session:
+        """Create a new session with pooled adapters mounted.
+
+        :return: The configured session
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        payload: Union[bytes, Dict],
+        params: Dict,
+        stream: bool = False,
+        timeout: Tuple[Optional[float], Optional[float]] = None,
+    ) -> requests.Response:
+        """Send the request through the session's connection pool.
+
+        :param method: The HTTP verb
+        :param url: The full URL to send the request to
+        :param headers: The request headers, including authentication data
+        :param payload: The JSON payload to send, either encoded or as a dictionary
+        :param params: The URL parameters
+        :param stream: Do not read the response body before returning
+        :param timeout: The connect and read timeouts in seconds (:code:`None` for no limit)
+        :return: The HTTP response
+        """
+        return self.session.request(
+            method=method,
+            url=url,
+            headers=headers,
+            params=params,
+            stream=stream,
+            timeout=timeout,
+            **_body(payload)
+        )
+
+    def close(self) -> None:
+        """Close all pooled connections.
+
+        The transport stays usable afterwards, in which case a fresh pool is
+        created on demand.
+        """
+        LOGGER.debug("Closing connection pool")
+        self.session.close()
+        self.session = self._build_session()
+
+
+class BaseAsyncTransport(abc.ABC):
+    """Abstract transport class for the asynchronous API handler.
+
+    It mirrors :code:`BaseTransport`, with the difference that :code:`request` and
+    :code:`close` are coroutines. The returned response is expected to be a
+    :code:`requests.Response`, so the handler can process the results of both
+    transport flavours the same way.
+    """
+
+    @abc.abstractmethod
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        payload: Union[bytes, Dict],
+        params: Dict,
+        timeout: Tuple[Optional[float], Optional[float]] = None,
+    ) -> requests.Response:
+        """Abstract coroutine for sending a single HTTP request.
+
+        :param method: The HTTP verb
+        :param url: The full URL to send the request to
+        :param headers: The request headers, including authentication data
+        :param payload: The JSON payload to send, either encoded or as a dictionary
+        :param params: The URL parameters
+        :param timeout: The connect and read timeouts in seconds (:code:`None` for no limit)
+        :return: The HTTP response
+        """
+        pass
+
+    async def close(self) -> None:
+        """Release the resources held by the transport.
+
+        The default implementation does not hold any resources, so there is nothing
+        to do here.
+        """
+        pass
+
+
+class AiohttpTransport(BaseAsyncTransport):
+    """A non-blocking transport based on :code:`aiohttp`.
+
+    All requests share one :code:`aiohttp.ClientSession`, so a single event loop
+    can keep a large number of requests in flight over a pool of persistent
+    connections. This transport requires the optional :code:`aiohttp` dependency,
+    which can be installed with :code:`pip install pythx[async]`.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_ASYNC_POOL_SIZE,
+        pool_maxsize: int = 0,
+        keep_alive: bool = True,
+    ):
+        """Instantiate a new aiohttp transport.
+
+        :param pool_size: The maximum number of simultaneously open connections (0 for no limit)
+        :param pool_maxsize: The maximum number of connections per host (0 for no limit)
+        :param keep_alive: Keep connections open for reuse after a request has finished
+        """
+        import aiohttp  # noqa: F401 - fail early if the optional dependency is missing
+
+        LOGGER.debug(
+            "Initializing with pool_size=%s, pool_maxsize=%s, keep_alive=%s",
+            pool_size,
+            pool_maxsize,
+            keep_alive,
+        )
+        self.pool_size = pool_size
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.session = None
+
+    def _get_session(self):
+        """Get the shared client session, creating it on first use.
+
+        The session is created lazily, because aiohttp binds it to the event loop
+        that is running at creation time.
+
+        :return: The :code:`aiohttp.ClientSession` instance
+        """
+        import aiohttp
+
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.pool_maxsize,
+                force_close=not self.keep_alive,
+            )
+            self.session = aiohttp.ClientSession(connector=connector)
+        return self.session
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        payload: Union[bytes, Dict],
+        params: Dict,
+        timeout: Tuple[Optional[float], Optional[float]] = None,
+    ) -> requests.Response:
+        """Send the request through the shared aiohttp session.
+
+        The request is prepared by :code:`requests` to encode the payload and URL
+        parameters exactly like the synchronous transport does. The aiohttp response
+        is read completely and converted into a :code:`requests.Response`. Likewise,
+        aiohttp's connection errors and timeouts are raised as their :code:`requests`
+        counterparts, so the handler's retry policy can classify them.
+
+        :param method: The HTTP verb
+        :param url: The full URL to send the request to
+        :param headers: The request headers, including authentication data
+        :param payload: The JSON payload to send, either encoded or as a dictionary
+        :param params: The URL parameters
+        :param timeout: The connect and read timeouts in seconds (:code:`None` for no limit)
+        :return: The HTTP response
+        """
+        import aiohttp
+        from yarl import URL
+
+        prepared = requests.Request(
+            method=method, url=url, headers=headers, params=params, **_body(payload)
+        ).prepare()
+        connect_timeout, read_timeout = timeout or (None, None)
+        try:
+            async with self._get_session().request(
+                prepared.method,
+                URL(prepared.url, encoded=True),
+                headers=dict(prepared.headers),
+                data=prepared.body,
+                timeout=aiohttp.ClientTimeout(
+                    sock_connect=connect_timeout, sock_read=read_timeout
+                ),
+            ) as resp:
+                content = await resp.read()
+        except aiohttp.ClientConnectorError as e:
+            # the request never left the client, like urllib3's NewConnectionError
+            raise requests.exceptions.ConnectionError(
+                NewConnectionError(None, str(e)), request=prepared
+            ) from e
+        except aiohttp.ClientError as e:
+            raise requests.exceptions.ConnectionError(e, request=prepared) from e
+        except asyncio.TimeoutError as e:
+            raise requests.exceptions.ReadTimeout(e, request=prepared) from e
+
+        response = requests.Response()
+        response.status_code = resp.status
+        response.headers = CaseInsensitiveDict(resp.headers)
+        response.url = prepared.url
+        response.request = prepared
+        response._content = content
+        return response
+
+    async def close(self) -> None:
+        """Close the shared session and all of its connections."""
+        LOGGER.debug("Closing client session")
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+
+class ExecutorTransport(BaseAsyncTransport):
+    """An asynchronous adapter for synchronous transports.
+
+    Each request is run in an executor, so the event loop is not blocked while
+    waiting for the response. This is the fallback used when :code:`aiohttp` is
+    not installed. The number of requests in flight is bounded by the executor's
+    worker count.
+    """
+
+    def __init__(self, transport: BaseTransport = None, executor: Executor = None):
+        """Instantiate a new executor transport.
+
+        :param transport: The synchronous transport to wrap
+        :param executor: The executor to run requests in (defaults to the loop's executor)
+        """
+        self.transport = transport or RequestsTransport()
+        self.executor = executor
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        payload: Union[bytes, Dict],
+        params: Dict,
+        timeout: Tuple[Optional[float], Optional[float]] = None,
+    ) -> requests.Response:
+        """Send the request through the wrapped transport in the executor.
+
+        :param method: The HTTP verb
+        :param url: The full URL to send the request to
+        :param headers: The request headers, including authentication data
+        :param payload: The JSON payload to send, either encoded or as a dictionary
+        :param params: The URL parameters
+        :param timeout: The connect and read timeouts in seconds (:code:`None` for no limit)
+        :return: The HTTP response
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            functools.partial(
+                self.transport.request,
+                method=method,
+                url=url,
+                headers=headers,
+                payload=payload,
+                params=params,
+                timeout=timeout,
+            ),
+        )
+
+    async def close(self) -> None:
+        """Close the wrapped transport."""
+        self.transport.close()
+
+
+def default_async_transport() -> BaseAsyncTransport:
+    """Get the best available asynchronous transport.
+
+    :return: An :code:`AiohttpTransport` if aiohttp is installed, an :code:`ExecutorTransport` otherwise
+    """
+    try:
+        return AiohttpTransport()
+    except ImportError:
+        LOGGER.debug("aiohttp is not installed - falling back to executor transport")
+        return ExecutorTransport()
@@ -0,0 +1,10 @@
+"""This module contains response caches for the API handler.
+
+This also encompasses an abstract base cache that developers can easily
+use to build their own and register it later in the APIHandler class.
+"""
+
+from .base import BaseCache
+from .disk import DiskCache
+from .memory import MemoryCache
+from .submission import SubmissionIndex
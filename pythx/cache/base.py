@@ -0,0 +1,74 @@
+"""This module contains the abstract base cache class."""
+
+import abc
+import hashlib
+import json
+import re
+from typing import Any, Dict, Optional
+
+from mythx_models.response import AnalysisStatus
+
+ANALYSIS_LIST_PATH = re.compile(r"/v\d+/analyses$")
+ANALYSIS_STATUS_PATH = re.compile(r"/v\d+/analyses/(?P<uuid>[^/]+)$")
+ANALYSIS_INPUT_PATH = re.compile(r"/v\d+/analyses/(?P<uuid>[^/]+)/input$")
+DETECTED_ISSUES_PATH = re.compile(r"/v\d+/analyses/(?P<uuid>[^/]+)/issues$")
+GROUP_STATUS_PATH = re.compile(r"/v\d+/analysis-groups/(?P<group_id>[^/]+)$")
+PROJECT_STATUS_PATH = re.compile(r"/v\d+/projects/(?P<project_id>[^/]+)$")
+VERSION_PATH = re.compile(r"/v\d+/version$")
+
+TERMINAL_STATUSES = (AnalysisStatus.FINISHED.value, AnalysisStatus.ERROR.value)
+
+
+class BaseCache(abc.ABC):
+    """Abstract cache class that can be used by developers to build their own.
+
+    A cache sits in front of the handler's transport and holds raw, decoded JSON
+    response payloads. It is expected to expose two methods: :code:`get`, which
+    returns a previously stored payload for a request data dictionary (or
+    :code:`None`), and :code:`set`, which is called with every successful response.
+    Each cache decides on its own which requests it considers cacheable.
+
+    As caches operate on the raw payloads, response middlewares are still executed
+    on cached responses.
+    """
+
+    #: Whether reports are only stored once the final status of their job is cached
+    requires_final_status = False
+    #: Whether lookups block on IO, so asynchronous handlers run them in an executor
+    blocking = False
+
+    @staticmethod
+    def request_key(request_data: Dict) -> str:
+        """Derive a stable key from the request's method, URL, and parameters.
+
+        :param request_data: The request's data dictionary
+        :return: The hex-encoded SHA-256 digest identifying the request
+        """
+        identity = json.dumps(
+            [
+                request_data["method"].upper(),
+                request_data["url"],
+                request_data.get("params") or {},
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(identity.encode()).hexdigest()
+
+    @abc.abstractmethod
+    def get(self, request_data: Dict) -> Optional[Any]:
+        """Abstract method for a cache lookup.
+
+        :param request_data: The request's data dictionary
+        :return: The cached response payload, or :code:`None` on a miss
+        """
+        pass
+
+    @abc.abstractmethod
+    def set(self, request_data: Dict, content: Any) -> None:
+        """Abstract method for storing a response.
+
+        :param request_data: The request's data dictionary
+        :param content: The decoded response payload
+        """
+        pass
@@ -0,0 +1,229 @@
+"""This module contains a persistent on-disk cache for immutable API
+responses."""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from pythx.cache.base import (
+    ANALYSIS_INPUT_PATH,
+    ANALYSIS_STATUS_PATH,
+    DETECTED_ISSUES_PATH,
+    TERMINAL_STATUSES,
+    BaseCache,
+)
+
+LOGGER = logging.getLogger("DiskCache")
+
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+
+
+class DiskCache(BaseCache):
+    """This cache stores responses that can never change on disk.
+
+    Only the following responses are stored:
+
+        1. The status of an analysis job that has reached the :code:`Finished` or :code:`Error` state
+        2. The input of an analysis job
+        3. The detected issues report of an analysis job whose final status has been cached before
+
+    The last restriction makes sure that a report is never cached before the job has
+    finished. The client's :code:`report` method looks up the job's status first if
+    such a cache is registered, so reports are cached even if the caller never asks
+    for the status itself.
+
+    Each response is stored in its own file, named after the request key. Files are
+    written to a temporary file first and atomically moved into place, so multiple
+    processes can safely share one cache directory. Once the total size of the cache
+    exceeds the configured limit, the least recently used entries are evicted.
+
+    As entries are not bound to a user, a cache directory should not be shared
+    between different MythX accounts.
+    """
+
+    requires_final_status = True
+    blocking = True
+
+    def __init__(self, path: str, max_size: int = DEFAULT_MAX_SIZE):
+        """Instantiate a new on-disk cache.
+
+        :param path: The directory to store the cache entries in
+        :param max_size: The maximum size of all entries in bytes
+        """
+        LOGGER.debug("Initializing at %s with max_size=%s", path, max_size)
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._size = self._total_size()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.path / "{}.json".format(key)
+
+    def _total_size(self) -> int:
+        """Sum up the size of all entries currently in the cache directory.
+
+        :return: The total size in bytes
+        """
+        size = 0
+        for entry in os.scandir(str(self.path)):
+            if entry.name.endswith(".json"):
+                try:
+                    size += entry.stat().st_size
+                except FileNotFoundError:
+                    pass
+        return size
+
+    def _read(self, key: str) -> Optional[Any]:
+        """Read an entry and mark it as recently used.
+
+        Entries that vanish while being read, e.g. because another process evicted
+        them, are treated as a miss.
+
+        :param key: The request key
+        :return: The cached payload, or :code:`None`
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with entry_path.open("rb") as f:
+                content = json.loads(f.read().decode())
+            os.utime(str(entry_path))
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            LOGGER.debug("Dropping corrupt entry %s", key)
+            self._remove(entry_path)
+            return None
+        return content
+
+    def _write(self, key: str, content: Any) -> None:
+        """Atomically write an entry and evict old ones if the cache is full.
+
+        :param key: The request key
+        :param content: The payload to store
+        """
+        data = json.dumps(content).encode()
+        entry_path = self._entry_path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            with self._lock:
+                try:
+                    # an overwritten entry no longer counts towards the size
+                    replaced_size = entry_path.stat().st_size
+                except FileNotFoundError:
+                    replaced_size = 0
+                os.replace(tmp_path, str(entry_path))
+        except OSError:
+            self._remove(Path(tmp_path))
+            raise
+        with self._lock:
+            self._size += len(data) - replaced_size
+            if self._size > self.max_size:
+                self._evict()
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries until the cache fits its size
+        limit again.
+
+        The directory is rescanned, as other processes may have added or removed
+        entries in the meantime.
+        """
+        entries = []
+        for entry in os.scandir(str(self.path)):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._size <= self.max_size:
+                break
+            LOGGER.debug("Evicting %s", path)
+            self._remove(Path(path))
+            self._size -= size
+
+    def _status_key(self, request_data: Dict, uuid: str) -> str:
+        """Get the key of the status request belonging to an analysis job.
+
+        :param request_data: The request's data dictionary of a job's sub-resource
+        :param uuid: The analysis job UUID
+        :return: The status request key
+        """
+        url = request_data["url"]
+        status_url = url[: url.rindex(uuid) + len(uuid)]
+        return self.request_key({"method": "GET", "url": status_url, "params": {}})
+
+    def _is_cacheable(self, request_data: Dict, content: Any = None) -> bool:
+        """Check whether the request refers to an immutable resource.
+
+        :param request_data: The request's data dictionary
+        :param content: The response payload, if already known
+        :return: Whether the response can be cached
+        """
+        if request_data["method"].upper() != "GET":
+            return False
+        url = request_data["url"]
+        if ANALYSIS_INPUT_PATH.search(url):
+            return True
+        match = DETECTED_ISSUES_PATH.search(url)
+        if match:
+            return self._entry_path(
+                self._status_key(request_data, match.group("uuid"))
+            ).exists()
+        if ANALYSIS_STATUS_PATH.search(url):
+            # statuses are looked up unconditionally, but only stored once final
+            return content is None or (
+                isinstance(content, dict) and content.get("status") in TERMINAL_STATUSES
+            )
+        return False
+
+    def get(self, request_data: Dict) -> Optional[Any]:
+        """Look up the response for an immutable resource.
+
+        :param request_data: The request's data dictionary
+        :return: The cached response payload, or :code:`None` on a miss
+        """
+        if not self._is_cacheable(request_data):
+            return None
+        content = self._read(self.request_key(request_data))
+        LOGGER.debug("Cache %s for %s", "miss" if content is None else "hit", request_data["url"])
+        return content
+
+    def set(self, request_data: Dict, content: Any) -> None:
+        """Store the response if it belongs to an immutable resource.
+
+        :param request_data: The request's data dictionary
+        :param content: The decoded response payload
+        """
+        if not self._is_cacheable(request_data, content):
+            return
+        LOGGER.debug("Storing response for %s", request_data["url"])
+        self._write(self.request_key(request_data), content)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache.
+
+        :return: None
+        """
+        with self._lock:
+            for entry in os.scandir(str(self.path)):
+                if entry.name.endswith(".json"):
+                    self._remove(Path(entry.path))
+            self._size = 0
@@ -0,0 +1,183 @@
+"""This module contains an in-memory TTL cache for frequently polled API
+responses."""
+
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Optional
+
+from pythx.cache.base import (
+    ANALYSIS_LIST_PATH,
+    ANALYSIS_STATUS_PATH,
+    GROUP_STATUS_PATH,
+    PROJECT_STATUS_PATH,
+    TERMINAL_STATUSES,
+    VERSION_PATH,
+    BaseCache,
+)
+
+LOGGER = logging.getLogger("MemoryCache")
+
+DEFAULT_TTLS = {
+    "analysis_status": 2.0,
+    "group_status": 2.0,
+    "project_status": 10.0,
+    "analysis_list": 5.0,
+    "version": 300.0,
+}
+DEFAULT_MAX_ENTRIES = 1024
+
+ENDPOINTS = (
+    ("analysis_status", ANALYSIS_STATUS_PATH),
+    ("group_status", GROUP_STATUS_PATH),
+    ("project_status", PROJECT_STATUS_PATH),
+    ("analysis_list", ANALYSIS_LIST_PATH),
+    ("version", VERSION_PATH),
+)
+
+
+class MemoryCache(BaseCache):
+    """This cache keeps short-lived copies of status and list responses in
+    memory.
+
+    It is meant to absorb redundant requests, e.g. when several threads poll the
+    same analysis job's status within a short time. Each endpoint has its own
+    time to live, which can be overridden. An endpoint with a TTL of zero is not
+    cached at all.
+
+    Statuses that cannot change anymore are kept without expiry: analysis jobs
+    in the :code:`Finished` or :code:`Error` state, as well as sealed groups
+    without queued or running jobs.
+
+    Whenever a non-GET request (e.g. sealing a group) succeeds, any entry for the
+    same URL is dropped. Once the cache holds the maximum number of entries, the
+    least recently used one is evicted. Hits and misses are counted per endpoint to
+    help tuning the TTLs.
+
+    The cached payloads are shared between callers, so they must not be modified.
+    """
+
+    def __init__(self, ttls: Dict[str, float] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Instantiate a new in-memory cache.
+
+        :param ttls: Per-endpoint TTLs in seconds, overriding the defaults
+        :param max_entries: The maximum number of entries to keep
+        """
+        LOGGER.debug("Initializing with ttls=%s, max_entries=%s", ttls, max_entries)
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.max_entries = max_entries
+        self.hits = Counter()
+        self.misses = Counter()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _endpoint(request_data: Dict) -> Optional[str]:
+        """Get the name of the cacheable endpoint a request targets.
+
+        :param request_data: The request's data dictionary
+        :return: The endpoint name, or :code:`None` if the endpoint is not cached
+        """
+        if request_data["method"].upper() != "GET":
+            return None
+        for name, pattern in ENDPOINTS:
+            if pattern.search(request_data["url"]):
+                return name
+        return None
+
+    @staticmethod
+    def _is_final(endpoint: str, content: Any) -> bool:
+        """Check whether a status response can not change anymore.
+
+        :param endpoint: The endpoint name
+        :param content: The decoded response payload
+        :return: Whether the entry should be kept without expiry
+        """
+        if not isinstance(content, dict):
+            return False
+        if endpoint == "analysis_status":
+            return content.get("status") in TERMINAL_STATUSES
+        if endpoint == "group_status":
+            stats = content.get("numAnalyses") or {}
+            return (
+                content.get("status") == "sealed"
+                and stats.get("queued") == 0
+                and stats.get("running") == 0
+            )
+        return False
+
+    def get(self, request_data: Dict) -> Optional[Any]:
+        """Look up a fresh response for a status or list request.
+
+        :param request_data: The request's data dictionary
+        :return: The cached response payload, or :code:`None` on a miss
+        """
+        endpoint = self._endpoint(request_data)
+        if endpoint is None or not self.ttls.get(endpoint):
+            return None
+        key = self.request_key(request_data)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+                self._entries.move_to_end(key)
+                self.hits[endpoint] += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses[endpoint] += 1
+        return None
+
+    def set(self, request_data: Dict, content: Any) -> None:
+        """Store a status or list response, or invalidate entries after a
+        modifying request.
+
+        :param request_data: The request's data dictionary
+        :param content: The decoded response payload
+        """
+        if request_data["method"].upper() != "GET":
+            self.invalidate(request_data["url"])
+            return
+        endpoint = self._endpoint(request_data)
+        ttl = self.ttls.get(endpoint) if endpoint is not None else None
+        if not ttl:
+            return
+        expires = None if self._is_final(endpoint, content) else time.monotonic() + ttl
+        key = self.request_key(request_data)
+        with self._lock:
+            self._entries[key] = (expires, content, request_data["url"])
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, url: str) -> None:
+        """Drop all entries for the given URL, regardless of their parameters.
+
+        :param url: The request URL
+        :return: None
+        """
+        with self._lock:
+            for key in [k for k, entry in self._entries.items() if entry[2] == url]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Remove all entries and reset the hit and miss counters.
+
+        :return: None
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits.clear()
+            self.misses.clear()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Get the hit and miss counts per endpoint.
+
+        :return: A dictionary mapping endpoint names to their hit and miss counts
+        """
+        with self._lock:
+            return {
+                endpoint: {"hits": self.hits[endpoint], "misses": self.misses[endpoint]}
+                for endpoint in set(self.hits) | set(self.misses)
+            }
@@ -0,0 +1,123 @@
+"""This module contains a local index of submitted analysis payloads."""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from contextlib import closing
+from typing import Dict, Optional
+
+LOGGER = logging.getLogger("SubmissionIndex")
+
+DEFAULT_MAX_AGE = 7 * 24 * 60 * 60
+
+# top-level payload fields added by middlewares that change the analysis outcome
+RELEVANT_PAYLOAD_FIELDS = ("propertyChecking",)
+
+
+class SubmissionIndex:
+    """This index maps the digest of submitted analysis payloads to the UUID of
+    the resulting analysis job.
+
+    It allows the client to skip uploading a payload that has already been
+    analyzed, e.g. when a CI pipeline submits unchanged contracts on every commit.
+    The payload digest covers all submitted data (bytecode, source maps, sources,
+    solc version, analysis mode, etc.) in a normalized form, so that key order and
+    the hex prefix of the bytecode do not matter.
+
+    The index is stored in an SQLite database, which can safely be shared between
+    threads and processes on the same host. Entries older than :code:`max_age`
+    seconds are ignored and eventually pruned.
+    """
+
+    def __init__(self, path: str, max_age: float = DEFAULT_MAX_AGE):
+        """Instantiate a new submission index.
+
+        :param path: The path of the SQLite database file
+        :param max_age: The number of seconds an analysis job may be reused for
+        """
+        LOGGER.debug("Initializing at %s with max_age=%s", path, max_age)
+        self.path = path
+        self.max_age = max_age
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS submissions "
+                "(digest TEXT PRIMARY KEY, uuid TEXT NOT NULL, created REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection to the index database.
+
+        A connection is opened per operation, as SQLite connections can not be shared
+        between threads.
+
+        :return: The database connection
+        """
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def _normalize_bytecode(value):
+        if isinstance(value, str):
+            value = value.lower()
+            return value[2:] if value.startswith("0x") else value
+        return value
+
+    @classmethod
+    def digest(cls, payload: Dict) -> str:
+        """Compute the digest of an assembled analysis submission payload.
+
+        :param payload: The submission request's payload dictionary
+        :return: The hex-encoded SHA-256 digest
+        """
+        data = dict(payload.get("data") or {})
+        for field in ("bytecode", "deployedBytecode"):
+            if field in data:
+                data[field] = cls._normalize_bytecode(data[field])
+        normalized = {
+            "data": data,
+            "options": {
+                field: payload[field] for field in RELEVANT_PAYLOAD_FIELDS if field in payload
+            },
+        }
+        encoded = json.dumps(normalized, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def lookup(self, digest: str) -> Optional[str]:
+        """Get the UUID of a recent analysis job for the given payload digest.
+
+        :param digest: The payload digest
+        :return: The analysis job UUID, or :code:`None` if no recent job is known
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT uuid FROM submissions WHERE digest = ? AND created >= ?",
+                (digest, time.time() - self.max_age),
+            ).fetchone()
+        return row[0] if row else None
+
+    def record(self, digest: str, uuid: str) -> None:
+        """Remember the analysis job submitted for the given payload digest.
+
+        Expired entries are pruned on the way.
+
+        :param digest: The payload digest
+        :param uuid: The analysis job UUID
+        :return: None
+        """
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO submissions (digest, uuid, created) VALUES (?, ?, ?)",
+                (digest, uuid, now),
+            )
+            conn.execute("DELETE FROM submissions WHERE created < ?", (now - self.max_age,))
+
+    def discard(self, digest: str) -> None:
+        """Forget the analysis job for the given payload digest.
+
+        :param digest: The payload digest
+        :return: None
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM submissions WHERE digest = ?", (digest,))
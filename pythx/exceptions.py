@@ -0,0 +1,15 @@
+"""This module contains exceptions raised by pythx on top of the ones defined
+in :code:`mythx_models`."""
+
+from mythx_models.exceptions import MythXAPIError
+
+
+class MythXTimeoutError(MythXAPIError):
+    """An exception denoting that an operation did not complete in time.
+
+    This is raised when waiting for analysis jobs exceeds the given time budget.
+    As it is a subclass of :code:`MythXAPIError`, existing error handling for API
+    failures also covers it.
+    """
+
+    pass
@@ -8,4 +8,5 @@ class.
 from .analysiscache import AnalysisCacheMiddleware
 from .base import BaseMiddleware
 from .group_data import GroupDataMiddleware
+from .source_pruning import PruneReport, SourcePruningMiddleware
 from .toolname import ClientToolNameMiddleware
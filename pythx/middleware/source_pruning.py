@@ -0,0 +1,340 @@
+"""This module contains a middleware to remove data from analysis submissions
+that the analysis does not need."""
+
+import json
+import logging
+import posixpath
+import re
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Set
+
+from pythx.types import RESPONSE_MODELS, REQUEST_MODELS
+from pythx.middleware.base import BaseMiddleware
+
+LOGGER = logging.getLogger("SourcePruningMiddleware")
+
+# matches all forms of import directives and captures the imported path
+IMPORT_PATTERN = re.compile(
+    r"""\bimport\s+(?:[^;"']*?\bfrom\s+)?["']([^"']+)["'][^;]*;"""
+)
+COMMENT_PATTERN = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+SOURCE_MAP_FIELDS = ("sourceMap", "deployedSourceMap")
+AST_FIELDS = ("ast", "legacyAST")
+# AST node fields holding "start:length:fileIndex" source locations
+AST_LOCATION_FIELDS = ("src", "nameLocation", "nameLocations")
+
+
+class PruneReport(NamedTuple):
+    """The effect of pruning a single submission."""
+
+    main_source: str
+    sources_before: int
+    sources_after: int
+    bytes_before: int
+    bytes_after: int
+
+    @property
+    def bytes_saved(self) -> int:
+        """The number of payload bytes the pruning saved."""
+        return self.bytes_before - self.bytes_after
+
+
+def _payload_size(data: Dict) -> int:
+    return len(json.dumps(data, separators=(",", ":")))
+
+
+def _ast_imports(ast: Dict) -> Iterator[str]:
+    """Get the resolved paths of the import directives in a compact or legacy AST.
+
+    :param ast: The source unit's AST
+    :return: An iterator over the imported paths
+    """
+    for node in ast.get("nodes") or ast.get("children") or []:
+        if not isinstance(node, dict):
+            continue
+        if node.get("nodeType", node.get("name")) != "ImportDirective":
+            continue
+        path = node.get("absolutePath") or (node.get("attributes") or {}).get(
+            "absolutePath"
+        )
+        if path:
+            yield path
+
+
+def _source_imports(source: str) -> Iterator[str]:
+    """Get the paths of the import directives in Solidity source code.
+
+    :param source: The source code
+    :return: An iterator over the imported paths, as written in the source
+    """
+    for match in IMPORT_PATTERN.finditer(COMMENT_PATTERN.sub("", source)):
+        yield match.group(1)
+
+
+def _resolve(path: str, importer: str, sources: Dict) -> Optional[str]:
+    """Find the key of an imported file in the submission's sources.
+
+    Relative imports are resolved against the importing file's directory. If no
+    source has the exact path, a source whose path ends with it is accepted, as
+    artifacts often key sources by their absolute path.
+
+    :param path: The imported path
+    :param importer: The path of the importing file
+    :param sources: The submission's sources
+    :return: The key of the imported source, or :code:`None` if it is missing
+    """
+    if path.startswith("."):
+        path = posixpath.normpath(posixpath.join(posixpath.dirname(importer), path))
+    if path in sources:
+        return path
+    candidates = [key for key in sources if key.endswith("/" + path)]
+    return candidates[0] if len(candidates) == 1 else None
+
+
+def import_closure(main_source: str, sources: Dict) -> Optional[Set[str]]:
+    """Get the files the main source imports directly or transitively.
+
+    Imports are taken from a file's AST if it has one, and parsed from its source
+    code otherwise.
+
+    :param main_source: The key of the main source file
+    :param sources: The submission's sources
+    :return: The keys of the main source and all files it depends on, or
+        :code:`None` if an import could not be resolved
+    """
+    closure = set()
+    pending = [main_source]
+    while pending:
+        key = pending.pop()
+        if key in closure:
+            continue
+        closure.add(key)
+        entry = sources[key] if isinstance(sources[key], dict) else {}
+        ast = entry.get("ast") or entry.get("legacyAST")
+        if isinstance(ast, dict):
+            paths = _ast_imports(ast)
+        else:
+            paths = _source_imports(entry.get("source") or "")
+        for path in paths:
+            resolved = _resolve(path, key, sources)
+            if resolved is None:
+                LOGGER.debug("Could not resolve import %s in %s", path, key)
+                return None
+            pending.append(resolved)
+    return closure
+
+
+def _source_map_indices(source_map: str) -> Set[int]:
+    indices = set()
+    for entry in source_map.split(";"):
+        parts = entry.split(":")
+        if len(parts) > 2 and parts[2]:
+            indices.add(int(parts[2]))
+    return indices
+
+
+def _reindex_source_map(source_map: str, mapping: Dict[int, int]) -> str:
+    entries = []
+    for entry in source_map.split(";"):
+        parts = entry.split(":")
+        if len(parts) > 2 and parts[2] and int(parts[2]) in mapping:
+            parts[2] = str(mapping[int(parts[2])])
+        entries.append(":".join(parts))
+    return ";".join(entries)
+
+
+def _reindex_ast(node: Any, mapping: Dict[int, int]) -> Any:
+    """Rewrite the file indices of the source locations in an AST.
+
+    The AST is copied rather than changed in place, as it is shared with the
+    request model.
+
+    :param node: The AST node, or a list of nodes
+    :param mapping: The new file index for each old one
+    :return: A copy of the node with its source locations reindexed
+    """
+    if isinstance(node, list):
+        return [_reindex_ast(child, mapping) for child in node]
+    if not isinstance(node, dict):
+        return node
+    reindexed = {}
+    for key, value in node.items():
+        if key in AST_LOCATION_FIELDS and isinstance(value, str):
+            value = _reindex_source_map(value, mapping)
+        elif key in AST_LOCATION_FIELDS and isinstance(value, list):
+            value = [
+                _reindex_source_map(v, mapping) if isinstance(v, str) else v
+                for v in value
+            ]
+        else:
+            value = _reindex_ast(value, mapping)
+        reindexed[key] = value
+    return reindexed
+
+
+def _squeeze(data: Dict) -> None:
+    """Remove all fields holding whitespace-only strings.
+
+    :param data: The dictionary to clean up in place
+    :return: None
+    """
+    for key in [k for k, v in data.items() if isinstance(v, str) and not v.strip()]:
+        del data[key]
+
+
+class SourcePruningMiddleware(BaseMiddleware):
+    """This middleware shrinks analysis submissions before they are sent.
+
+    Build artifacts often carry every file of a project and its dependencies, even
+    though most of them are unreachable from the contract under analysis. This
+    middleware computes the import closure of the submission's main source and
+    drops all sources outside of it. Files referenced by the source maps are always
+    kept. The source list is shortened accordingly, and the file indices in the
+    source maps and in the source locations of retained ASTs are rewritten to match
+    it.
+
+    Furthermore, ASTs are removed from sources that come with their source code,
+    and fields holding whitespace-only strings are dropped. The source code itself
+    is never modified, as the source maps point into it.
+
+    If the main source is missing from the sources, an import can not be resolved,
+    or the source maps point to compiler-generated sources past the end of the
+    source list, the sources are left untouched to be on the safe side. An optional
+    :code:`on_prune` callback receives a :code:`PruneReport` for every submission.
+
+    This means that only :code:`process_request` carries business logic, while
+    :code:`process_response` returns the input response object right away without
+    touching it.
+    """
+
+    def __init__(
+        self,
+        strip_asts: bool = True,
+        on_prune: Callable[[PruneReport], None] = None,
+    ):
+        LOGGER.debug("Initializing")
+        self.strip_asts = strip_asts
+        self.on_prune = on_prune
+
+    def process_request(self, req: REQUEST_MODELS) -> Dict:
+        """Prune the payload if the request we are making is the submission of a
+        new analysis job.
+
+        Because we execute the middleware on the request data dictionary, we cannot simply
+        match the domain model type here. However, based on the endpoint and the request
+        method we can determine that a new job has been submitted. In any other case, we
+        return the request right away without touching it.
+
+        :param req: The request's data dictionary
+        :return: The request's data dictionary, with the submission pruned
+        """
+        if not (req["method"] == "POST" and req["url"].endswith("/analyses")):
+            return req
+        data = req["payload"].get("data")
+        if not isinstance(data, dict) or not isinstance(data.get("sources"), dict):
+            # submissions without sources, e.g. plain bytecode, have nothing to prune
+            return req
+        # the sources are shared with the request model, so work on copies
+        data = dict(
+            data,
+            sources={
+                key: dict(entry) if isinstance(entry, dict) else entry
+                for key, entry in data["sources"].items()
+            },
+        )
+        req["payload"]["data"] = data
+
+        sources_before = len(data["sources"])
+        bytes_before = _payload_size(data)
+        self._prune_sources(data)
+        for entry in data["sources"].values():
+            if not isinstance(entry, dict):
+                continue
+            if self.strip_asts and (entry.get("source") or "").strip():
+                for field in AST_FIELDS:
+                    entry.pop(field, None)
+            _squeeze(entry)
+        _squeeze(data)
+
+        report = PruneReport(
+            main_source=data.get("mainSource"),
+            sources_before=sources_before,
+            sources_after=len(data["sources"]),
+            bytes_before=bytes_before,
+            bytes_after=_payload_size(data),
+        )
+        LOGGER.debug(
+            "Pruned %s of %s sources, saving %s bytes",
+            report.sources_before - report.sources_after,
+            report.sources_before,
+            report.bytes_saved,
+        )
+        if self.on_prune is not None:
+            self.on_prune(report)
+        return req
+
+    @staticmethod
+    def _prune_sources(data: Dict) -> None:
+        """Drop the sources outside of the main source's import closure.
+
+        :param data: The submission's data dictionary
+        :return: None
+        """
+        sources = data["sources"]
+        main_source = data.get("mainSource")
+        if main_source not in sources:
+            LOGGER.debug("Main source %s is not in sources - skipping", main_source)
+            return
+        keep = import_closure(main_source, sources)
+        if keep is None:
+            return
+
+        source_list: List[str] = data.get("sourceList") or []
+        indices = set()
+        try:
+            for field in SOURCE_MAP_FIELDS:
+                indices |= _source_map_indices(data.get(field) or "")
+        except ValueError:
+            LOGGER.debug("Could not parse the source maps - skipping pruning")
+            return
+        if any(i >= len(source_list) for i in indices):
+            # compiler-generated sources are numbered after the list, which can not
+            # be shortened without renumbering them
+            LOGGER.debug("Source maps point past the source list - skipping pruning")
+            return
+        # files the bytecode maps to are needed to report issues in them
+        keep |= {source_list[i] for i in indices if i >= 0}
+
+        for key in [k for k in sources if k not in keep]:
+            del sources[key]
+        mapping = {}
+        pruned_list = []
+        for old_index, name in enumerate(source_list):
+            if name in keep:
+                mapping[old_index] = len(pruned_list)
+                pruned_list.append(name)
+        if len(pruned_list) == len(source_list):
+            return
+        data["sourceList"] = pruned_list
+        for field in SOURCE_MAP_FIELDS:
+            if data.get(field):
+                data[field] = _reindex_source_map(data[field], mapping)
+        # the source locations in the ASTs refer to files by the same indices
+        for entry in sources.values():
+            if not isinstance(entry, dict):
+                continue
+            for field in AST_FIELDS:
+                if isinstance(entry.get(field), dict):
+                    entry[field] = _reindex_ast(entry[field], mapping)
+
+    def process_response(self, resp: RESPONSE_MODELS) -> RESPONSE_MODELS:
+        """This method is irrelevant for pruning submissions, so we don't do
+        anything here.
+
+        We still have to define it, though. Otherwise when calling the abstract base class'
+        :code:`process_response` method, we will encounter an exception.
+
+        :param resp: The response domain model
+        :return: The very same response domain model
+        """
+        LOGGER.debug("Forwarding the response without any action")
+        return resp
@@ -17,6 +17,8 @@ setup_requirements = ["pytest-runner"]
 
 test_requirements = ["pytest"]
 
+extra_requirements = {"async": ["aiohttp>=3.6,<4"], "fast": ["orjson>=3,<4"]}
+
 setup(
     author="Dominik Muhs",
     author_email="dominik.muhs@consensys.net",
@@ -43,6 +45,7 @@ setup(
     ],
     description="A Python library for the MythX platform",
     install_requires=requirements,
+    extras_require=extra_requirements,
     python_requires=">=3.6,<4",
     license="MIT license",
     long_description=readme + "\n\n" + history,
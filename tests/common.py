@@ -1,7 +1,17 @@
+import asyncio
 import json
 from pathlib import Path
+
+import requests
 from mythx_models.response import DetectedIssuesResponse
 
+from pythx.api.polling import Backoff
+from pythx.api.retry import RetryPolicy
+from pythx.api.transport import BaseAsyncTransport
+
+FAST_BACKOFF = Backoff(initial=0.001, maximum=0.001, jitter=0)
+FAST_RETRIES = RetryPolicy(backoff=FAST_BACKOFF)
+
 
 def get_test_case(path: str, obj=None):
     with open(str(Path(__file__).parent / path)) as f:
@@ -24,3 +34,65 @@ def generate_request_dict(req):
         "headers": req.headers,
         "url": "https://test.com/" + req.endpoint,
     }
+
+
+def run(coro):
+    """Run a coroutine in a new event loop, like :code:`asyncio.run` on Python 3.7+."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        all_tasks = getattr(asyncio, "all_tasks", None) or asyncio.Task.all_tasks
+        pending = [task for task in all_tasks(loop) if not task.done()]
+        for task in pending:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+def get_request_data(url, method="GET", payload=None, params=None):
+    return {
+        "method": method,
+        "headers": {},
+        "url": url,
+        "payload": payload,
+        "params": params or {},
+    }
+
+
+class MockAsyncTransport(BaseAsyncTransport):
+    """Answer every request with the same body, recording the requests."""
+
+    def __init__(self, body='{"resp": "test"}'):
+        self.body = body
+        self.requests = []
+        self.closed = False
+
+    def respond(self, method, url, headers, payload, params):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = self.body.encode()
+        response.request = requests.Request(
+            method=method, url=url, headers=headers, data=payload, params=params
+        ).prepare()
+        return response
+
+    async def request(self, method, url, headers, payload, params, timeout=None):
+        self.requests.append({"method": method, "url": url, "headers": headers})
+        return self.respond(method, url, headers, payload, params)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+    monotonic = time
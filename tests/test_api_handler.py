@@ -1,4 +1,10 @@
+import gzip
+import logging
+import threading
+import time
+
 import pytest
+import requests
 from mythx_models import response as respmodels
 from mythx_models.exceptions import MythXAPIError
 from mythx_models.request import (
@@ -11,7 +17,8 @@ from mythx_models.request import (
     DetectedIssuesRequest,
 )
 
-from pythx.api.handler import DEFAULT_API_URL, APIHandler
+from pythx.api import handler as handler_module
+from pythx.api.handler import DEFAULT_API_URL, APIHandler, print_request, print_response
 from pythx.middleware.base import BaseMiddleware
 
 from .common import get_test_case
@@ -163,7 +170,7 @@ def test_parse_logout_response():
 def test_send_request_successful(requests_mock):
     test_url = "mock://test.com/path"
     requests_mock.get(test_url, text='{"resp":"test"}')
-    resp = APIHandler.send_request(
+    resp = APIHandler().send_request(
         {"method": "GET", "headers": {}, "url": test_url, "payload": {}, "params": {}},
         auth_header={"Authorization": "Bearer foo"},
     )
@@ -179,7 +186,7 @@ def test_send_request_failure(requests_mock):
     test_url = "mock://test.com/path"
     requests_mock.get(test_url, text='{"resp":"test"}', status_code=400)
     with pytest.raises(MythXAPIError):
-        APIHandler.send_request(
+        APIHandler().send_request(
             {
                 "method": "GET",
                 "headers": {},
@@ -201,7 +208,7 @@ def test_send_request_unauthenticated(requests_mock):
     test_url = "mock://test.com/path"
     requests_mock.get("mock://test.com/path", text='{"resp":"test"}', status_code=400)
     with pytest.raises(MythXAPIError):
-        APIHandler.send_request(
+        APIHandler().send_request(
             {
                 "method": "GET",
                 "headers": {},
@@ -216,3 +223,189 @@ def test_send_request_unauthenticated(requests_mock):
     assert h.method == "GET"
     assert h.url == test_url
     assert h.headers.get("Authorization") is None
+
+
+class SlowHandler(APIHandler):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = 0
+        self.release = threading.Event()
+
+    def send_request(self, request_data, auth_header=None, timeout=None):
+        self.calls += 1
+        self.release.wait(5)
+        if request_data["url"].endswith("fail"):
+            raise MythXAPIError("boom")
+        return get_test_case("testdata/analysis-status-response.json")
+
+
+def run_concurrently(handler, request_data, auth_headers):
+    results = [None] * len(auth_headers)
+
+    def worker(i):
+        try:
+            results[i] = handler.execute_request(
+                dict(request_data),
+                respmodels.AnalysisStatusResponse,
+                auth_header=auth_headers[i],
+            )
+        except MythXAPIError as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(auth_headers))]
+    for thread in threads:
+        thread.start()
+    # give all threads the chance to join the in-flight request
+    time.sleep(0.1)
+    handler.release.set()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def status_request(path="test"):
+    return {
+        "method": "GET",
+        "headers": {},
+        "url": "https://api.mythx.io/v1/analyses/" + path,
+        "payload": {},
+        "params": {},
+    }
+
+
+def test_identical_requests_coalesced():
+    handler = SlowHandler()
+    auth = {"Authorization": "Bearer foo"}
+    results = run_concurrently(handler, status_request(), [auth] * 8)
+
+    assert handler.calls == 1
+    assert all(result is results[0] for result in results)
+    assert handler._in_flight == {}
+
+
+def test_different_identities_not_coalesced():
+    handler = SlowHandler()
+    results = run_concurrently(
+        handler,
+        status_request(),
+        [{"Authorization": "Bearer foo"}, {"Authorization": "Bearer bar"}],
+    )
+
+    assert handler.calls == 2
+    assert results[0] is not results[1]
+
+
+def test_coalescing_disabled():
+    handler = SlowHandler(coalesce_requests=False)
+    run_concurrently(handler, status_request(), [None] * 4)
+    assert handler.calls == 4
+
+
+def test_coalesced_failure_shared():
+    handler = SlowHandler()
+    results = run_concurrently(handler, status_request("fail"), [None] * 4)
+
+    assert handler.calls == 1
+    assert all(isinstance(result, MythXAPIError) for result in results)
+    assert handler._in_flight == {}
+
+
+def test_post_not_coalesced():
+    handler = APIHandler()
+    request_data = dict(status_request(), method="POST")
+    assert handler._coalesce_key(request_data, respmodels.AnalysisSubmissionResponse) is None
+
+
+def get_prepared_request(body=None):
+    return requests.Request(
+        method="POST",
+        url="mock://test.com/path",
+        headers={"Authorization": "Bearer secret"},
+        json=body,
+    ).prepare()
+
+
+def test_print_request_redacts_credentials():
+    output = print_request(get_prepared_request({"foo": "bar"}))
+    assert "secret" not in output
+    assert "Authorization: <redacted>" in output
+    assert '{"foo": "bar"}' in output
+
+
+def test_print_request_without_body():
+    assert "POST mock://test.com/path" in print_request(get_prepared_request())
+
+
+def test_print_request_compressed_body():
+    request = get_prepared_request()
+    request.headers["Content-Encoding"] = "gzip"
+    request.body = gzip.compress(b'{"foo": "bar"}')
+    output = print_request(request)
+    assert "<{} bytes, gzip>".format(len(request.body)) in output
+
+
+def test_print_response_truncates_body():
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b"x" * 100
+    output = print_response(response, body_limit=10)
+    assert "x" * 10 + "... (90 more bytes)" in output
+    assert "x" * 11 not in output
+
+
+def test_send_request_skips_tracing_without_debug(requests_mock, monkeypatch, caplog):
+    def fail(*args, **kwargs):
+        raise AssertionError("formatted HTTP trace")
+
+    monkeypatch.setattr(handler_module, "print_request", fail)
+    monkeypatch.setattr(handler_module, "print_response", fail)
+    caplog.set_level(logging.INFO, logger=handler_module.LOGGER.name)
+    requests_mock.get("mock://test.com/path", text='{"resp":"test"}')
+    assert APIHandler().send_request(
+        {"method": "GET", "headers": {}, "url": "mock://test.com/path", "payload": {}, "params": {}}
+    ) == {"resp": "test"}
+
+
+def test_send_request_tracing(requests_mock, caplog):
+    caplog.set_level(logging.DEBUG, logger=handler_module.LOGGER.name)
+    requests_mock.post("mock://test.com/path", text='{"resp":"' + "y" * 100 + '"}')
+    APIHandler(log_body_limit=20).send_request(
+        {
+            "method": "POST",
+            "headers": {},
+            "url": "mock://test.com/path",
+            "payload": {"source": "z" * 100},
+            "params": {},
+        },
+        auth_header={"Authorization": "Bearer secret"},
+    )
+
+    assert "secret" not in caplog.text
+    assert "z" * 21 not in caplog.text
+    assert "y" * 21 not in caplog.text
+    assert "more bytes" in caplog.text
+
+
+def test_stream_request(requests_mock):
+    test_url = "mock://test.com/path"
+    requests_mock.get(test_url, content=b"x" * 10)
+    chunks = list(
+        APIHandler().stream_request(
+            {"method": "GET", "headers": {}, "url": test_url, "payload": {}, "params": {}},
+            auth_header={"Authorization": "Bearer foo"},
+            chunk_size=4,
+        )
+    )
+    assert chunks == [b"xxxx", b"xxxx", b"xx"]
+    assert requests_mock.request_history[0].headers["Authorization"] == "Bearer foo"
+
+
+def test_stream_request_failure(requests_mock):
+    test_url = "mock://test.com/path"
+    requests_mock.get(test_url, text='{"error":"test"}', status_code=400)
+    with pytest.raises(MythXAPIError):
+        list(
+            APIHandler().stream_request(
+                {"method": "GET", "headers": {}, "url": test_url, "payload": {}, "params": {}}
+            )
+        )
@@ -0,0 +1,342 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import jwt
+import mythx_models.response as respmodels
+import pytest
+from dateutil.parser import isoparse
+from dateutil.tz import tzutc
+from mythx_models.exceptions import MythXAPIError
+
+from pythx.api import AsyncAPIHandler, AsyncClient
+from pythx.api.transport import ExecutorTransport
+from pythx.middleware.analysiscache import AnalysisCacheMiddleware
+from pythx.middleware.toolname import ClientToolNameMiddleware
+
+from .common import (
+    FAST_RETRIES,
+    MockAsyncTransport,
+    get_request_data,
+    get_test_case,
+    run,
+)
+
+
+class MockAsyncAPIHandler(AsyncAPIHandler):
+    def __init__(self, resp, middlewares=None):
+        super().__init__(middlewares=middlewares, transport=ExecutorTransport())
+        self.resp = resp
+        self.requests = []
+
+    async def send_request(self, request_data, auth_header=None, timeout=None):
+        self.requests.append(request_data)
+        await asyncio.sleep(0)
+        return self.resp.pop(0)
+
+
+def get_client(resp_data, logged_in=True, access_expired=False, refresh_expired=False):
+    client = AsyncClient(
+        username="0xdeadbeef",
+        password="supersecure",
+        handler=MockAsyncAPIHandler(resp_data),
+    )
+    if logged_in:
+        client.api_key = jwt.encode(
+            {
+                "exp": datetime(1994, 7, 29, tzinfo=tzutc())
+                if access_expired
+                else datetime(9999, 1, 1, tzinfo=tzutc())
+            },
+            "secret",
+        )
+        client.refresh_token = jwt.encode(
+            {
+                "exp": datetime(1994, 7, 29, tzinfo=tzutc())
+                if refresh_expired
+                else datetime(9999, 1, 1, tzinfo=tzutc())
+            },
+            "secret",
+        )
+    return client
+
+
+def test_default_middlewares():
+    client = AsyncClient(transport=MockAsyncTransport("{}"))
+    type_list = [type(x) for x in client.handler.middlewares]
+    assert ClientToolNameMiddleware in type_list
+    assert AnalysisCacheMiddleware in type_list
+
+
+def test_login():
+    test_dict = get_test_case("testdata/auth-login-response.json")
+    client = get_client([test_dict], logged_in=False)
+    resp = run(client.login())
+
+    assert type(resp) == respmodels.AuthLoginResponse
+    assert client.api_key == test_dict["jwtTokens"]["access"]
+    assert client.refresh_token == test_dict["jwtTokens"]["refresh"]
+
+
+def test_analysis_status():
+    test_dict = get_test_case("testdata/analysis-status-response.json")
+    client = get_client([test_dict])
+    resp = run(client.analysis_status(test_dict["uuid"]))
+
+    assert type(resp) == respmodels.AnalysisStatusResponse
+    assert resp.uuid == test_dict["uuid"]
+
+
+def test_analysis_ready():
+    test_dict = get_test_case("testdata/analysis-status-response.json")
+    test_dict["status"] = "Finished"
+    client = get_client([test_dict])
+    assert run(client.analysis_ready(test_dict["uuid"])) is True
+
+
+def test_report():
+    test_dict = get_test_case("testdata/detected-issues-response.json")
+    client = get_client([test_dict])
+    resp = run(client.report("test"))
+
+    assert type(resp) == respmodels.DetectedIssuesResponse
+    assert len(resp.issue_reports) == len(test_dict)
+
+
+def test_analyze_runs_middlewares():
+    test_dict = get_test_case("testdata/analysis-submission-response.json")
+    client = get_client([test_dict])
+    client.handler.middlewares = [ClientToolNameMiddleware(), AnalysisCacheMiddleware()]
+    resp = run(client.analyze(bytecode="0xf00", main_source="test.sol", sources={}))
+
+    assert type(resp) == respmodels.AnalysisSubmissionResponse
+    payload = client.handler.requests[0]["payload"]
+    assert payload["clientToolName"] == "pythx"
+    assert payload["noCacheLookup"] is False
+
+
+def test_concurrent_requests():
+    test_dict = get_test_case("testdata/analysis-status-response.json")
+    client = get_client([dict(test_dict) for _ in range(50)])
+
+    async def poll():
+        return await asyncio.gather(
+            *[client.analysis_status("uuid-{}".format(i)) for i in range(50)]
+        )
+
+    resps = run(poll())
+    assert len(resps) == 50
+    assert len(client.handler.requests) == 50
+
+
+def test_identical_requests_coalesced():
+    test_dict = get_test_case("testdata/analysis-status-response.json")
+    client = get_client([test_dict])
+
+    async def poll():
+        return await asyncio.gather(
+            *[client.analysis_status(test_dict["uuid"]) for _ in range(50)]
+        )
+
+    resps = run(poll())
+    assert len(client.handler.requests) == 1
+    assert all(resp is resps[0] for resp in resps)
+
+
+def test_coalesced_failure_shared():
+    client = get_client([])
+
+    async def fail(request_data, auth_header=None, timeout=None):
+        client.handler.requests.append(request_data)
+        await asyncio.sleep(0)
+        raise MythXAPIError("boom")
+
+    client.handler.send_request = fail
+
+    async def poll():
+        return await asyncio.gather(
+            *[client.analysis_status("test") for _ in range(5)], return_exceptions=True
+        )
+
+    errors = run(poll())
+    assert len(client.handler.requests) == 1
+    assert all(isinstance(e, MythXAPIError) for e in errors)
+
+
+def test_single_refresh_for_concurrent_callers():
+    status_dict = get_test_case("testdata/analysis-status-response.json")
+    refresh_dict = get_test_case("testdata/auth-refresh-response.json")
+    refresh_dict["access"] = jwt.encode(
+        {"exp": datetime(9999, 1, 1, tzinfo=tzutc())}, "secret"
+    ).decode()
+    client = get_client(
+        [refresh_dict] + [dict(status_dict) for _ in range(5)], access_expired=True
+    )
+
+    async def poll():
+        return await asyncio.gather(
+            *[client.analysis_status(status_dict["uuid"]) for _ in range(5)]
+        )
+
+    run(poll())
+    urls = [r["url"] for r in client.handler.requests]
+    assert sum(url.endswith("/auth/refresh") for url in urls) == 1
+
+
+def test_transport_roundtrip():
+    test_dict = get_test_case("testdata/version-response.json")
+    transport = MockAsyncTransport(
+        '{"api": "%s", "maru": "%s", "mythril": "%s", "harvey": "%s", "hash": "%s"}'
+        % tuple(test_dict[k] for k in ("api", "maru", "mythril", "harvey", "hash"))
+    )
+    client = AsyncClient(transport=transport)
+    resp = run(client.version())
+    assert type(resp) == respmodels.VersionResponse
+    assert resp.api == test_dict["api"]
+
+
+def test_context_handler_closes_transport():
+    test_dict = get_test_case("testdata/auth-logout-response.json")
+    client = get_client([test_dict])
+    closed = []
+
+    async def close():
+        closed.append(True)
+
+    client.handler.transport.close = close
+
+    async def session():
+        async with client as c:
+            assert c is client
+
+    run(session())
+    assert closed == [True]
+    assert client.api_key is None
+
+
+class FlakyAsyncTransport(MockAsyncTransport):
+    def __init__(self, body, failures):
+        super().__init__(body)
+        self.failures = failures
+
+    def respond(self, method, url, headers, payload, params):
+        response = super().respond(method, url, headers, payload, params)
+        if len(self.requests) <= self.failures:
+            response.status_code = 503
+        return response
+
+
+def test_handler_retries_without_blocking():
+    transport = FlakyAsyncTransport('{"resp": "test"}', failures=2)
+    handler = AsyncAPIHandler(
+        transport=transport,
+        retry_policy=FAST_RETRIES,
+    )
+    request_data = get_request_data("mock://test.com/path", payload={})
+
+    assert run(handler.send_request(request_data)) == {"resp": "test"}
+    assert len(transport.requests) == 3
+
+
+def get_token(expires_in):
+    token = jwt.encode({"exp": int(time.time()) + expires_in}, "secret")
+    return token.decode() if isinstance(token, bytes) else token
+
+
+def test_handler_does_not_stream():
+    handler = AsyncAPIHandler(transport=MockAsyncTransport("{}"))
+    with pytest.raises(TypeError, match="send_request"):
+        handler.stream_request({})
+
+
+def test_background_refresh():
+    tokens = {"access": get_token(600), "refresh": get_token(3600)}
+    refresh_dict = dict(tokens, jwtTokens=tokens)
+    logout_dict = get_test_case("testdata/auth-logout-response.json")
+    client = AsyncClient(
+        api_key=get_token(2),
+        refresh_token=get_token(3600),
+        handler=MockAsyncAPIHandler([refresh_dict, logout_dict]),
+        refresh_margin=0,
+        background_refresh=True,
+    )
+
+    async def session():
+        async with client:
+            refresher = client._refresher
+            assert refresher.running
+            for _ in range(500):
+                if client.api_key == tokens["access"]:
+                    break
+                await asyncio.sleep(0.01)
+        return refresher
+
+    refresher = run(session())
+    assert client.handler.requests[0]["url"].endswith("/auth/refresh")
+    assert not refresher.running
+    assert client._refresher is None
+
+
+def test_iter_analyses():
+    template = get_test_case("testdata/analysis-list-response.json")["analyses"][0]
+    analyses = [dict(template, uuid="uuid-{}".format(i)) for i in range(12)]
+    pages = [
+        {"analyses": analyses[offset : offset + 5], "total": len(analyses)}
+        for offset in (0, 5, 10)
+    ]
+    client = get_client(pages)
+
+    async def collect():
+        return [analysis.uuid async for analysis in client.iter_analyses(group_id="g1")]
+
+    assert run(collect()) == [a["uuid"] for a in analyses]
+    params = [r["params"] for r in client.handler.requests]
+    assert [p.get("offset", 0) for p in params] == [0, 5, 10]
+    assert all(p["groupId"] == "g1" for p in params)
+
+
+def test_analysis_list_open_date_range():
+    client = get_client([get_test_case("testdata/analysis-list-response.json")])
+    run(client.analysis_list(date_from=datetime(2019, 1, 1)))
+    params = client.handler.requests[0]["params"]
+    assert params["dateFrom"] == "2019-01-01T00:00:00"
+    assert "dateTo" not in params
+
+
+def test_export_analyses():
+    template = get_test_case("testdata/analysis-list-response.json")["analyses"][0]
+    start = datetime(2020, 1, 1, tzinfo=tzutc())
+    analyses = [
+        dict(
+            template,
+            uuid="uuid-{}".format(i),
+            submittedAt=(start + timedelta(hours=i)).isoformat(),
+        )
+        for i in range(30)
+    ]
+    client = get_client([])
+
+    async def send_request(request_data, auth_header=None, timeout=None):
+        params = request_data["params"]
+        date_from = isoparse(params["dateFrom"])
+        date_to = isoparse(params["dateTo"])
+        matches = [
+            a
+            for a in reversed(analyses)
+            if date_from <= isoparse(a["submittedAt"]) <= date_to
+        ]
+        offset = int(params.get("offset", 0))
+        await asyncio.sleep(0)
+        return {"analyses": matches[offset : offset + 5], "total": len(matches)}
+
+    client.handler.send_request = send_request
+
+    async def collect():
+        return [
+            analysis.uuid
+            async for analysis in client.export_analyses(
+                start, start + timedelta(hours=30), max_workers=3, shard_size=8
+            )
+        ]
+
+    assert run(collect()) == ["uuid-{}".format(i) for i in reversed(range(30))]
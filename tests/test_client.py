@@ -1,16 +1,30 @@
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from copy import copy
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import jwt
 import mythx_models.response as respmodels
+import pytest
+from dateutil.parser import isoparse
 from dateutil.tz import tzutc
+from mythx_models.exceptions import MythXAPIError
+from mythx_models.request import AnalysisSubmissionRequest
 from mythx_models.response.analysis import AnalysisStatus
 
 from pythx.api import APIHandler, Client
+from pythx.api.deadline import Deadline
+from pythx.api.polling import Backoff
+from pythx.api.refresher import TokenRefresher
+from pythx.cache import SubmissionIndex
+from pythx.exceptions import MythXTimeoutError
 from pythx.middleware.analysiscache import AnalysisCacheMiddleware
 from pythx.middleware.toolname import ClientToolNameMiddleware
 
-from .common import get_test_case
+from .common import FAST_BACKOFF, get_test_case
 
 
 class MockAPIHandler(APIHandler):
@@ -22,9 +36,33 @@ class MockAPIHandler(APIHandler):
         return self.resp.pop(0)
 
 
-def get_client(resp_data, logged_in=True, access_expired=False, refresh_expired=False):
+class RoutingAPIHandler(APIHandler):
+    """Answer requests by calling the route whose pattern matches the URL."""
+
+    def __init__(self, routes):
+        super().__init__()
+        self.routes = routes
+        self.requests = []
+        self.auth_headers = []
+        self.lock = threading.Lock()
+
+    def send_request(self, request_data, auth_header=None, timeout=None):
+        with self.lock:
+            self.requests.append(request_data)
+            self.auth_headers.append(auth_header)
+        for (method, pattern), route in self.routes.items():
+            if request_data["method"] == method and re.search(pattern, request_data["url"]):
+                return route(request_data)
+        raise AssertionError("Unexpected request: {}".format(request_data["url"]))
+
+
+def get_client(
+    resp_data, logged_in=True, access_expired=False, refresh_expired=False, handler=None
+):
     client = Client(
-        username="0xdeadbeef", password="supersecure", handler=MockAPIHandler(resp_data)
+        username="0xdeadbeef",
+        password="supersecure",
+        handler=handler or MockAPIHandler(resp_data),
     )
     if logged_in:
         # simulate that we're already logged in with tokens
@@ -194,6 +232,109 @@ def test_expired_api_key():
     assert resp.dict(by_alias=True) == list_dict
 
 
+def test_proactive_refresh_before_expiry():
+    refresh_dict = get_test_case("testdata/auth-refresh-response.json")
+    list_dict = get_test_case("testdata/analysis-list-response.json")
+    client = get_client([refresh_dict, list_dict])
+    client.refresh_margin = 60
+    # the access token is still valid, but expires within the refresh margin
+    client.api_key = jwt.encode({"exp": int(time.time()) + 30}, "secret")
+    client.analysis_list()
+
+    assert client.api_key == refresh_dict["jwtTokens"]["access"]
+    assert client.refresh_token == refresh_dict["jwtTokens"]["refresh"]
+
+
+def test_auth_check_does_not_decode_tokens(monkeypatch):
+    client = get_client([])
+    monkeypatch.setattr(jwt, "decode", lambda *args, **kwargs: pytest.fail("decoded token"))
+    for _ in range(10):
+        client.assert_authentication()
+
+
+def get_token(expires_in):
+    token = jwt.encode({"exp": int(time.time()) + expires_in}, "secret")
+    return token.decode() if isinstance(token, bytes) else token
+
+
+def test_concurrent_single_flight_refresh():
+    refreshes = []
+
+    def refresh_route(request_data):
+        refreshes.append(request_data["payload"])
+        time.sleep(0.05)
+        tokens = {"access": get_token(600), "refresh": get_token(3600)}
+        return dict(tokens, jwtTokens=tokens)
+
+    handler = RoutingAPIHandler(
+        {
+            ("POST", "/auth/refresh$"): refresh_route,
+            ("GET", "/analyses/a$"): status_route({"a": ["Finished"]}),
+        }
+    )
+    client = get_client([], handler=handler, access_expired=True)
+    client.handler.coalesce_requests = False
+    with ThreadPoolExecutor(8) as executor:
+        resps = list(executor.map(client.analysis_status, ["a"] * 8))
+
+    assert len(resps) == 8
+    assert len(refreshes) == 1
+    # every request was sent with the new access token
+    assert {h["Authorization"] for h in handler.auth_headers if h} == {
+        "Bearer {}".format(client.api_key)
+    }
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def refresher_routes(refreshes, fail_first=0):
+    def refresh_route(request_data):
+        refreshes.append(request_data["payload"])
+        if len(refreshes) <= fail_first:
+            raise MythXAPIError("Refresh failed")
+        tokens = {"access": get_token(600), "refresh": get_token(3600)}
+        return dict(tokens, jwtTokens=tokens)
+
+    return {
+        ("POST", "/auth/refresh$"): refresh_route,
+        ("POST", "/auth/logout$"): lambda r: {},
+    }
+
+
+def test_background_refresh():
+    refreshes = []
+    client = get_client([], handler=RoutingAPIHandler(refresher_routes(refreshes)))
+    client.refresh_margin = 0
+    client.api_key = get_token(2)
+    old_key = client.api_key
+    with client:
+        assert client.api_key == old_key
+        refresher = client.start_token_refresher(lead=60)
+        assert refresher.running
+        wait_until(lambda: client.api_key != old_key)
+    assert not refresher.running
+    assert len(refreshes) == 1
+
+
+def test_background_refresh_retries_failures():
+    refreshes = []
+    client = get_client([], handler=RoutingAPIHandler(refresher_routes(refreshes, fail_first=2)))
+    client.api_key = get_token(2)
+    old_key = client.api_key
+    refresher = TokenRefresher(client, lead=60, backoff=FAST_BACKOFF)
+    refresher.start()
+    try:
+        wait_until(lambda: client.api_key != old_key)
+    finally:
+        refresher.stop()
+    assert len(refreshes) == 3
+
+
 def assert_analysis(expected, analysis):
     assert analysis.uuid == expected["uuid"]
     assert analysis.api_version == expected["apiVersion"]
@@ -336,22 +477,30 @@ def test_version():
     assert resp.hash == test_dict["hash"]
 
 
-def test_jwt_expiration():
-    test_dict = get_test_case("testdata/auth-login-response.json")
-    assert Client._get_jwt_expiration_ts(test_dict["jwtTokens"]["access"]) == datetime(
-        2019, 2, 24, 16, 31, 19, 28000
-    )
-    assert Client._get_jwt_expiration_ts(test_dict["jwtTokens"]["refresh"]) == datetime(
-        2019, 3, 24, 16, 21, 19, 28000
-    )
-
-
 def test_context_handler():
     test_dict = get_test_case("testdata/auth-logout-response.json")
     with get_client([test_dict]) as c:
         assert c is not None
 
 
+def test_context_handler_closes_transport():
+    test_dict = get_test_case("testdata/auth-logout-response.json")
+    client = get_client([test_dict])
+    closed = []
+    client.handler.transport.close = lambda: closed.append(True)
+    with client:
+        pass
+    assert closed == [True]
+
+
+def test_pool_settings_forwarded():
+    client = Client(pool_connections=3, pool_maxsize=42, keep_alive=False)
+    transport = client.handler.transport
+    assert transport.pool_connections == 3
+    assert transport.pool_maxsize == 42
+    assert transport.keep_alive is False
+
+
 def test_custom_middlewares():
     assert_middlewares(Client())
     assert_middlewares(Client(middlewares=None))
@@ -361,3 +510,639 @@ def test_custom_middlewares():
     assert_middlewares(
         Client(middlewares=[AnalysisCacheMiddleware(), ClientToolNameMiddleware()])
     )
+
+
+def get_submission(name):
+    return AnalysisSubmissionRequest(
+        bytecode="0xf00", main_source=name, sources={name: {"source": "bar"}}
+    )
+
+
+def submission_route(fail=()):
+    test_dict = get_test_case("testdata/analysis-submission-response.json")
+
+    def route(request_data):
+        main_source = request_data["payload"]["data"]["mainSource"]
+        if main_source in fail:
+            raise MythXAPIError("Submission failed")
+        data = copy(test_dict)
+        data["uuid"] = main_source
+        data["groupId"] = request_data["payload"].get("groupId", "")
+        return data
+
+    return route
+
+
+def test_analyze_many():
+    handler = RoutingAPIHandler({("POST", "/analyses$"): submission_route()})
+    client = get_client([], handler=handler)
+    payloads = [get_submission("{}.sol".format(i)) for i in range(20)]
+    resps = list(client.analyze_many(payloads, max_in_flight=5))
+
+    assert all(type(r) == respmodels.AnalysisSubmissionResponse for r in resps)
+    assert sorted(r.uuid for r in resps) == sorted(p.main_source for p in payloads)
+    assert len(handler.requests) == 20
+
+
+def test_analyze_many_bounded():
+    in_flight = []
+    peak = []
+    lock = threading.Lock()
+    route = submission_route()
+
+    def counting_route(request_data):
+        with lock:
+            in_flight.append(1)
+            peak.append(len(in_flight))
+        threading.Event().wait(0.01)
+        with lock:
+            in_flight.pop()
+        return route(request_data)
+
+    handler = RoutingAPIHandler({("POST", "/analyses$"): counting_route})
+    client = get_client([], handler=handler)
+    payloads = (get_submission("{}.sol".format(i)) for i in range(12))
+    assert len(list(client.analyze_many(payloads, max_in_flight=3))) == 12
+    assert max(peak) <= 3
+
+
+def test_analyze_many_failure_callback():
+    handler = RoutingAPIHandler(
+        {("POST", "/analyses$"): submission_route(fail=("1.sol", "3.sol"))}
+    )
+    client = get_client([], handler=handler)
+    failed = []
+    resps = list(
+        client.analyze_many(
+            [get_submission("{}.sol".format(i)) for i in range(5)],
+            on_error=lambda payload, e: failed.append(payload.main_source),
+        )
+    )
+
+    assert sorted(r.uuid for r in resps) == ["0.sol", "2.sol", "4.sol"]
+    assert sorted(failed) == ["1.sol", "3.sol"]
+
+
+def test_analyze_many_failures_raised_after_batch():
+    handler = RoutingAPIHandler(
+        {("POST", "/analyses$"): submission_route(fail=("1.sol",))}
+    )
+    client = get_client([], handler=handler)
+    resps = []
+    with pytest.raises(MythXAPIError) as excinfo:
+        for resp in client.analyze_many([get_submission("{}.sol".format(i)) for i in range(3)]):
+            resps.append(resp)
+
+    assert len(resps) == 2
+    assert "1.sol" in str(excinfo.value)
+
+
+def test_analyze_many_group_id():
+    handler = RoutingAPIHandler({("POST", "/analyses$"): submission_route()})
+    client = get_client([], handler=handler)
+    resps = list(
+        client.analyze_many([get_submission("a.sol"), get_submission("b.sol")], group_id="g1")
+    )
+
+    assert all(r.group_id == "g1" for r in resps)
+
+
+def test_analyze_many_group_name():
+    group_dict = get_test_case("testdata/group-creation-response.json")
+    operation_dict = get_test_case("testdata/group-operation-response.json")
+    sealed = []
+    handler = RoutingAPIHandler(
+        {
+            ("POST", "/analyses$"): submission_route(),
+            ("POST", "/analysis-groups$"): lambda r: group_dict,
+            ("POST", "/analysis-groups/{}$".format(group_dict["id"])): lambda r: sealed.append(
+                r["payload"]
+            )
+            or operation_dict,
+        }
+    )
+    client = get_client([], handler=handler)
+    resps = list(
+        client.analyze_many([get_submission("a.sol"), get_submission("b.sol")], group_name="batch")
+    )
+
+    assert all(r.group_id == group_dict["id"] for r in resps)
+    assert len(sealed) == 1
+    assert handler.requests[-1]["url"].endswith("/analysis-groups/{}".format(group_dict["id"]))
+
+
+def test_analyze_many_group_sealed_when_aborted():
+    group_dict = get_test_case("testdata/group-creation-response.json")
+    operation_dict = get_test_case("testdata/group-operation-response.json")
+    sealed = []
+    handler = RoutingAPIHandler(
+        {
+            ("POST", "/analyses$"): submission_route(fail=("b.sol",)),
+            ("POST", "/analysis-groups$"): lambda r: group_dict,
+            ("POST", "/analysis-groups/{}$".format(group_dict["id"])): lambda r: sealed.append(
+                r["payload"]
+            )
+            or operation_dict,
+        }
+    )
+    client = get_client([], handler=handler)
+    payloads = [get_submission("a.sol"), get_submission("b.sol")]
+
+    # the caller stops consuming the batch early
+    resps = client.analyze_many(payloads, max_in_flight=1, group_name="batch")
+    next(resps)
+    resps.close()
+    assert len(sealed) == 1
+
+    def on_error(payload, e):
+        raise e
+
+    # an error escapes the batch
+    with pytest.raises(MythXAPIError):
+        list(client.analyze_many(payloads, group_name="batch", on_error=on_error))
+    assert len(sealed) == 2
+
+
+def test_analyze_reuses_identical_submission(tmp_path):
+    handler = RoutingAPIHandler(
+        {
+            ("POST", "/analyses$"): submission_route(),
+            ("GET", "/analyses/a.sol$"): status_route({"a.sol": ["Finished"]}),
+        }
+    )
+    client = get_client([], handler=handler)
+    client.submission_index = SubmissionIndex(str(tmp_path / "index.db"))
+
+    first = client.analyze(bytecode="0xf00", main_source="a.sol", sources={"a.sol": {}})
+    second = client.analyze(bytecode="F00", main_source="a.sol", sources={"a.sol": {}})
+
+    assert type(second) == respmodels.AnalysisSubmissionResponse
+    assert first.uuid == second.uuid == "a.sol"
+    assert second.status == AnalysisStatus.FINISHED
+    assert [r["method"] for r in handler.requests] == ["POST", "GET"]
+
+
+def test_analyze_resubmits_failed_analysis(tmp_path):
+    handler = RoutingAPIHandler(
+        {
+            ("POST", "/analyses$"): submission_route(),
+            ("GET", "/analyses/a.sol$"): status_route({"a.sol": ["Error"]}),
+        }
+    )
+    client = get_client([], handler=handler)
+    client.submission_index = SubmissionIndex(str(tmp_path / "index.db"))
+
+    client.analyze(bytecode="0xf00", main_source="a.sol", sources={"a.sol": {}})
+    client.analyze(bytecode="0xf00", main_source="a.sol", sources={"a.sol": {}})
+
+    assert [r["method"] for r in handler.requests] == ["POST", "GET", "POST"]
+
+
+def test_analyze_dedup_skipped_for_groups(tmp_path):
+    handler = RoutingAPIHandler({("POST", "/analyses$"): submission_route()})
+    client = get_client([], handler=handler)
+    client.submission_index = SubmissionIndex(str(tmp_path / "index.db"))
+
+    payloads = [get_submission("a.sol"), get_submission("a.sol")]
+    assert len(list(client.analyze_many(payloads, group_id="g1"))) == 2
+    assert len(handler.requests) == 2
+
+
+def test_analyze_many_dedup(tmp_path):
+    handler = RoutingAPIHandler(
+        {
+            ("POST", "/analyses$"): submission_route(),
+            ("GET", "/analyses/[ab].sol$"): status_route(
+                {"a.sol": ["In Progress"], "b.sol": ["In Progress"]}
+            ),
+        }
+    )
+    client = get_client([], handler=handler)
+    client.submission_index = SubmissionIndex(str(tmp_path / "index.db"))
+
+    list(client.analyze_many([get_submission("a.sol"), get_submission("b.sol")]))
+    resps = list(client.analyze_many([get_submission("a.sol"), get_submission("b.sol")]))
+
+    assert sorted(r.uuid for r in resps) == ["a.sol", "b.sol"]
+    assert sorted(r["method"] for r in handler.requests) == ["GET", "GET", "POST", "POST"]
+
+
+def status_route(states):
+    """Serve the given sequence of states per UUID, repeating the last one."""
+    test_dict = get_test_case("testdata/analysis-status-response.json")
+    polls = {}
+
+    def route(request_data):
+        uuid = request_data["url"].rsplit("/", 1)[-1]
+        polls[uuid] = polls.get(uuid, 0) + 1
+        data = copy(test_dict)
+        data["uuid"] = uuid
+        data["status"] = states[uuid][min(polls[uuid], len(states[uuid])) - 1]
+        return data
+
+    route.polls = polls
+    return route
+
+
+def test_wait_for_analysis():
+    route = status_route({"a": ["Queued", "In Progress", "Finished"]})
+    client = get_client([], handler=RoutingAPIHandler({("GET", "/analyses/a$"): route}))
+    resp = client.wait_for_analysis("a", backoff=FAST_BACKOFF)
+
+    assert type(resp) == respmodels.AnalysisStatusResponse
+    assert resp.status == AnalysisStatus.FINISHED
+    assert route.polls["a"] == 3
+
+
+def test_wait_for_analysis_timeout():
+    route = status_route({"a": ["Queued"]})
+    client = get_client([], handler=RoutingAPIHandler({("GET", "/analyses/a$"): route}))
+    with pytest.raises(MythXTimeoutError):
+        client.wait_for_analysis("a", timeout=0.05, backoff=Backoff(initial=0.01, jitter=0))
+    assert route.polls["a"] >= 2
+
+
+def test_wait_for_analysis_within_deadline():
+    route = status_route({"a": ["Queued"]})
+    client = get_client([], handler=RoutingAPIHandler({("GET", "/analyses/a$"): route}))
+    with client.deadline(0.05):
+        with pytest.raises(MythXTimeoutError, match="after 0.05s"):
+            # the block's deadline is earlier than the timeout
+            client.wait_for_analysis(
+                "a", timeout=60, backoff=Backoff(initial=0.01, jitter=0)
+            )
+    assert route.polls["a"] >= 2
+
+
+def test_wait_for_many_completion_order():
+    route = status_route(
+        {
+            "slow": ["Queued", "In Progress", "In Progress", "In Progress", "Finished"],
+            "fast": ["In Progress", "Error"],
+            "done": ["Finished"],
+        }
+    )
+    client = get_client([], handler=RoutingAPIHandler({("GET", "/analyses/[^/]+$"): route}))
+    resps = list(client.wait_for_many(["slow", "fast", "done"], backoff=FAST_BACKOFF))
+
+    assert [r.uuid for r in resps] == ["done", "fast", "slow"]
+    assert route.polls == {"slow": 5, "fast": 2, "done": 1}
+
+
+def test_wait_for_many_polls_each_job_once():
+    route = status_route({"a": ["Queued", "Finished"], "b": ["Finished"]})
+    client = get_client([], handler=RoutingAPIHandler({("GET", "/analyses/[^/]+$"): route}))
+    resps = list(client.wait_for_many(["a", "b", "a", "b"], backoff=FAST_BACKOFF))
+
+    assert [r.uuid for r in resps] == ["b", "a"]
+    assert route.polls == {"a": 2, "b": 1}
+
+
+def test_wait_for_many_soonest_due_first():
+    route = status_route({"a": ["Queued", "Finished"], "b": ["Queued", "Finished"]})
+    client = get_client([], handler=RoutingAPIHandler({("GET", "/analyses/[^/]+$"): route}))
+    resps = list(
+        client.wait_for_many(["a", "b"], backoff=Backoff(initial=0.01, factor=1, jitter=0))
+    )
+
+    polled = [r["url"].rsplit("/", 1)[-1] for r in client.handler.requests]
+    assert polled == ["a", "b", "a", "b"]
+    assert [r.uuid for r in resps] == ["a", "b"]
+
+
+def test_backoff_curve():
+    backoff = Backoff(initial=1, factor=2, maximum=5, jitter=0)
+    assert [backoff.delay(i) for i in range(5)] == [1, 2, 4, 5, 5]
+    jittered = Backoff(initial=10, jitter=0.5)
+    assert all(5 <= jittered.delay(0) <= 15 for _ in range(50))
+
+
+def test_backoff_mode_hints():
+    assert Backoff.for_mode("quick").initial < Backoff.for_mode("standard").initial
+    assert Backoff.for_mode("standard").initial < Backoff.for_mode("deep").initial
+    assert Backoff.for_mode("unknown").initial == Backoff().initial
+
+
+class GroupServer:
+    """Simulate a group whose jobs finish one after another, one every few group
+    polls."""
+
+    def __init__(self, uuids, sealed=True, every=1):
+        self.uuids = uuids
+        self.sealed = sealed
+        self.every = every
+        self.finished = []
+        self.group_polls = 0
+        self.status_polls = []
+
+    def group_route(self, request_data):
+        self.group_polls += 1
+        done = max(0, (self.group_polls - 1) // self.every)
+        self.finished = self.uuids[:done]
+        data = get_test_case("testdata/group-status-response.json")
+        data["status"] = "sealed" if self.sealed else "opened"
+        data["numAnalyses"] = {
+            "total": len(self.uuids),
+            "queued": 0,
+            "running": len(self.uuids) - len(self.finished),
+            "failed": 0,
+            "finished": len(self.finished),
+        }
+        return data
+
+    def status_route(self, request_data):
+        uuid = request_data["url"].rsplit("/", 1)[-1]
+        self.status_polls.append(uuid)
+        data = get_test_case("testdata/analysis-status-response.json")
+        data["uuid"] = uuid
+        data["status"] = "Finished" if uuid in self.finished else "In Progress"
+        return data
+
+    def list_route(self, request_data):
+        data = get_test_case("testdata/analysis-list-response.json")
+        template = data["analyses"][0]
+        offset = int(request_data["params"].get("offset", 0))
+        page = self.uuids[offset:offset + 2]
+        data["analyses"] = [dict(template, uuid=uuid) for uuid in page]
+        data["total"] = len(self.uuids)
+        return data
+
+    def handler(self):
+        return RoutingAPIHandler(
+            {
+                ("GET", "/analysis-groups/[^/]+$"): self.group_route,
+                ("GET", "/analyses/[^/]+$"): self.status_route,
+                ("GET", "/analyses$"): self.list_route,
+            }
+        )
+
+
+def test_wait_for_group():
+    server = GroupServer(["a", "b", "c"])
+    client = get_client([], handler=server.handler())
+    resps = list(
+        client.wait_for_group("test", uuids=["a", "b", "c"], backoff=FAST_BACKOFF)
+    )
+
+    assert [r.uuid for r in resps] == ["a", "b", "c"]
+    assert server.group_polls == 4
+    # the first round had no terminal jobs, so no status requests were made
+    assert server.status_polls == ["a", "b", "c"]
+
+
+def test_wait_for_group_idle_rounds_are_cheap():
+    server = GroupServer(["a", "b"])
+    client = get_client([], handler=server.handler())
+    # two idle rounds before anything finishes
+    server.group_polls = -2
+    list(client.wait_for_group("test", uuids=["a", "b"], backoff=FAST_BACKOFF))
+
+    assert server.status_polls == ["a", "b"]
+
+
+def test_wait_for_group_ignores_other_jobs():
+    # another job in the group finishes long before the one we wait for
+    server = GroupServer(["other", "a"], every=3)
+    client = get_client([], handler=server.handler())
+    resps = list(client.wait_for_group("test", uuids=["a"], backoff=FAST_BACKOFF))
+
+    assert [r.uuid for r in resps] == ["a"]
+    assert server.group_polls == 7
+    assert server.status_polls == ["a", "a"]
+
+
+def test_wait_for_group_discovers_uuids():
+    server = GroupServer(["a", "b", "c"])
+    client = get_client([], handler=server.handler())
+    resps = list(client.wait_for_group("test", backoff=FAST_BACKOFF))
+
+    assert sorted(r.uuid for r in resps) == ["a", "b", "c"]
+    list_requests = [r for r in client.handler.requests if r["url"].endswith("/analyses")]
+    assert len(list_requests) == 2
+
+
+def test_wait_for_group_timeout():
+    server = GroupServer(["a"])
+    server.group_polls = -1000
+    client = get_client([], handler=server.handler())
+    with pytest.raises(MythXTimeoutError):
+        list(
+            client.wait_for_group(
+                "test", uuids=["a"], timeout=0.05, backoff=Backoff(initial=0.01, jitter=0)
+            )
+        )
+    assert server.status_polls == []
+
+
+def test_wait_for_group_seal():
+    server = GroupServer(["a"])
+    operation_dict = get_test_case("testdata/group-operation-response.json")
+    handler = server.handler()
+    handler.routes[("POST", "/analysis-groups/[^/]+$")] = lambda r: operation_dict
+    client = get_client([], handler=handler)
+    list(client.wait_for_group("test", uuids=["a"], seal=True, backoff=FAST_BACKOFF))
+
+    assert handler.requests[0]["method"] == "POST"
+
+
+def list_route(key, entries, page_size=5, id_field="uuid"):
+    """Serve the entries page by page, honouring the offset parameter."""
+
+    def route(request_data):
+        route.params.append(dict(request_data["params"]))
+        offset = int(request_data["params"].get("offset", 0))
+        return {key: entries[offset : offset + page_size], "total": len(entries)}
+
+    route.params = []
+    return route
+
+
+def get_analyses(count):
+    template = get_test_case("testdata/analysis-list-response.json")["analyses"][0]
+    return [dict(template, uuid="uuid-{}".format(i)) for i in range(count)]
+
+
+def test_iter_analyses():
+    route = list_route("analyses", get_analyses(23))
+    client = get_client([], handler=RoutingAPIHandler({("GET", "/analyses$"): route}))
+    analyses = list(client.iter_analyses(group_id="g1", main_source="a.sol"))
+
+    assert [a.uuid for a in analyses] == ["uuid-{}".format(i) for i in range(23)]
+    assert [p["offset"] for p in route.params] == [0, 5, 10, 15, 20]
+    assert all(p["groupId"] == "g1" and p["mainSource"] == "a.sol" for p in route.params)
+
+
+def test_iter_analyses_lazy():
+    route = list_route("analyses", get_analyses(50))
+    client = get_client([], handler=RoutingAPIHandler({("GET", "/analyses$"): route}))
+    iterator = client.iter_analyses()
+    assert next(iterator).uuid == "uuid-0"
+    # the first page and the prefetched second one
+    wait_until(lambda: len(route.params) == 2)
+    time.sleep(0.05)
+    assert len(route.params) == 2
+    iterator.close()
+
+
+def test_iter_analyses_prefetch_within_deadline():
+    route = list_route("analyses", get_analyses(12))
+
+    def slow_route(request_data):
+        if request_data["params"].get("offset"):
+            time.sleep(0.1)
+            # the prefetching worker must see the caller's deadline
+            Deadline.current().check("listing analyses")
+        return route(request_data)
+
+    client = get_client([], handler=RoutingAPIHandler({("GET", "/analyses$"): slow_route}))
+    with client.deadline(0.05):
+        with pytest.raises(MythXTimeoutError):
+            list(client.iter_analyses())
+    assert len(route.params) == 1
+
+
+def test_iter_analyses_without_prefetch():
+    route = list_route("analyses", get_analyses(12))
+    client = get_client([], handler=RoutingAPIHandler({("GET", "/analyses$"): route}))
+    iterator = client.iter_analyses(prefetch=False)
+    assert len([next(iterator) for _ in range(5)]) == 5
+    assert len(route.params) == 1
+    assert len(list(iterator)) == 7
+
+
+def test_iter_analyses_skips_shifted_entries():
+    entries = get_analyses(10)
+    route = list_route("analyses", entries)
+
+    def shifting_route(request_data):
+        resp = route(request_data)
+        # a new analysis is submitted after the first page has been served
+        if len(route.params) == 1:
+            entries.insert(0, dict(entries[0], uuid="new"))
+        return resp
+
+    client = get_client([], handler=RoutingAPIHandler({("GET", "/analyses$"): shifting_route}))
+    uuids = [a.uuid for a in client.iter_analyses(prefetch=False)]
+    assert uuids == ["uuid-{}".format(i) for i in range(10)]
+
+
+def test_analysis_list_date_range():
+    route = list_route("analyses", [])
+    client = get_client([], handler=RoutingAPIHandler({("GET", "/analyses$"): route}))
+    client.analysis_list(date_from=datetime(2019, 1, 1), date_to=datetime(2019, 2, 1))
+    assert route.params[0]["dateFrom"] == "2019-01-01T00:00:00"
+    assert route.params[0]["dateTo"] == "2019-02-01T00:00:00"
+
+
+def test_analysis_list_open_date_range():
+    route = list_route("analyses", [])
+    client = get_client([], handler=RoutingAPIHandler({("GET", "/analyses$"): route}))
+    client.analysis_list(date_from=datetime(2019, 1, 1))
+    assert route.params[0]["dateFrom"] == "2019-01-01T00:00:00"
+    assert "dateTo" not in route.params[0]
+
+
+def test_iter_groups():
+    template = get_test_case("testdata/group-list-response.json")["groups"][0]
+    groups = [dict(template, id="group-{}".format(i)) for i in range(7)]
+    route = list_route("groups", groups)
+    client = get_client([], handler=RoutingAPIHandler({("GET", "/analysis-groups$"): route}))
+    assert [g.identifier for g in client.iter_groups(group_name="test")] == [
+        "group-{}".format(i) for i in range(7)
+    ]
+    assert route.params[0]["groupName"] == "test"
+
+
+def test_iter_projects():
+    projects = [
+        {
+            "id": "p{}".format(i),
+            "name": "test",
+            "created": "2021-01-01T00:00:00Z",
+            "modified": "2021-01-01T00:00:00Z",
+            "group_count": 0,
+        }
+        for i in range(4)
+    ]
+    route = list_route("projects", projects, page_size=3)
+    client = get_client([], handler=RoutingAPIHandler({("GET", "/projects$"): route}))
+    assert [p.id for p in client.iter_projects(page_size=3)] == ["p0", "p1", "p2", "p3"]
+    assert route.params[0]["limit"] == 3
+
+
+def history_route(analyses, page_size=5):
+    """Serve the analyses within the requested date range, newest first."""
+
+    def route(request_data):
+        params = request_data["params"]
+        route.params.append(dict(params))
+        date_from = isoparse(params["dateFrom"])
+        date_to = isoparse(params["dateTo"])
+        matches = [
+            a
+            for a in analyses
+            if date_from <= isoparse(a["submittedAt"]) <= date_to
+        ]
+        matches.sort(key=lambda a: a["submittedAt"], reverse=True)
+        offset = int(params.get("offset", 0))
+        return {"analyses": matches[offset : offset + page_size], "total": len(matches)}
+
+    route.params = []
+    return route
+
+
+def test_export_analyses():
+    template = get_analyses(1)[0]
+    start = datetime(2020, 1, 1, tzinfo=tzutc())
+    # a sparse year with a dense burst in one day and one analysis on a shard boundary
+    timestamps = [start + timedelta(days=7 * i) for i in range(52)]
+    timestamps += [start + timedelta(days=100, minutes=i) for i in range(40)]
+    timestamps.append(start + timedelta(days=180))
+    analyses = [
+        dict(template, uuid="uuid-{}".format(i), submittedAt=ts.isoformat())
+        for i, ts in enumerate(timestamps)
+    ]
+    route = history_route(analyses)
+    client = get_client([], handler=RoutingAPIHandler({("GET", "/analyses$"): route}))
+
+    exported = list(
+        client.export_analyses(
+            start, start + timedelta(days=360), max_workers=2, shard_size=10
+        )
+    )
+
+    expected = sorted(analyses, key=lambda a: a["submittedAt"], reverse=True)
+    assert [a.uuid for a in exported] == [a["uuid"] for a in expected]
+    # dense shards are split instead of being paged through deeply
+    assert max(int(p.get("offset", 0)) for p in route.params) < 10
+
+
+def test_export_analyses_stops_early():
+    start = datetime(2020, 1, 1, tzinfo=tzutc())
+    template = get_analyses(1)[0]
+    analyses = [
+        dict(
+            template,
+            uuid="uuid-{}".format(i),
+            submittedAt=(start + timedelta(days=i)).isoformat(),
+        )
+        for i in range(100)
+    ]
+    route = history_route(analyses)
+    client = get_client([], handler=RoutingAPIHandler({("GET", "/analyses$"): route}))
+    exported = client.export_analyses(start, start + timedelta(days=100), shard_size=10)
+    assert next(exported).uuid == "uuid-99"
+    exported.close()
+
+
+def test_iter_issues(requests_mock):
+    reports = get_test_case("testdata/detected-issues-response.json")
+    requests_mock.get(
+        "https://test.com/v1/analyses/test/issues", text=json.dumps(reports)
+    )
+    client = get_client([], handler=APIHandler(api_url="https://test.com"))
+    issues = list(client.iter_issues("test", chunk_size=16))
+
+    assert [i.uuid for i in issues] == [i["uuid"] for i in reports[0]["issues"]]
+    assert issues == client.report("test").issue_reports[0].issues
+    assert requests_mock.request_history[0].headers["Authorization"].startswith("Bearer ")
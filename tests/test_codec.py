@@ -0,0 +1,66 @@
+import json
+import sys
+
+import pytest
+from mythx_models.exceptions import MythXAPIError
+
+from pythx.api.codec import OrjsonCodec, StdlibCodec, default_codec
+from pythx.api.handler import APIHandler
+
+from .common import get_test_case
+
+CODECS = [StdlibCodec]
+try:
+    import orjson  # noqa: F401
+
+    CODECS.append(OrjsonCodec)
+except ImportError:
+    pass
+
+
+@pytest.mark.parametrize("codec_cls", CODECS)
+def test_roundtrip(codec_cls):
+    codec = codec_cls()
+    data = get_test_case("testdata/detected-issues-response.json")
+    encoded = codec.encode(data)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == data
+    assert codec.decode(encoded) == data
+
+
+@pytest.mark.parametrize("codec_cls", CODECS)
+def test_decode_error(codec_cls):
+    with pytest.raises(json.JSONDecodeError):
+        codec_cls().decode(b"{invalid")
+
+
+def test_default_codec_fallback(monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    assert isinstance(default_codec(), StdlibCodec)
+
+
+def test_handler_uses_codec(requests_mock):
+    test_url = "mock://test.com/path"
+    requests_mock.post(test_url, text='{"resp": "test"}')
+    resp = APIHandler(codec=StdlibCodec()).send_request(
+        {
+            "method": "POST",
+            "headers": {},
+            "url": test_url,
+            "payload": {"sources": {"a.sol": {"source": "contract A {}"}}},
+            "params": {},
+        }
+    )
+    assert resp == {"resp": "test"}
+    request = requests_mock.request_history[0]
+    assert request.body == b'{"sources":{"a.sol":{"source":"contract A {}"}}}'
+    assert request.headers["Content-Type"] == "application/json"
+
+
+def test_handler_decode_error(requests_mock):
+    test_url = "mock://test.com/path"
+    requests_mock.get(test_url, text="not json")
+    with pytest.raises(MythXAPIError):
+        APIHandler().send_request(
+            {"method": "GET", "headers": {}, "url": test_url, "payload": {}, "params": {}}
+        )
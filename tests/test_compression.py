@@ -0,0 +1,98 @@
+import gzip
+import json
+import zlib
+
+import pytest
+
+from pythx.api import AsyncAPIHandler
+from pythx.api.compression import CompressionPolicy
+from pythx.api.handler import APIHandler
+
+from .common import MockAsyncTransport, get_request_data, run
+
+TEST_URL = "mock://test.com/path"
+BODY = json.dumps({"sources": {"a.sol": {"source": "contract A {}" * 100}}}).encode()
+
+
+def test_compress_small_body():
+    assert CompressionPolicy(threshold=len(BODY) + 1).compress(BODY) == (BODY, None)
+
+
+@pytest.mark.parametrize(
+    "encoding,decompress", [("gzip", gzip.decompress), ("deflate", zlib.decompress)]
+)
+def test_compress_large_body(encoding, decompress):
+    body, used = CompressionPolicy(threshold=10, encoding=encoding).compress(BODY)
+    assert used == encoding
+    assert len(body) < len(BODY)
+    assert decompress(body) == BODY
+
+
+def test_compress_incompressible_body():
+    body = bytes(range(256))
+    assert CompressionPolicy(threshold=10).compress(body) == (body, None)
+
+
+def test_unknown_encoding():
+    with pytest.raises(ValueError):
+        CompressionPolicy(encoding="br")
+
+
+def test_handler_compresses_body(requests_mock):
+    requests_mock.post(TEST_URL, text='{"resp": "test"}')
+    stats = []
+    handler = APIHandler(
+        compression=CompressionPolicy(threshold=10, on_transfer=stats.append)
+    )
+
+    assert handler.send_request(get_request_data(TEST_URL, "POST", json.loads(BODY))) == {"resp": "test"}
+    request = requests_mock.request_history[0]
+    assert request.headers["Content-Encoding"] == "gzip"
+    assert request.headers["Accept-Encoding"] == "gzip, deflate"
+    assert json.loads(gzip.decompress(request.body)) == json.loads(BODY)
+
+    assert len(stats) == 1
+    assert stats[0].request_bytes > stats[0].request_wire_bytes == len(request.body)
+    assert stats[0].request_encoding == "gzip"
+    assert stats[0].response_bytes == len(b'{"resp": "test"}')
+
+
+def test_handler_falls_back_when_rejected(requests_mock):
+    requests_mock.post(
+        TEST_URL,
+        [{"status_code": 415, "text": "unsupported"}, {"text": '{"resp": "test"}'}],
+    )
+    policy = CompressionPolicy(threshold=10)
+    handler = APIHandler(compression=policy)
+
+    assert handler.send_request(get_request_data(TEST_URL, "POST", json.loads(BODY))) == {"resp": "test"}
+    first, second = requests_mock.request_history
+    assert first.headers["Content-Encoding"] == "gzip"
+    assert "Content-Encoding" not in second.headers
+    assert json.loads(second.body) == json.loads(BODY)
+    assert policy.enabled is False
+
+
+def test_handler_advertises_encodings_without_policy(requests_mock):
+    requests_mock.get(TEST_URL, text="{}")
+    APIHandler().send_request(get_request_data(TEST_URL, payload=json.loads(BODY)))
+    assert requests_mock.request_history[0].headers["Accept-Encoding"] == "gzip, deflate"
+
+
+class RejectingAsyncTransport(MockAsyncTransport):
+    def respond(self, method, url, headers, payload, params):
+        response = super().respond(method, url, headers, payload, params)
+        if "Content-Encoding" in headers:
+            response.status_code = 415
+        return response
+
+
+def test_async_handler_falls_back_when_rejected():
+    transport = RejectingAsyncTransport()
+    handler = AsyncAPIHandler(
+        transport=transport, compression=CompressionPolicy(threshold=10)
+    )
+    request_data = get_request_data(TEST_URL, "POST", json.loads(BODY))
+    assert run(handler.send_request(request_data)) == {"resp": "test"}
+    encodings = [r["headers"].get("Content-Encoding") for r in transport.requests]
+    assert encodings == ["gzip", None]
@@ -0,0 +1,319 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+import requests
+from mythx_models.response import VersionResponse
+
+from pythx.api import deadline as deadline_module
+from pythx.api.async_handler import AsyncAPIHandler
+from pythx.api.deadline import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    Deadline,
+    as_timeout_pair,
+)
+from pythx.api.handler import APIHandler
+from pythx.api.polling import Backoff
+from pythx.api.retry import RetryPolicy
+from pythx.api.transport import BaseAsyncTransport, BaseTransport
+from pythx.exceptions import MythXTimeoutError
+
+from .common import MockAsyncTransport, get_request_data, get_test_case, run
+
+TEST_URL = "https://test.com/v1/version"
+
+
+class StallingTransport(BaseTransport):
+    def __init__(self):
+        self.timeouts = []
+
+    def request(
+        self, method, url, headers, payload, params, stream=False, timeout=None
+    ):
+        self.timeouts.append(timeout)
+        time.sleep(timeout[1])
+        raise requests.exceptions.ReadTimeout()
+
+
+class StallingAsyncTransport(BaseAsyncTransport):
+    def __init__(self):
+        self.timeouts = []
+
+    async def request(self, method, url, headers, payload, params, timeout=None):
+        self.timeouts.append(timeout)
+        await asyncio.sleep(timeout[1])
+        raise requests.exceptions.ReadTimeout()
+
+
+@pytest.mark.parametrize(
+    "timeout,expected", [(5, (5, 5)), ((1, 2), (1, 2)), (None, (None, None))]
+)
+def test_as_timeout_pair(timeout, expected):
+    assert as_timeout_pair(timeout) == expected
+
+
+def test_deadline_remaining():
+    deadline = Deadline(10)
+    assert 9 < deadline.remaining() <= 10
+    assert not deadline.expired
+    connect_timeout, read_timeout = deadline.cap((3, 60))
+    assert connect_timeout == 3
+    assert 9 < read_timeout <= 10
+    assert Deadline(0).expired
+    assert Deadline(-1).remaining() == 0
+
+
+def test_deadline_check():
+    Deadline(10).check("testing")
+    with pytest.raises(MythXTimeoutError, match="Deadline of 0s exceeded testing"):
+        Deadline(0).check("testing")
+
+
+def test_deadline_context():
+    assert Deadline.current() is None
+    with Deadline(10) as outer:
+        assert Deadline.current() is outer
+        with Deadline(100) as inner:
+            # an inner block can not extend the outer budget
+            assert Deadline.current() is inner
+            assert inner.expires_at == outer.expires_at
+        assert Deadline.current() is outer
+    assert Deadline.current() is None
+
+
+def test_deadline_within():
+    assert Deadline.within() is None
+    assert Deadline.within(5).timeout == 5
+    with Deadline(10) as outer:
+        assert Deadline.within() is outer
+        assert Deadline.within(5).timeout == 5
+        assert Deadline.within(100) is outer
+
+
+def test_default_timeouts(requests_mock):
+    requests_mock.get(TEST_URL, text='{"resp": "test"}')
+    APIHandler().send_request(get_request_data(TEST_URL))
+    assert requests_mock.request_history[0].timeout == (
+        DEFAULT_CONNECT_TIMEOUT,
+        DEFAULT_READ_TIMEOUT,
+    )
+
+
+def test_custom_timeouts(requests_mock):
+    requests_mock.get(TEST_URL, text='{"resp": "test"}')
+    handler = APIHandler(connect_timeout=1, read_timeout=2)
+    handler.send_request(get_request_data(TEST_URL))
+    handler.send_request(get_request_data(TEST_URL), timeout=5)
+    handler.send_request(get_request_data(TEST_URL), timeout=(3, 4))
+    assert [r.timeout for r in requests_mock.request_history] == [
+        (1, 2),
+        (5, 5),
+        (3, 4),
+    ]
+
+
+def test_deadline_caps_timeouts(requests_mock):
+    requests_mock.get(TEST_URL, text='{"resp": "test"}')
+    with Deadline(5):
+        APIHandler().send_request(get_request_data(TEST_URL))
+    connect_timeout, read_timeout = requests_mock.request_history[0].timeout
+    assert 0 < connect_timeout <= 5
+    assert 0 < read_timeout <= 5
+
+
+def test_expired_deadline_not_sent(requests_mock):
+    requests_mock.get(TEST_URL, text='{"resp": "test"}')
+    with Deadline(0):
+        with pytest.raises(MythXTimeoutError):
+            APIHandler().send_request(get_request_data(TEST_URL))
+    assert requests_mock.call_count == 0
+
+
+def test_deadline_stops_retries(requests_mock):
+    requests_mock.get(TEST_URL, status_code=503, text="unavailable")
+    policy = RetryPolicy(backoff=Backoff(initial=10, jitter=0))
+    handler = APIHandler(retry_policy=policy)
+    with Deadline(5):
+        with pytest.raises(MythXTimeoutError):
+            handler.send_request(get_request_data(TEST_URL))
+    assert requests_mock.call_count == 1
+
+
+class UnavailableTransport(BaseTransport):
+    def __init__(self):
+        self.closed = []
+
+    def request(
+        self, method, url, headers, payload, params, stream=False, timeout=None
+    ):
+        response = requests.Response()
+        response.status_code = 503
+        response.close = lambda: self.closed.append(url)
+        return response
+
+
+def test_deadline_closes_discarded_response():
+    transport = UnavailableTransport()
+    policy = RetryPolicy(backoff=Backoff(initial=10, jitter=0))
+    handler = APIHandler(transport=transport, retry_policy=policy)
+    with Deadline(5):
+        with pytest.raises(MythXTimeoutError):
+            handler.send_request(get_request_data(TEST_URL))
+    assert transport.closed == [TEST_URL]
+
+
+def test_stalled_request_times_out():
+    transport = StallingTransport()
+    handler = APIHandler(transport=transport)
+    start = time.monotonic()
+    with Deadline(0.1):
+        with pytest.raises(MythXTimeoutError) as exc_info:
+            handler.send_request(get_request_data(TEST_URL))
+    assert time.monotonic() - start < 1
+    assert len(transport.timeouts) == 1
+    assert isinstance(exc_info.value.__cause__, requests.exceptions.ReadTimeout)
+
+
+def test_async_stalled_request_times_out():
+    transport = StallingAsyncTransport()
+    handler = AsyncAPIHandler(transport=transport)
+
+    async def send():
+        with Deadline(0.1):
+            await handler.send_request(get_request_data(TEST_URL))
+
+    with pytest.raises(MythXTimeoutError):
+        run(send())
+    assert transport.timeouts[0][1] <= 0.1
+
+
+def test_async_deadline_requires_task_contexts(monkeypatch):
+    monkeypatch.setattr(deadline_module, "ASYNC_DEADLINES", False)
+
+    async def send():
+        with Deadline(10):
+            pass
+
+    with pytest.raises(RuntimeError, match="3.7"):
+        run(send())
+    # deadlines outside of an event loop are not affected
+    with Deadline(10):
+        pass
+
+
+class BlockingTransport(BaseTransport):
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+
+    def request(
+        self, method, url, headers, payload, params, stream=False, timeout=None
+    ):
+        self.calls += 1
+        self.release.wait(5)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(
+            get_test_case("testdata/version-response.json")
+        ).encode()
+        return response
+
+
+def test_coalesced_wait_bounded_by_deadline():
+    transport = BlockingTransport()
+    handler = APIHandler(transport=transport)
+    leader = threading.Thread(
+        target=handler.execute_request, args=(get_request_data(TEST_URL), VersionResponse)
+    )
+    leader.start()
+    while not handler._in_flight:
+        time.sleep(0.001)
+
+    start = time.monotonic()
+    with Deadline(0.05):
+        with pytest.raises(MythXTimeoutError, match="in-flight"):
+            handler.execute_request(get_request_data(TEST_URL), VersionResponse)
+    assert time.monotonic() - start < 1
+    transport.release.set()
+    leader.join()
+    assert transport.calls == 1
+
+
+class OnceStallingTransport(BaseTransport):
+    def __init__(self):
+        self.calls = 0
+
+    def request(
+        self, method, url, headers, payload, params, stream=False, timeout=None
+    ):
+        self.calls += 1
+        if self.calls == 1:
+            time.sleep(timeout[1])
+            raise requests.exceptions.ReadTimeout()
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(
+            get_test_case("testdata/version-response.json")
+        ).encode()
+        return response
+
+
+def test_coalesced_request_resent_after_leader_deadline():
+    transport = OnceStallingTransport()
+    handler = APIHandler(transport=transport)
+    errors = []
+
+    def lead():
+        with Deadline(0.05):
+            try:
+                handler.execute_request(get_request_data(TEST_URL), VersionResponse)
+            except MythXTimeoutError as e:
+                errors.append(e)
+
+    leader = threading.Thread(target=lead)
+    leader.start()
+    while not handler._in_flight:
+        time.sleep(0.001)
+
+    # the leader's deadline is not the follower's
+    resp = handler.execute_request(get_request_data(TEST_URL), VersionResponse)
+    leader.join()
+    assert isinstance(resp, VersionResponse)
+    assert len(errors) == 1
+    assert transport.calls == 2
+
+
+class SlowAsyncTransport(MockAsyncTransport):
+    async def request(self, method, url, headers, payload, params, timeout=None):
+        await asyncio.sleep(0.05)
+        return await super().request(method, url, headers, payload, params, timeout)
+
+
+def test_async_cancelled_leader_detaches():
+    transport = SlowAsyncTransport(
+        json.dumps(get_test_case("testdata/version-response.json"))
+    )
+    handler = AsyncAPIHandler(transport=transport)
+
+    async def send():
+        leader = asyncio.ensure_future(
+            asyncio.wait_for(
+                handler.execute_request(get_request_data(TEST_URL), VersionResponse),
+                0.01,
+            )
+        )
+        while not handler._async_in_flight:
+            await asyncio.sleep(0)
+        follower = asyncio.ensure_future(
+            handler.execute_request(get_request_data(TEST_URL), VersionResponse)
+        )
+        await asyncio.sleep(0)
+        with pytest.raises(asyncio.TimeoutError):
+            await leader
+        return await follower
+
+    assert isinstance(run(send()), VersionResponse)
+    assert len(transport.requests) == 1
@@ -0,0 +1,169 @@
+import os
+import threading
+
+from pythx.api import APIHandler, AsyncAPIHandler, Client
+from pythx.cache import DiskCache
+
+from .common import MockAsyncTransport, get_request_data, get_test_case, run
+
+BASE_URL = "https://api.mythx.io/v1/analyses/"
+
+
+def get_request(path, method="GET", params=None):
+    return get_request_data(BASE_URL + path, method, {}, params)
+
+
+def get_status(status):
+    data = get_test_case("testdata/analysis-status-response.json")
+    data["status"] = status
+    return data
+
+
+def test_input_cached(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    content = get_test_case("testdata/analysis-input-response.json")
+    assert cache.get(get_request("test/input")) is None
+    cache.set(get_request("test/input"), content)
+    assert cache.get(get_request("test/input")) == content
+
+
+def test_shared_between_instances(tmp_path):
+    content = get_test_case("testdata/analysis-input-response.json")
+    DiskCache(str(tmp_path)).set(get_request("test/input"), content)
+    assert DiskCache(str(tmp_path)).get(get_request("test/input")) == content
+
+
+def test_pending_status_not_cached(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.set(get_request("test"), get_status("In Progress"))
+    assert cache.get(get_request("test")) is None
+
+
+def test_final_status_cached(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.set(get_request("test"), get_status("Finished"))
+    assert cache.get(get_request("test"))["status"] == "Finished"
+
+
+def test_report_requires_final_status(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    report = get_test_case("testdata/detected-issues-response.json")
+    cache.set(get_request("test/issues"), report)
+    assert cache.get(get_request("test/issues")) is None
+
+    cache.set(get_request("test"), get_status("Error"))
+    cache.set(get_request("test/issues"), report)
+    assert cache.get(get_request("test/issues")) == report
+
+
+def test_mutable_requests_ignored(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    list_request = {
+        "method": "GET",
+        "headers": {},
+        "url": BASE_URL.rstrip("/"),
+        "payload": {},
+        "params": {"offset": 0},
+    }
+    cache.set(list_request, {"analyses": [], "total": 0})
+    cache.set(get_request("test/input", method="POST"), {})
+    assert cache.get(list_request) is None
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_lru_eviction(tmp_path):
+    content = {"data": "x" * 1000}
+    cache = DiskCache(str(tmp_path), max_size=3500)
+    for uuid in ("a", "b", "c"):
+        cache.set(get_request(uuid + "/input"), content)
+    # touch the oldest entry so it becomes the most recently used one
+    entry = tmp_path / "{}.json".format(cache.request_key(get_request("a/input")))
+    os.utime(str(entry), (1, 1))
+    for uuid in ("b", "c"):
+        path = tmp_path / "{}.json".format(cache.request_key(get_request(uuid + "/input")))
+        os.utime(str(path), (2, 2))
+    assert cache.get(get_request("a/input")) == content
+
+    cache.set(get_request("d/input"), content)
+    assert cache.get(get_request("a/input")) == content
+    assert cache.get(get_request("b/input")) is None
+    assert cache.get(get_request("d/input")) == content
+
+
+def test_overwrite_keeps_size(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    for _ in range(3):
+        cache.set(get_request("test/input"), {"data": "x" * 1000})
+    assert cache._size == cache._total_size()
+
+
+def test_corrupt_entry_is_miss(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    key = cache.request_key(get_request("test/input"))
+    (tmp_path / "{}.json".format(key)).write_text("{not json")
+    assert cache.get(get_request("test/input")) is None
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_clear(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.set(get_request("test/input"), {})
+    cache.clear()
+    assert cache.get(get_request("test/input")) is None
+
+
+def test_handler_serves_from_cache(tmp_path, requests_mock):
+    content = get_test_case("testdata/analysis-input-response.json")
+    requests_mock.get(BASE_URL + "test/input", json=content)
+    handler = APIHandler(caches=[DiskCache(str(tmp_path))])
+
+    assert handler.send_request(get_request("test/input")) == content
+    assert handler.send_request(get_request("test/input")) == content
+    assert requests_mock.call_count == 1
+
+
+def test_async_handler_reads_cache_in_executor(tmp_path):
+    content = get_test_case("testdata/analysis-input-response.json")
+    cache = DiskCache(str(tmp_path))
+    cache.set(get_request("test/input"), content)
+    threads = []
+    read = cache._read
+
+    def record_thread(key):
+        threads.append(threading.current_thread())
+        return read(key)
+
+    cache._read = record_thread
+    handler = AsyncAPIHandler(transport=MockAsyncTransport(), caches=[cache])
+    assert run(handler.send_request(get_request("test/input"))) == content
+    assert threads and threading.main_thread() not in threads
+
+
+def test_client_report_served_from_cache(tmp_path, requests_mock):
+    report = get_test_case("testdata/detected-issues-response.json")
+    requests_mock.get(BASE_URL + "test", json=get_status("Finished"))
+    requests_mock.get(BASE_URL + "test/issues", json=report)
+    client = Client(
+        api_key="test", handler=APIHandler(caches=[DiskCache(str(tmp_path))])
+    )
+    client.assert_authentication = lambda: None
+
+    first = client.report("test")
+    assert requests_mock.call_count == 2
+    # a later report call never leaves the machine
+    assert client.report("test") == first
+    assert requests_mock.call_count == 2
+
+
+def test_client_report_of_pending_job_not_cached(tmp_path, requests_mock):
+    report = get_test_case("testdata/detected-issues-response.json")
+    requests_mock.get(BASE_URL + "test", json=get_status("Running"))
+    requests_mock.get(BASE_URL + "test/issues", json=report)
+    client = Client(
+        api_key="test", handler=APIHandler(caches=[DiskCache(str(tmp_path))])
+    )
+    client.assert_authentication = lambda: None
+
+    client.report("test")
+    client.report("test")
+    assert requests_mock.call_count == 4
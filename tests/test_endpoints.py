@@ -0,0 +1,224 @@
+import threading
+
+import pytest
+import requests
+from mythx_models.exceptions import MythXAPIError
+
+from pythx.api.async_handler import AsyncAPIHandler
+from pythx.api.endpoints import EndpointPool
+from pythx.api.handler import APIHandler
+from pythx.api.polling import Backoff
+from pythx.api.retry import RetryPolicy
+
+from .common import FAST_RETRIES, MockAsyncTransport, get_request_data, run
+
+PRIMARY = "https://eu.test.com/"
+SECONDARY = "https://us.test.com/"
+
+
+def get_handler(retry_policy=FAST_RETRIES, **kwargs):
+    return APIHandler(
+        api_url=["https://eu.test.com/v1", "https://us.test.com"],
+        retry_policy=retry_policy,
+        probe_interval=None,
+        **kwargs
+    )
+
+
+def test_pool_requires_endpoint():
+    with pytest.raises(ValueError):
+        EndpointPool([])
+
+
+def test_pool_deduplicates():
+    pool = EndpointPool([PRIMARY, SECONDARY, PRIMARY])
+    assert [e.url for e in pool.endpoints] == [PRIMARY, SECONDARY]
+
+
+def test_pool_ranks_by_latency():
+    pool = EndpointPool([PRIMARY, SECONDARY])
+    primary, secondary = pool.endpoints
+    # without measurements, the given order is used
+    assert pool.select() is primary
+    pool.record_success(secondary, 0.01)
+    assert pool.select() is secondary
+    pool.record_success(primary, 0.001)
+    assert pool.candidates() == [primary, secondary]
+    assert pool.select(exclude=[primary]) is secondary
+    assert pool.select(exclude=[primary, secondary]) is primary
+
+
+def test_pool_latency_smoothing():
+    pool = EndpointPool([PRIMARY])
+    endpoint = pool.primary
+    pool.record_success(endpoint, 1.0)
+    assert endpoint.latency == 1.0
+    pool.record_success(endpoint, 2.0)
+    assert 1.0 < endpoint.latency < 2.0
+
+
+def test_pool_ejects_and_restores():
+    pool = EndpointPool([PRIMARY, SECONDARY], max_failures=2)
+    primary, secondary = pool.endpoints
+    pool.record_failure(primary)
+    assert primary.healthy
+    pool.record_success(primary)
+    pool.record_failure(primary)
+    assert primary.healthy
+    pool.record_failure(primary)
+    assert not primary.healthy
+    assert pool.select() is secondary
+
+    pool.record_success(primary)
+    assert primary.healthy
+    assert primary.failures == 0
+
+
+def test_pool_all_ejected():
+    pool = EndpointPool([PRIMARY, SECONDARY], max_failures=1)
+    primary, secondary = pool.endpoints
+    pool.record_failure(secondary)
+    pool.record_failure(primary)
+    # the endpoint ejected the longest is tried first
+    assert pool.candidates() == [secondary, primary]
+
+
+def test_pool_check():
+    def probe(url):
+        if url == PRIMARY:
+            raise requests.exceptions.ConnectionError()
+
+    pool = EndpointPool([PRIMARY, SECONDARY], probe=probe, max_failures=1)
+    pool.check()
+    primary, secondary = pool.endpoints
+    assert not primary.healthy
+    assert secondary.healthy
+    assert secondary.latency is not None
+
+
+def test_pool_background_checks():
+    probed = threading.Event()
+    pool = EndpointPool(
+        [PRIMARY, SECONDARY], probe=lambda url: probed.set(), probe_interval=60
+    )
+    assert not pool.running
+    pool.select()
+    assert probed.wait(5)
+    assert pool.running
+    pool.stop(timeout=5)
+    assert not pool.running
+
+
+def test_single_endpoint_not_checked():
+    pool = EndpointPool([PRIMARY], probe=lambda url: None)
+    pool.select()
+    assert not pool.running
+
+
+def test_handler_endpoints():
+    handler = get_handler()
+    assert handler.api_url == PRIMARY
+    assert [e.url for e in handler.endpoints.endpoints] == [PRIMARY, SECONDARY]
+
+
+def test_handler_endpoints_from_env(monkeypatch):
+    monkeypatch.setenv("MYTHX_API_URL", "https://eu.test.com/v1, https://us.test.com")
+    handler = APIHandler(probe_interval=None)
+    assert [e.url for e in handler.endpoints.endpoints] == [PRIMARY, SECONDARY]
+
+
+def test_handler_failover(requests_mock):
+    requests_mock.get(PRIMARY + "v1/analyses", exc=requests.exceptions.ConnectTimeout)
+    requests_mock.get(SECONDARY + "v1/analyses", text='{"resp": "test"}')
+    handler = get_handler(max_failures=1)
+
+    handler.send_request(get_request_data(handler.api_url + "v1/analyses"))
+    assert [r.url for r in requests_mock.request_history] == [
+        PRIMARY + "v1/analyses",
+        SECONDARY + "v1/analyses",
+    ]
+    assert not handler.endpoints.primary.healthy
+    # the ejected endpoint is skipped from now on
+    handler.send_request(get_request_data(handler.api_url + "v1/analyses"))
+    assert requests_mock.request_history[-1].url == SECONDARY + "v1/analyses"
+    assert requests_mock.call_count == 3
+
+
+def test_handler_failover_on_server_error(requests_mock):
+    requests_mock.get(PRIMARY + "v1/analyses", status_code=503, text="unavailable")
+    requests_mock.get(SECONDARY + "v1/analyses", text='{"resp": "test"}')
+    handler = get_handler(
+        retry_policy=RetryPolicy(backoff=Backoff(initial=60, jitter=0))
+    )
+    # the retry at the other endpoint is not delayed
+    assert handler.send_request(get_request_data(handler.api_url + "v1/analyses")) == {"resp": "test"}
+    assert requests_mock.call_count == 2
+
+
+def test_handler_failover_on_internal_error(requests_mock):
+    # 500 is not retried at the same endpoint, but another one may succeed
+    requests_mock.get(PRIMARY + "v1/analyses", status_code=500, text="error")
+    requests_mock.get(SECONDARY + "v1/analyses", text='{"resp": "test"}')
+    handler = get_handler()
+    request_data = get_request_data(handler.api_url + "v1/analyses")
+    assert handler.send_request(request_data) == {"resp": "test"}
+    assert requests_mock.call_count == 2
+
+
+def test_handler_submission_no_failover(requests_mock):
+    requests_mock.post(PRIMARY + "v1/analyses", status_code=503, text="unavailable")
+    handler = get_handler()
+    with pytest.raises(MythXAPIError):
+        handler.send_request(
+            get_request_data(handler.api_url + "v1/analyses", method="POST", payload={})
+        )
+    assert requests_mock.call_count == 1
+    assert handler.endpoints.primary.failures == 1
+
+
+def test_handler_records_request_latency(requests_mock):
+    requests_mock.get(PRIMARY + "v1/analyses", text='{"resp": "test"}')
+    handler = get_handler()
+    handler.send_request(get_request_data(handler.api_url + "v1/analyses"))
+    assert handler.endpoints.primary.latency is not None
+
+
+def test_handler_client_error_no_failover(requests_mock):
+    requests_mock.get(PRIMARY + "v1/analyses", status_code=404, text="not found")
+    handler = get_handler()
+    with pytest.raises(MythXAPIError):
+        handler.send_request(get_request_data(handler.api_url + "v1/analyses"))
+    assert requests_mock.call_count == 1
+    assert handler.endpoints.primary.failures == 0
+
+
+def test_handler_probe(requests_mock):
+    requests_mock.get(PRIMARY + "v1/version", text='{"api": "v1.4.34.4"}')
+    requests_mock.get(SECONDARY + "v1/version", status_code=500, text="error")
+    handler = get_handler(max_failures=1)
+    handler.endpoints.check()
+    primary, secondary = handler.endpoints.endpoints
+    assert primary.latency is not None
+    assert not secondary.healthy
+    assert "Authorization" not in requests_mock.request_history[0].headers
+
+
+class FailingAsyncTransport(MockAsyncTransport):
+    def respond(self, method, url, headers, payload, params):
+        if url.startswith(PRIMARY):
+            raise requests.exceptions.ConnectionError()
+        return super().respond(method, url, headers, payload, params)
+
+
+def test_async_handler_failover():
+    transport = FailingAsyncTransport()
+    handler = AsyncAPIHandler(
+        api_url=[PRIMARY, SECONDARY],
+        transport=transport,
+        retry_policy=FAST_RETRIES,
+        probe_interval=None,
+    )
+    request_data = get_request_data(handler.api_url + "v1/analyses")
+    resp = run(handler.send_request(request_data))
+    assert resp == {"resp": "test"}
+    assert [r["url"] for r in transport.requests] == [PRIMARY + "v1/analyses", SECONDARY + "v1/analyses"]
@@ -0,0 +1,138 @@
+import threading
+
+import pytest
+
+from pythx.api.handler import APIHandler
+from pythx.cache import MemoryCache
+from pythx.cache import memory
+
+from .common import FakeClock, get_request_data, get_test_case
+
+BASE_URL = "https://api.mythx.io/v1/"
+
+
+def get_request(path, method="GET", params=None):
+    return get_request_data(BASE_URL + path, method, {}, params)
+
+
+def get_status(status):
+    data = get_test_case("testdata/analysis-status-response.json")
+    data["status"] = status
+    return data
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(memory.time, "monotonic", fake.monotonic)
+    return fake
+
+
+@pytest.mark.parametrize(
+    "path,endpoint",
+    [
+        ("analyses/test", "analysis_status"),
+        ("analysis-groups/test", "group_status"),
+        ("projects/test", "project_status"),
+        ("analyses", "analysis_list"),
+        ("version", "version"),
+    ],
+)
+def test_endpoints_cached(path, endpoint):
+    cache = MemoryCache()
+    assert cache.get(get_request(path)) is None
+    cache.set(get_request(path), {"data": path})
+    assert cache.get(get_request(path)) == {"data": path}
+    assert cache.stats() == {endpoint: {"hits": 1, "misses": 1}}
+
+
+@pytest.mark.parametrize("path", ["analyses/test/issues", "analyses/test/input", "auth/login"])
+def test_other_endpoints_ignored(path):
+    cache = MemoryCache()
+    cache.set(get_request(path), {})
+    assert cache.get(get_request(path)) is None
+    assert cache.stats() == {}
+
+
+def test_params_part_of_key():
+    cache = MemoryCache()
+    cache.set(get_request("analyses", params={"offset": 0}), {"page": 0})
+    assert cache.get(get_request("analyses", params={"offset": 20})) is None
+    assert cache.get(get_request("analyses", params={"offset": 0})) == {"page": 0}
+
+
+def test_ttl_expiry(clock):
+    cache = MemoryCache(ttls={"analysis_status": 5})
+    cache.set(get_request("analyses/test"), get_status("In Progress"))
+    clock.now += 4
+    assert cache.get(get_request("analyses/test")) is not None
+    clock.now += 2
+    assert cache.get(get_request("analyses/test")) is None
+
+
+def test_zero_ttl_disables_endpoint():
+    cache = MemoryCache(ttls={"version": 0})
+    cache.set(get_request("version"), {})
+    assert cache.get(get_request("version")) is None
+
+
+def test_final_status_does_not_expire(clock):
+    cache = MemoryCache()
+    cache.set(get_request("analyses/test"), get_status("Finished"))
+    clock.now += 10 ** 6
+    assert cache.get(get_request("analyses/test"))["status"] == "Finished"
+
+
+def test_finished_group_does_not_expire(clock):
+    cache = MemoryCache()
+    group = get_test_case("testdata/group-status-response.json")
+    group["status"] = "sealed"
+    cache.set(get_request("analysis-groups/test"), group)
+    clock.now += 10 ** 6
+    assert cache.get(get_request("analysis-groups/test")) == group
+
+
+def test_lru_bound():
+    cache = MemoryCache(max_entries=2)
+    cache.set(get_request("analyses/a"), get_status("Queued"))
+    cache.set(get_request("analyses/b"), get_status("Queued"))
+    assert cache.get(get_request("analyses/a")) is not None
+    cache.set(get_request("analyses/c"), get_status("Queued"))
+    assert cache.get(get_request("analyses/b")) is None
+    assert cache.get(get_request("analyses/a")) is not None
+    assert cache.get(get_request("analyses/c")) is not None
+
+
+def test_modifying_request_invalidates():
+    cache = MemoryCache()
+    cache.set(get_request("analysis-groups/test"), {"status": "opened"})
+    cache.set(get_request("analysis-groups/test", method="POST"), {})
+    assert cache.get(get_request("analysis-groups/test")) is None
+
+
+def test_clear():
+    cache = MemoryCache()
+    cache.set(get_request("version"), {})
+    cache.get(get_request("version"))
+    cache.clear()
+    assert cache.get(get_request("version")) is None
+    assert cache.stats() == {"version": {"hits": 0, "misses": 1}}
+
+
+def test_handler_threads_share_cache(requests_mock):
+    requests_mock.get(BASE_URL + "analyses/test", json=get_status("In Progress"))
+    cache = MemoryCache(ttls={"analysis_status": 60})
+    handler = APIHandler(caches=[cache])
+    handler.send_request(get_request("analyses/test"))
+
+    threads = [
+        threading.Thread(target=handler.send_request, args=(get_request("analyses/test"),))
+        for _ in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert requests_mock.call_count == 1
+    assert cache.hits["analysis_status"] == 10
@@ -0,0 +1,71 @@
+import pytest
+from mythx_models import response as respmodels
+from mythx_models.response.analysis import AnalysisShort
+from pydantic import ValidationError
+
+from pythx.api.handler import APIHandler
+from pythx.api.parsing import LAZY, TRUSTED, LazyModel, construct_model
+
+from .common import get_test_case
+
+
+def test_lazy_model_validates_accessed_fields():
+    test_dict = get_test_case("testdata/analysis-status-response.json")
+    test_dict["queueTime"] = "not a number"
+    model = LazyModel(respmodels.AnalysisStatusResponse, test_dict)
+
+    assert model.uuid == test_dict["uuid"]
+    assert model.status == test_dict["status"]
+    with pytest.raises(ValidationError):
+        model.queue_time
+
+
+def test_lazy_model_caches_values():
+    test_dict = get_test_case("testdata/analysis-list-response.json")
+    model = LazyModel(respmodels.AnalysisListResponse, test_dict)
+    assert model.analyses is model.analyses
+    assert model.analyses[0].uuid == test_dict["analyses"][0]["uuid"]
+
+
+def test_lazy_model_missing_field():
+    test_dict = get_test_case("testdata/analysis-status-response.json")
+    del test_dict["uuid"]
+    model = LazyModel(respmodels.AnalysisStatusResponse, test_dict)
+    with pytest.raises(ValidationError):
+        model.uuid
+
+
+def test_lazy_model_delegates_to_model():
+    test_dict = get_test_case("testdata/analysis-status-response.json")
+    model = LazyModel(respmodels.AnalysisStatusResponse, test_dict)
+    strict = respmodels.AnalysisStatusResponse(**test_dict)
+
+    assert model == strict
+    assert model.dict() == strict.dict()
+    with pytest.raises(AttributeError):
+        model.uuid = "test"
+
+
+def test_construct_model_nested():
+    test_dict = get_test_case("testdata/analysis-list-response.json")
+    model = construct_model(respmodels.AnalysisListResponse, test_dict)
+
+    assert model.total == test_dict["total"]
+    assert isinstance(model.analyses[0], AnalysisShort)
+    assert [a.uuid for a in model.analyses] == [a["uuid"] for a in test_dict["analyses"]]
+
+
+@pytest.mark.parametrize("parse_mode", [LAZY, TRUSTED])
+def test_parse_detected_issues(parse_mode):
+    test_dict = get_test_case("testdata/detected-issues-response.json")
+    model = APIHandler(parse_mode=parse_mode).parse_response(
+        test_dict, respmodels.DetectedIssuesResponse
+    )
+    issue = model.issue_reports[0].issues[0]
+    assert issue.uuid == test_dict[0]["issues"][0]["uuid"]
+    assert issue.swc_id == test_dict[0]["issues"][0]["swcID"]
+
+
+def test_unknown_parse_mode():
+    with pytest.raises(ValueError):
+        APIHandler(parse_mode="sloppy")
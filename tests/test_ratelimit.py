@@ -0,0 +1,166 @@
+import multiprocessing
+import threading
+
+import pytest
+
+from pythx.api import AsyncAPIHandler
+from pythx.api import handler as handler_module
+from pythx.api import ratelimit
+from pythx.api.deadline import Deadline
+from pythx.api.handler import APIHandler
+from pythx.api.ratelimit import RateLimiter, SharedRateLimiter, take_token
+from pythx.api.transport import ExecutorTransport
+from pythx.exceptions import MythXTimeoutError
+
+from .common import FakeClock, get_request_data, run
+
+BASE_URL = "https://api.mythx.io/v1/"
+
+
+def get_request(path, method="GET"):
+    return get_request_data(BASE_URL + path, method, {})
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(ratelimit.time, "monotonic", fake.time)
+    monkeypatch.setattr(ratelimit.time, "time", fake.time)
+    return fake
+
+
+@pytest.mark.parametrize(
+    "method,path,name",
+    [
+        ("POST", "analyses", "submission"),
+        ("GET", "analyses", "status"),
+        ("GET", "analyses/abc", "status"),
+        ("GET", "analysis-groups/abc", "status"),
+        ("GET", "projects", "status"),
+        ("GET", "analyses/abc/issues", "report"),
+        ("GET", "analyses/abc/input", "report"),
+        ("POST", "analysis-groups/abc", "other"),
+        ("POST", "auth/login", "other"),
+        ("GET", "version", "other"),
+    ],
+)
+def test_endpoint_class(method, path, name):
+    assert RateLimiter.endpoint_class(get_request(path, method)) == name
+
+
+def test_take_token():
+    assert take_token(2, 0, 0, rate=1, capacity=2) == (1, 0)
+    assert take_token(0, 0, 0, rate=2, capacity=2) == (-1, 0.5)
+    # refill is capped at the capacity
+    assert take_token(0, 0, 100, rate=1, capacity=2) == (1, 0)
+
+
+@pytest.mark.parametrize("shared", [False, True])
+def test_burst_then_queue(clock, tmp_path, shared):
+    limits = {"submission": (2.0, 3)}
+    limiter = SharedRateLimiter(str(tmp_path / "rl.db"), limits) if shared else RateLimiter(limits)
+    request = get_request("analyses", "POST")
+
+    assert [limiter.reserve(request) for _ in range(3)] == [0, 0, 0]
+    # requests queue up behind each other instead of failing
+    assert [limiter.reserve(request) for _ in range(3)] == [0.5, 1.0, 1.5]
+    clock.now += 10
+    assert limiter.reserve(request) == 0
+
+
+@pytest.mark.parametrize("shared", [False, True])
+def test_reserve_within_max_wait(clock, tmp_path, shared):
+    limits = {"submission": (1.0, 1)}
+    limiter = SharedRateLimiter(str(tmp_path / "rl.db"), limits) if shared else RateLimiter(limits)
+    request = get_request("analyses", "POST")
+
+    assert limiter.reserve(request, max_wait=5) == 0
+    # the next slot is too far away, so no token is taken
+    assert limiter.reserve(request, max_wait=0.5) is None
+    assert limiter.reserve(request, max_wait=5) == 1
+
+
+def test_separate_budgets(clock):
+    limiter = RateLimiter({"submission": (1.0, 1), "status": (1.0, 1)})
+    assert limiter.reserve(get_request("analyses", "POST")) == 0
+    assert limiter.reserve(get_request("analyses/abc")) == 0
+    assert limiter.reserve(get_request("analyses", "POST")) == 1
+
+
+def test_unlimited_class(clock):
+    limiter = RateLimiter({"report": None})
+    assert all(limiter.reserve(get_request("analyses/abc/issues")) == 0 for _ in range(100))
+
+
+def test_shared_between_instances(clock, tmp_path):
+    path = str(tmp_path / "rl.db")
+    limits = {"status": (1.0, 1)}
+    assert SharedRateLimiter(path, limits).reserve(get_request("analyses/a")) == 0
+    assert SharedRateLimiter(path, limits).reserve(get_request("analyses/a")) == 1
+
+
+def reserve_in_process(path, queue):
+    limiter = SharedRateLimiter(path, {"status": (0.01, 1)})
+    queue.put(limiter.reserve(get_request("analyses/a")))
+
+
+def test_shared_between_processes(tmp_path):
+    path = str(tmp_path / "rl.db")
+    SharedRateLimiter(path)
+    queue = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=reserve_in_process, args=(path, queue)) for _ in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    delays = sorted(round(queue.get() / 100) for _ in processes)
+
+    # a single token was available, everyone else had to queue
+    assert delays == [0, 1, 2, 3]
+
+
+def test_handler_waits_for_slot(requests_mock, monkeypatch, clock):
+    slept = []
+    monkeypatch.setattr(handler_module.time, "sleep", slept.append)
+    requests_mock.get(BASE_URL + "analyses/abc", text="{}")
+    handler = APIHandler(rate_limiter=RateLimiter({"status": (4.0, 1)}))
+
+    for _ in range(3):
+        handler.send_request(get_request("analyses/abc"))
+
+    assert requests_mock.call_count == 3
+    assert slept == [0, 0.25, 0.5]
+
+
+def test_handler_deadline_takes_no_slot(requests_mock, monkeypatch, clock):
+    monkeypatch.setattr(handler_module.time, "sleep", lambda _: None)
+    requests_mock.get(BASE_URL + "analyses/abc", text="{}")
+    limiter = RateLimiter({"status": (1.0, 1)})
+    handler = APIHandler(rate_limiter=limiter)
+    handler.send_request(get_request("analyses/abc"))
+
+    for timeout in (0, 0.5):
+        with Deadline(timeout), pytest.raises(MythXTimeoutError):
+            handler.send_request(get_request("analyses/abc"))
+
+    assert requests_mock.call_count == 1
+    # the failed requests did not queue up
+    assert limiter.reserve(get_request("analyses/abc")) == 1
+
+
+def test_async_handler_reserves_off_event_loop(requests_mock):
+    threads = []
+
+    class RecordingLimiter(RateLimiter):
+        def _take(self, *args):
+            threads.append(threading.current_thread())
+            return super()._take(*args)
+
+    requests_mock.get(BASE_URL + "analyses/abc", text="{}")
+    handler = AsyncAPIHandler(transport=ExecutorTransport(), rate_limiter=RecordingLimiter())
+    run(handler.send_request(get_request("analyses/abc")))
+
+    assert len(threads) == 1
+    assert threads[0] is not threading.main_thread()
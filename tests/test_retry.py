@@ -0,0 +1,204 @@
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import requests
+from mythx_models.exceptions import MythXAPIError
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from pythx.api import handler as handler_module
+from pythx.api.handler import APIHandler
+from pythx.api.polling import Backoff
+from pythx.api.retry import RetryPolicy, is_connect_error
+
+from .common import get_request_data
+
+TEST_URL = "mock://test.com/path"
+NO_WAIT = Backoff(initial=0.01, maximum=0.01, jitter=0)
+
+
+def get_response(status_code, retry_after=None):
+    response = requests.Response()
+    response.status_code = status_code
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return response
+
+
+def get_request(method="GET"):
+    return get_request_data(TEST_URL, method, {})
+
+
+def connect_error():
+    return requests.exceptions.ConnectionError(
+        MaxRetryError(None, TEST_URL, NewConnectionError(None, "refused"))
+    )
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(handler_module.time, "sleep", slept.append)
+    return slept
+
+
+@pytest.mark.parametrize(
+    "method,status_code,retryable",
+    [
+        ("GET", 429, True),
+        ("GET", 502, True),
+        ("GET", 503, True),
+        ("GET", 504, True),
+        ("GET", 500, False),
+        ("GET", 400, False),
+        ("GET", 200, False),
+        ("POST", 429, True),
+        ("POST", 503, False),
+        ("POST", 504, False),
+    ],
+)
+def test_retryable_status(method, status_code, retryable):
+    policy = RetryPolicy()
+    assert policy.is_retryable(method, response=get_response(status_code)) is retryable
+
+
+@pytest.mark.parametrize(
+    "method,error,retryable",
+    [
+        ("GET", requests.exceptions.ReadTimeout(), True),
+        ("GET", requests.exceptions.ConnectionError("reset"), True),
+        ("POST", requests.exceptions.ReadTimeout(), False),
+        ("POST", requests.exceptions.ConnectionError("reset"), False),
+        ("POST", requests.exceptions.ConnectTimeout(), True),
+        ("POST", connect_error(), True),
+        ("GET", requests.exceptions.InvalidURL(), False),
+    ],
+)
+def test_retryable_error(method, error, retryable):
+    assert RetryPolicy().is_retryable(method, error=error) is retryable
+
+
+@pytest.mark.parametrize(
+    "method,status_code,error,failover",
+    [
+        ("GET", 500, None, True),
+        ("GET", 503, None, True),
+        ("GET", 404, None, False),
+        ("POST", 500, None, False),
+        ("GET", None, requests.exceptions.ReadTimeout(), True),
+        ("POST", None, requests.exceptions.ReadTimeout(), False),
+        ("POST", None, connect_error(), True),
+        ("GET", None, requests.exceptions.InvalidURL(), False),
+    ],
+)
+def test_may_fail_over(method, status_code, error, failover):
+    response = get_response(status_code) if status_code is not None else None
+    assert RetryPolicy.may_fail_over(method, response, error) is failover
+
+
+def test_is_connect_error():
+    assert is_connect_error(connect_error())
+    assert is_connect_error(requests.exceptions.ConnectionError(NewConnectionError(None, "x")))
+    assert not is_connect_error(requests.exceptions.ConnectionError("reset"))
+
+
+def test_retry_after_seconds():
+    assert RetryPolicy.retry_after(get_response(429, "7")) == 7.0
+    assert RetryPolicy.retry_after(get_response(429)) is None
+    assert RetryPolicy.retry_after(get_response(429, "soon")) is None
+
+
+def test_retry_after_date():
+    date = datetime.now(timezone.utc) + timedelta(seconds=30)
+    delay = RetryPolicy.retry_after(get_response(503, format_datetime(date, usegmt=True)))
+    assert 25 < delay <= 30
+
+
+def test_next_delay():
+    policy = RetryPolicy(max_attempts=3, backoff=Backoff(initial=1, jitter=0))
+    assert policy.next_delay(1, "GET", response=get_response(503)) == 1
+    assert policy.next_delay(2, "GET", response=get_response(503)) == 2
+    assert policy.next_delay(3, "GET", response=get_response(503)) is None
+
+
+def test_next_delay_honours_retry_after():
+    policy = RetryPolicy(backoff=Backoff(initial=1, jitter=0), max_retry_after=10)
+    assert policy.next_delay(1, "GET", response=get_response(429, "5")) == 5
+    assert policy.next_delay(1, "GET", response=get_response(429, "0")) == 1
+    assert policy.next_delay(1, "GET", response=get_response(429, "11")) is None
+
+
+def test_handler_retries_transient_status(requests_mock, sleeps):
+    requests_mock.get(
+        TEST_URL,
+        [
+            {"status_code": 503, "text": "unavailable"},
+            {"status_code": 429, "text": "slow down", "headers": {"Retry-After": "2"}},
+            {"status_code": 200, "text": '{"resp":"test"}'},
+        ],
+    )
+    events = []
+    handler = APIHandler(
+        retry_policy=RetryPolicy(max_attempts=3, backoff=NO_WAIT, on_attempt=events.append)
+    )
+
+    assert handler.send_request(get_request()) == {"resp": "test"}
+    assert requests_mock.call_count == 3
+    assert sleeps == [0.01, 2.0]
+    assert [(e.attempt, e.status_code, e.delay) for e in events] == [
+        (1, 503, 0.01),
+        (2, 429, 2.0),
+        (3, 200, None),
+    ]
+
+
+def test_handler_gives_up_after_max_attempts(requests_mock, sleeps):
+    requests_mock.get(TEST_URL, status_code=502, text="bad gateway")
+    handler = APIHandler(retry_policy=RetryPolicy(max_attempts=4, backoff=NO_WAIT))
+
+    with pytest.raises(MythXAPIError):
+        handler.send_request(get_request())
+    assert requests_mock.call_count == 4
+    assert len(sleeps) == 3
+
+
+def test_handler_does_not_duplicate_submissions(requests_mock, sleeps):
+    requests_mock.post(TEST_URL, status_code=503, text="unavailable")
+    handler = APIHandler(retry_policy=RetryPolicy(backoff=NO_WAIT))
+
+    with pytest.raises(MythXAPIError):
+        handler.send_request(get_request("POST"))
+    assert requests_mock.call_count == 1
+    assert sleeps == []
+
+
+def test_handler_retries_connection_errors(requests_mock, sleeps):
+    requests_mock.get(
+        TEST_URL,
+        [
+            {"exc": requests.exceptions.ConnectTimeout},
+            {"status_code": 200, "text": '{"resp":"test"}'},
+        ],
+    )
+    handler = APIHandler(retry_policy=RetryPolicy(backoff=NO_WAIT))
+
+    assert handler.send_request(get_request()) == {"resp": "test"}
+    assert requests_mock.call_count == 2
+
+
+def test_handler_raises_final_connection_error(requests_mock, sleeps):
+    requests_mock.post(TEST_URL, exc=requests.exceptions.ReadTimeout)
+    handler = APIHandler(retry_policy=RetryPolicy(backoff=NO_WAIT))
+
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        handler.send_request(get_request("POST"))
+    assert requests_mock.call_count == 1
+
+
+def test_disabled_policy(requests_mock, sleeps):
+    requests_mock.get(TEST_URL, status_code=503, text="unavailable")
+    handler = APIHandler(retry_policy=RetryPolicy.disabled())
+
+    with pytest.raises(MythXAPIError):
+        handler.send_request(get_request())
+    assert requests_mock.call_count == 1
@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta
+
+from pythx.api.sharding import Shard, split_range
+
+START = datetime(2020, 1, 1)
+
+
+def test_split_range_newest_first():
+    shards = split_range(START, START + timedelta(days=4), 4)
+    assert shards == [
+        Shard(START + timedelta(days=i), START + timedelta(days=i + 1))
+        for i in reversed(range(4))
+    ]
+
+
+def test_split_range_single_part():
+    assert split_range(START, START + timedelta(days=1), 0) == [
+        Shard(START, START + timedelta(days=1))
+    ]
+
+
+def test_shard_small_enough():
+    assert Shard(START, START + timedelta(days=1)).split(10, shard_size=10) is None
+
+
+def test_shard_split_by_density():
+    shard = Shard(START, START + timedelta(days=1))
+    parts = shard.split(25, shard_size=10)
+    assert len(parts) == 3
+    assert parts[0].date_to == shard.date_to
+    assert parts[-1].date_from == shard.date_from
+    assert all(a.date_from == b.date_to for a, b in zip(parts, parts[1:]))
+
+
+def test_shard_split_minimum_span():
+    assert Shard(START, START + timedelta(seconds=1)).split(1000, shard_size=10) is None
+    assert len(Shard(START, START + timedelta(seconds=3)).split(1000, shard_size=10)) == 3
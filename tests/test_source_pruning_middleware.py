@@ -0,0 +1,182 @@
+from mythx_models.request import AnalysisStatusRequest, AnalysisSubmissionRequest
+
+from pythx.middleware.source_pruning import SourcePruningMiddleware, import_closure
+
+from .common import generate_request_dict, get_test_case
+
+SOURCES = {
+    "contracts/Token.sol": {
+        "source": 'pragma solidity ^0.5.0;\nimport "./lib/Math.sol";\n'
+        'import {Ownable} from "@oz/Ownable.sol";\n// import "./Unused.sol";\n'
+        "contract Token {}\n",
+        "ast": {
+            "nodeType": "SourceUnit",
+            "nodes": [
+                {"nodeType": "ImportDirective", "absolutePath": path}
+                for path in ("contracts/lib/Math.sol", "@oz/Ownable.sol")
+            ],
+        },
+    },
+    "contracts/lib/Math.sol": {"source": "library Math {}\n", "legacyAST": {}},
+    "node_modules/@oz/Ownable.sol": {
+        "source": 'import "./Context.sol";\ncontract Ownable {}'
+    },
+    "node_modules/@oz/Context.sol": {"source": "contract Context {}"},
+    "contracts/Unused.sol": {"source": "contract Unused {}"},
+    "contracts/Other.sol": {"source": "contract Other {}", "ast": {}},
+}
+SOURCE_LIST = [
+    "contracts/Other.sol",
+    "contracts/Token.sol",
+    "contracts/Unused.sol",
+    "contracts/lib/Math.sol",
+    "node_modules/@oz/Context.sol",
+    "node_modules/@oz/Ownable.sol",
+]
+
+
+def get_submission(**kwargs):
+    data = dict(
+        bytecode="0xf00",
+        main_source="contracts/Token.sol",
+        sources={key: dict(value) for key, value in SOURCES.items()},
+        source_list=list(SOURCE_LIST),
+        source_map="0:10:1:-;;5:2:3;7:1;8:1:-1;9:1:1",
+        deployed_source_map="0:10:1:-",
+    )
+    data.update(kwargs)
+    return generate_request_dict(AnalysisSubmissionRequest(**data))
+
+
+def test_import_closure():
+    assert import_closure("contracts/Token.sol", SOURCES) == {
+        "contracts/Token.sol",
+        "contracts/lib/Math.sol",
+        "node_modules/@oz/Ownable.sol",
+        "node_modules/@oz/Context.sol",
+    }
+
+
+def test_import_closure_unresolved():
+    sources = {"a.sol": {"source": 'import "./missing.sol";'}}
+    assert import_closure("a.sol", sources) is None
+
+
+def test_import_closure_from_ast():
+    sources = {
+        "a.sol": {
+            "source": "",
+            "ast": {
+                "nodes": [{"nodeType": "ImportDirective", "absolutePath": "lib/b.sol"}]
+            },
+        },
+        "lib/b.sol": {"legacyAST": {"children": []}},
+        "c.sol": {"source": "contract C {}"},
+    }
+    assert import_closure("a.sol", sources) == {"a.sol", "lib/b.sol"}
+
+
+def test_prune_submission():
+    reports = []
+    req = get_submission()
+    original_sources = req["payload"]["data"]["sources"]
+    req = SourcePruningMiddleware(on_prune=reports.append).process_request(req)
+    data = req["payload"]["data"]
+
+    assert set(data["sources"]) == {
+        "contracts/Token.sol",
+        "contracts/lib/Math.sol",
+        "node_modules/@oz/Ownable.sol",
+        "node_modules/@oz/Context.sol",
+    }
+    assert data["sourceList"] == [
+        "contracts/Token.sol",
+        "contracts/lib/Math.sol",
+        "node_modules/@oz/Context.sol",
+        "node_modules/@oz/Ownable.sol",
+    ]
+    # file indices follow the shortened source list
+    assert data["sourceMap"] == "0:10:0:-;;5:2:1;7:1;8:1:-1;9:1:0"
+    assert data["deployedSourceMap"] == "0:10:0:-"
+    assert all(
+        "ast" not in s and "legacyAST" not in s for s in data["sources"].values()
+    )
+    # the request model's sources are left alone
+    assert len(original_sources) == len(SOURCES)
+    assert "ast" in original_sources["contracts/Token.sol"]
+
+    assert len(reports) == 1
+    assert reports[0].sources_before == 6
+    assert reports[0].sources_after == 4
+    assert reports[0].bytes_saved > 0
+
+
+def test_keep_sources_referenced_by_source_map():
+    req = get_submission(source_map="0:10:1;1:1:2")
+    data = SourcePruningMiddleware().process_request(req)["payload"]["data"]
+    assert "contracts/Unused.sol" in data["sources"]
+    assert data["sourceMap"] == "0:10:0;1:1:1"
+
+
+def test_skip_generated_sources():
+    req = get_submission(source_map="0:10:1;1:1:7")
+    data = SourcePruningMiddleware().process_request(req)["payload"]["data"]
+    assert set(data["sources"]) == set(SOURCES)
+    assert data["sourceList"] == SOURCE_LIST
+    assert data["sourceMap"] == "0:10:1;1:1:7"
+
+
+def test_reindex_retained_asts():
+    sources = {key: dict(value) for key, value in SOURCES.items()}
+    token = sources["contracts/Token.sol"]
+    token["ast"] = dict(token["ast"], src="0:120:1")
+    sources["contracts/lib/Math.sol"]["legacyAST"] = {
+        "name": "SourceUnit",
+        "src": "0:16:3",
+        "children": [{"name": "ContractDefinition", "src": "0:15:3"}],
+    }
+    req = get_submission(sources=sources)
+    data = SourcePruningMiddleware(strip_asts=False).process_request(req)["payload"][
+        "data"
+    ]
+
+    assert data["sourceList"][1] == "contracts/lib/Math.sol"
+    assert data["sources"]["contracts/lib/Math.sol"]["legacyAST"] == {
+        "name": "SourceUnit",
+        "src": "0:16:1",
+        "children": [{"name": "ContractDefinition", "src": "0:15:1"}],
+    }
+    assert data["sources"]["contracts/Token.sol"]["ast"]["src"] == "0:120:0"
+    # the request model's ASTs are left alone
+    assert token["ast"]["src"] == "0:120:1"
+
+
+def test_skip_unresolved_imports():
+    sources = {key: dict(value) for key, value in SOURCES.items()}
+    del sources["contracts/lib/Math.sol"]
+    req = get_submission(sources=sources)
+    data = SourcePruningMiddleware().process_request(req)["payload"]["data"]
+    assert set(data["sources"]) == set(sources)
+    assert data["sourceList"] == SOURCE_LIST
+
+
+def test_squeeze_whitespace_fields():
+    sources = {"a.sol": {"source": "contract A {}", "ast": {}}}
+    req = get_submission(
+        main_source="a.sol",
+        sources=sources,
+        source_list=None,
+        source_map=None,
+        deployed_source_map=None,
+        bytecode="  ",
+    )
+    data = SourcePruningMiddleware().process_request(req)["payload"]["data"]
+    assert data["sources"] == {"a.sol": {"source": "contract A {}"}}
+    assert "bytecode" not in data
+
+
+def test_other_requests_untouched():
+    req = generate_request_dict(
+        get_test_case("testdata/analysis-status-request.json", AnalysisStatusRequest)
+    )
+    assert SourcePruningMiddleware().process_request(dict(req)) == req
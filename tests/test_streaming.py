@@ -0,0 +1,56 @@
+import json
+
+import pytest
+from mythx_models.exceptions import MythXAPIError
+
+from pythx.api.streaming import IssueStreamParser
+
+from .common import get_test_case
+
+
+def parse(body, chunk_size):
+    data = body.encode()
+    parser = IssueStreamParser()
+    issues = []
+    for i in range(0, len(data), chunk_size):
+        issues.extend(parser.feed(data[i : i + chunk_size]))
+    issues.extend(parser.close())
+    return issues
+
+
+def get_report():
+    reports = get_test_case("testdata/detected-issues-response.json")
+    issue = reports[0]["issues"][0]
+    reports[0]["issues"] = [dict(issue, uuid="issue-{}".format(i)) for i in range(3)]
+    reports.append(
+        {
+            "sourceType": "raw-bytecode",
+            "sourceFormat": "evm-byzantium-bytecode",
+            "sourceList": ["0x1234"],
+            "meta": {"coveredPaths": 12345, "selected": True, "ratio": 0.5},
+            "issues": [dict(issue, uuid="issue-3", description={"head": "ü ]}", "tail": ""})],
+        }
+    )
+    return reports
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 1 << 20])
+def test_parse_chunked(chunk_size):
+    reports = get_report()
+    expected = [issue for report in reports for issue in report["issues"]]
+    assert parse(json.dumps(reports, indent=2), chunk_size) == expected
+
+
+def test_parse_empty():
+    assert parse("[]", 1) == []
+    assert parse('[{"issues": [], "meta": {}}]', 1) == []
+    assert parse('[{}]', 1) == []
+
+
+@pytest.mark.parametrize(
+    "body",
+    ['[{"issues": [{"uuid": "a"}', '{"issues": []}', '[{"issues": [1]}]', "[] []", ""],
+)
+def test_parse_malformed(body):
+    with pytest.raises(MythXAPIError):
+        parse(body, 3)
@@ -0,0 +1,81 @@
+import threading
+
+from pythx.cache import SubmissionIndex
+from pythx.cache import submission
+
+
+def get_payload(bytecode="0xF00", **kwargs):
+    payload = {"data": {"bytecode": bytecode, "mainSource": "a.sol", "analysisMode": "quick"}}
+    payload.update(kwargs)
+    return payload
+
+
+def test_digest_normalizes_bytecode():
+    assert SubmissionIndex.digest(get_payload("0xF00")) == SubmissionIndex.digest(
+        get_payload("f00")
+    )
+
+
+def test_digest_ignores_key_order():
+    payload = get_payload()
+    reordered = {"data": dict(reversed(list(payload["data"].items())))}
+    assert SubmissionIndex.digest(payload) == SubmissionIndex.digest(reordered)
+
+
+def test_digest_covers_data_and_options():
+    digest = SubmissionIndex.digest(get_payload())
+    assert digest != SubmissionIndex.digest(get_payload("0xf01"))
+    changed = get_payload()
+    changed["data"]["analysisMode"] = "standard"
+    assert digest != SubmissionIndex.digest(changed)
+    assert digest != SubmissionIndex.digest(get_payload(propertyChecking=True))
+    # fields irrelevant to the analysis outcome
+    assert digest == SubmissionIndex.digest(get_payload(clientToolName="pythx"))
+
+
+def test_record_and_lookup(tmp_path):
+    index = SubmissionIndex(str(tmp_path / "index.db"))
+    assert index.lookup("abc") is None
+    index.record("abc", "uuid-1")
+    assert index.lookup("abc") == "uuid-1"
+    index.record("abc", "uuid-2")
+    assert index.lookup("abc") == "uuid-2"
+
+    # persisted across instances
+    assert SubmissionIndex(str(tmp_path / "index.db")).lookup("abc") == "uuid-2"
+
+
+def test_discard(tmp_path):
+    index = SubmissionIndex(str(tmp_path / "index.db"))
+    index.record("abc", "uuid-1")
+    index.discard("abc")
+    assert index.lookup("abc") is None
+
+
+def test_expiry(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(submission.time, "time", lambda: now[0])
+    index = SubmissionIndex(str(tmp_path / "index.db"), max_age=60)
+    index.record("old", "uuid-1")
+    now[0] += 61
+    assert index.lookup("old") is None
+
+    # expired entries are pruned on the next write
+    index.record("new", "uuid-2")
+    now[0] -= 61
+    assert index.lookup("old") is None
+    assert index.lookup("new") == "uuid-2"
+
+
+def test_concurrent_writers(tmp_path):
+    index = SubmissionIndex(str(tmp_path / "index.db"))
+    threads = [
+        threading.Thread(target=index.record, args=("d{}".format(i), "u{}".format(i)))
+        for i in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(index.lookup("d{}".format(i)) == "u{}".format(i) for i in range(10))
@@ -0,0 +1,81 @@
+import time
+
+import jwt
+import pytest
+
+from pythx.api import tokens
+from pythx.api.tokens import TokenPair, token_deadline
+
+
+def get_token(expires_in):
+    return jwt.encode({"exp": int(time.time() + expires_in)}, "secret")
+
+
+def test_token_deadline():
+    deadline = token_deadline(get_token(100))
+    assert 98 < deadline - time.monotonic() <= 100
+    assert token_deadline(None) is None
+    assert token_deadline("not a jwt") == float("-inf")
+
+
+@pytest.mark.parametrize(
+    "access,refresh,margin,renewal",
+    [
+        (100, 1000, 30, None),
+        (10, 1000, 30, "refresh"),
+        (-10, 1000, 30, "refresh"),
+        (-10, 10, 30, "login"),
+        (-10, -10, 0, "login"),
+        (10, 1000, 0, None),
+    ],
+)
+def test_renewal(access, refresh, margin, renewal):
+    pair = TokenPair.create(get_token(access), get_token(refresh))
+    assert pair.renewal(margin) == renewal
+
+
+def test_renewal_without_tokens():
+    assert TokenPair().renewal() == "login"
+    # a lone access token is used as is
+    assert TokenPair.create(api_key=get_token(-10)).renewal() is None
+    assert TokenPair.create(refresh_token=get_token(1000)).renewal() == "login"
+
+
+def test_tokens_decoded_once(monkeypatch):
+    pair = TokenPair.create(get_token(100), get_token(1000))
+    decode_calls = []
+    monkeypatch.setattr(tokens.jwt, "decode", lambda *a, **kw: decode_calls.append(a))
+    for _ in range(100):
+        assert pair.renewal() is None
+    assert decode_calls == []
+
+
+def test_replace_single_token():
+    pair = TokenPair.create(get_token(-10), get_token(1000))
+    updated = pair.with_api_key(get_token(100))
+    assert updated.renewal() is None
+    assert updated.refresh_token == pair.refresh_token
+    assert pair.renewal() == "refresh"
+    assert updated.with_refresh_token(None).renewal() is None
+
+
+def test_renewal_due():
+    pair = TokenPair.create(get_token(1000), get_token(5000))
+    due, lead = pair.renewal_due(120)
+    assert lead == 120
+    assert 870 < due - time.monotonic() <= 880
+
+
+def test_renewal_due_short_lived_tokens():
+    # never renew before half of the lifetime has passed
+    pair = TokenPair.create(get_token(100), get_token(5000))
+    due, lead = pair.renewal_due(120)
+    assert 48 < lead <= 50
+    assert 48 < due - time.monotonic() <= 50
+
+
+def test_renewal_due_refresh_token_first():
+    pair = TokenPair.create(get_token(1000), get_token(500))
+    due, _ = pair.renewal_due(120)
+    assert 370 < due - time.monotonic() <= 380
+    assert TokenPair.create(get_token(1000)).renewal_due(120) is None
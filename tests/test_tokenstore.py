@@ -0,0 +1,116 @@
+import multiprocessing
+import os
+import stat
+import threading
+import time
+
+import jwt
+import pytest
+
+from pythx.api import Client
+from pythx.api.tokenstore import FileTokenStore
+
+from .test_client import RoutingAPIHandler
+
+
+def get_token(expires_in):
+    token = jwt.encode({"exp": int(time.time()) + expires_in}, "secret")
+    return token.decode() if isinstance(token, bytes) else token
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FileTokenStore(str(tmp_path / "tokens" / "mythx.json"))
+
+
+def test_save_load_clear(store):
+    assert store.load() is None
+    store.save("access", "refresh")
+    assert store.load() == ("access", "refresh")
+    assert stat.S_IMODE(os.stat(str(store.path)).st_mode) == 0o600
+    store.clear()
+    assert store.load() is None
+    store.clear()
+
+
+def test_save_bytes_tokens(store):
+    store.save(b"access", b"refresh")
+    assert store.load() == ("access", "refresh")
+
+
+def test_corrupt_file_ignored(store):
+    store.path.parent.mkdir(parents=True)
+    store.path.write_text("{not json")
+    assert store.load() is None
+
+
+def test_lock_reentrant(store):
+    with store.lock():
+        with store.lock():
+            store.save("a", "r")
+    assert store.load() == ("a", "r")
+
+
+def hold_lock(path, locked, release):
+    with FileTokenStore(path).lock():
+        locked.set()
+        release.wait(5)
+
+
+def test_lock_across_processes(store):
+    locked, release = multiprocessing.Event(), multiprocessing.Event()
+    process = multiprocessing.Process(target=hold_lock, args=(str(store.path), locked, release))
+    process.start()
+    try:
+        assert locked.wait(5)
+        start = time.monotonic()
+        threading.Timer(0.2, release.set).start()
+        with store.lock():
+            waited = time.monotonic() - start
+    finally:
+        release.set()
+        process.join()
+    assert waited >= 0.15
+
+
+def refresh_routes(refreshes):
+    def refresh_route(request_data):
+        refreshes.append(request_data["payload"])
+        tokens = {"access": get_token(600), "refresh": get_token(3600)}
+        return dict(tokens, jwtTokens=tokens)
+
+    return {
+        ("POST", "/auth/refresh$"): refresh_route,
+        ("POST", "/auth/login$"): lambda r: pytest.fail("logged in"),
+        ("POST", "/auth/logout$"): lambda r: {},
+    }
+
+
+def test_client_uses_stored_tokens(store):
+    store.save(get_token(600), get_token(3600))
+    client = Client(token_store=store, handler=RoutingAPIHandler(refresh_routes([])))
+    client.assert_authentication()
+    assert (client.api_key, client.refresh_token) == store.load()
+
+
+def test_renewal_shared_between_clients(store):
+    store.save(get_token(10), get_token(3600))
+    refreshes = []
+    first = Client(token_store=store, handler=RoutingAPIHandler(refresh_routes(refreshes)))
+    second = Client(token_store=store, handler=RoutingAPIHandler(refresh_routes(refreshes)))
+
+    first.assert_authentication()
+    assert len(refreshes) == 1
+    assert store.load() == (first.api_key, first.refresh_token)
+
+    # the second client picks up the tokens renewed by the first one
+    second.assert_authentication()
+    assert len(refreshes) == 1
+    assert (second.api_key, second.refresh_token) == store.load()
+
+
+def test_logout_clears_store(store):
+    store.save(get_token(600), get_token(3600))
+    client = Client(token_store=store, handler=RoutingAPIHandler(refresh_routes([])))
+    client.logout()
+    assert store.load() is None
@@ -0,0 +1,59 @@
+from pythx.api.handler import APIHandler
+from pythx.api.transport import BaseTransport, RequestsTransport
+
+
+class RecordingTransport(BaseTransport):
+    def __init__(self):
+        self.closed = False
+
+    def request(self, method, url, headers, payload, params, timeout=None):
+        raise NotImplementedError()
+
+    def close(self):
+        self.closed = True
+
+
+def test_default_transport_pooled():
+    handler = APIHandler()
+    assert isinstance(handler.transport, RequestsTransport)
+
+
+def test_adapter_pool_settings():
+    transport = RequestsTransport(pool_connections=2, pool_maxsize=24, pool_block=True)
+    adapter = transport.session.get_adapter("https://api.mythx.io/")
+    assert adapter._pool_connections == 2
+    assert adapter._pool_maxsize == 24
+    assert adapter._pool_block is True
+
+
+def test_keep_alive_disabled():
+    transport = RequestsTransport(keep_alive=False)
+    assert transport.session.headers["Connection"] == "close"
+    assert RequestsTransport().session.headers.get("Connection") != "close"
+
+
+def test_session_reused(requests_mock):
+    test_url = "mock://test.com/path"
+    requests_mock.get(test_url, text='{"resp":"test"}')
+    handler = APIHandler()
+    session = handler.transport.session
+    for _ in range(3):
+        handler.send_request(
+            {"method": "GET", "headers": {}, "url": test_url, "payload": {}, "params": {}}
+        )
+    assert handler.transport.session is session
+    assert requests_mock.call_count == 3
+
+
+def test_close_renews_session():
+    transport = RequestsTransport()
+    session = transport.session
+    transport.close()
+    assert transport.session is not session
+
+
+def test_custom_transport_closed():
+    transport = RecordingTransport()
+    handler = APIHandler(transport=transport)
+    handler.close()
+    assert transport.closed is True